@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import QStatusBar, QFormLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QApplication, QWidget, QPushButton, QVBoxLayout, QTableWidget, QTableWidgetItem
-from PyQt5.QtCore import QFile, QTextStream
+from PyQt5.QtCore import QFile, QTextStream, QObject, Qt, pyqtSignal
 import pyqtgraph as pg
 import traceback
 from datetime import datetime
@@ -14,6 +14,8 @@ from errors import log_crash
 try:
     from helpers import resource_path
     from utils.tables import *
+    from utils.rendering import RenderScheduler, widget_visible
+    from utils.graphing import SeriesPlot, DensityScatter
     from modules.combat import CombatModule
     from views.configuration import ConfigTab
     from config import Config
@@ -23,17 +25,34 @@ try:
     from views.twitch import TwitchTab
     from modules.combat import MarkupSingleton
     from views.crafting import CraftingTab
+    from views.analysis import AllRunsAnalysisView
 except Exception as e:
     log_crash(e)
 
-MAIN_EVENT_LOOP_TICK = 0.1
+# Seconds between housekeeping ticks, chat lines are delivered as they arrive through ChatSignalBridge
+MAIN_EVENT_LOOP_TICK = 1.0
 TICK_COUNTER = 0
 
+# Seconds between housekeeping ticks while chat.log is quiet, see `LootNanny.set_idle`
+IDLE_EVENT_LOOP_TICK = 5.0
+
+# Maximum number of chat lines processed per event, so a burst doesn't block the UI
+MAX_LINES_PER_EVENT = 500
+
+
+class ChatSignalBridge(QObject):
+    """
+    Carries the "new chat lines" notification from the reader thread to the UI thread.
+    """
+    linesAvailable = pyqtSignal()
+
+
 class LootNanny(QWidget):
 
     def __init__(self):
         super().__init__()
         self.config = Config()
+        self.render_scheduler = RenderScheduler(self.config.max_refresh_rate.value, self)
 
         # Other Windows
         self.streamer_window = None
@@ -51,14 +70,26 @@ class LootNanny(QWidget):
 
         self.config_tab = ConfigTab(self)
 
-        self.chat_reader = ChatReader(self)
+        self.chat_bridge = ChatSignalBridge(self)
+        self.chat_bridge.linesAvailable.connect(self.on_lines_available, Qt.QueuedConnection)
+        self.chat_reader = ChatReader(lambda: self.config.location.value, on_lines=self.chat_bridge.linesAvailable.emit,
+                                      idle_timeout=lambda: self.config.idle_timeout.value)
+
+        self.is_idle = False
+        self.housekeeping_timer = QtCore.QTimer(self)
+        self.housekeeping_timer.setInterval(int(MAIN_EVENT_LOOP_TICK * 1000))
+        self.housekeeping_timer.timeout.connect(self.on_tick)
 
         # Create the tab widget with two tabs
         tabs = QTabWidget()
-        tabs.addTab(self.lootTabUI(), "Loot")
-        tabs.addTab(self.analysisTabUI(), "Analysis")
-        tabs.addTab(self.skillTabUI(), "Skills")
-        tabs.addTab(self.combatTabUI(), "Combat")
+        loot_tab = self.lootTabUI()
+        analysis_tab = self.analysisTabUI()
+        skill_tab = self.skillTabUI()
+        combat_tab = self.combatTabUI()
+        tabs.addTab(loot_tab, "Loot")
+        tabs.addTab(analysis_tab, "Analysis")
+        tabs.addTab(skill_tab, "Skills")
+        tabs.addTab(combat_tab, "Combat")
         self.twitch = TwitchTab(self, self.config)
         self.crafting = CraftingTab(self)
         tabs.addTab(self.crafting, "Crafting")
@@ -67,6 +98,14 @@ class LootNanny(QWidget):
         tabs.addTab(self.config_tab, "Config")
         layout.addWidget(tabs)
 
+        # Only the visible tab and the streamer window are redrawn, other tabs catch up when shown
+        self.render_scheduler.register("loot", self.combat_module.update_loot_table, widget_visible(loot_tab))
+        self.render_scheduler.register("graphs", self.combat_module.update_graphs, widget_visible(self.active_run_analysis))
+        self.render_scheduler.register("skills", self.combat_module.update_skill_table, widget_visible(skill_tab))
+        self.render_scheduler.register("combat", self.combat_module.update_combat_tab, widget_visible(combat_tab))
+        self.render_scheduler.register("streamer", self.update_streamer_window, lambda: self.streamer_window is not None)
+        tabs.currentChanged.connect(self.render_scheduler.flush)
+
         statusBar = QStatusBar()
 
         self.logging_toggle_btn = QPushButton("Start Run")
@@ -101,6 +140,16 @@ class LootNanny(QWidget):
 
         self.initialize_from_config()
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.render_scheduler.flush()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        # Catch up on redraws skipped while the window was minimized
+        if event.type() == QtCore.QEvent.WindowStateChange and not self.isMinimized():
+            self.render_scheduler.flush()
+
     def open_donation_window(self):
         """
         Opens a donation window by opening the specified URL in a web browser.
@@ -132,7 +181,8 @@ class LootNanny(QWidget):
         """
         Saves the configuration.
 
-        This function saves the current configuration by calling the `save()` method of the `config` object.
+        This function schedules a debounced save of the current configuration through the `schedule_save()`
+        method of the `config` object, so several changes in quick succession only write the file once.
 
         Parameters:
             self (object): The instance of the class.
@@ -140,7 +190,7 @@ class LootNanny(QWidget):
         Returns:
             None: This function does not return anything.
         """
-        self.config.save()
+        self.config.schedule_save()
 
     def on_toggle_streamer_ui(self):
         """
@@ -165,6 +215,16 @@ class LootNanny(QWidget):
                 self.set_stylesheet(self.streamer_window, "light.qss")
             else:
                 self.set_stylesheet(self.streamer_window, "dark.qss")
+            # Flushed as the scheduler schedules nothing while the tracker is idle
+            self.render_scheduler.mark_dirty("streamer")
+            self.render_scheduler.flush()
+
+    def update_streamer_window(self):
+        """
+        Updates the streamer window with the stats of the combat module, if the window is open.
+        """
+        if self.streamer_window:
+            self.streamer_window.set_text_from_module(self.combat_module)
 
     def on_toggle_logging(self):
         """
@@ -179,20 +239,15 @@ class LootNanny(QWidget):
         - None
         """
         if self.combat_module.is_logging:
-            self.combat_module.is_logging = False
-            self.combat_module.is_paused = False
-            self.combat_module.active_run.time_end = datetime.now()
-            self.combat_module.active_run = None
+            self.combat_module.engine.stop_run()
             self.logging_toggle_btn.setStyleSheet("background-color: green")
             self.logging_toggle_btn.setText("Start Run")
             self.logging_pause_btn.setEnabled(False)
             self.logging_pause_btn.setText("Pause Logging")
             self.logging_pause_btn.setStyleSheet("background-color: grey: color; white;")
-            self.combat_module.save_active_run(force=True)
-            self.combat_module.update_tables()
+            self.combat_module.request_redraw()
         else:
-            self.combat_module.is_logging = True
-            self.combat_module.is_paused = False
+            self.combat_module.engine.start_run()
             self.logging_toggle_btn.setStyleSheet("background-color: red")
             self.logging_toggle_btn.setText("End Run")
             self.logging_pause_btn.setEnabled(True)
@@ -228,13 +283,13 @@ class LootNanny(QWidget):
         """
         Executes the on_tick function.
 
-        This function is called on every tick of the program. It performs the following actions:
+        This function is called on every housekeeping tick of the program, chat lines are handled as they
+        arrive by `on_lines_available`. It performs the following actions:
         1. Increments the TICK_COUNTER global variable.
         2. Resets the TICK_COUNTER to 0 if it is divisible by 5.
         3. Calls the `delay_start_reader` method of the `chat_reader` object.
-        4. Retrieves all recent lines in the chat and stores them in the `all_lines_this_tick` list.
-        5. Processes the lines in the `all_lines_this_tick` list incrementally using the `tick` method of the `combat_module` object.
-        6. Resizes the `streamer_window` if it exists.
+        4. Switches to idle mode when chat.log has been quiet for the configured idle timeout.
+        5. Ticks the `combat_module` with any waiting lines, so runs are started and pending redraws scheduled.
 
         Raises:
             Exception: If an error occurs during the execution of the function.
@@ -247,20 +302,44 @@ class LootNanny(QWidget):
                 TICK_COUNTER %= 5
 
             self.chat_reader.delay_start_reader()
+            self.set_idle(self.chat_reader.is_idle())
+            self.combat_module.tick(self.chat_reader.take_lines(MAX_LINES_PER_EVENT))
 
-            # Grab all recent lines in the chat and process them incrementally
-            all_lines_this_tick = []
-            while True:
-                line = self.chat_reader.getline()
-                if not line or len(all_lines_this_tick) > 5:
-                    break
-                all_lines_this_tick.append(line)
+        except Exception as e:
+            traceback.print_exc()
+            print(e)
 
-            self.combat_module.tick(all_lines_this_tick)
+    def set_idle(self, idle: bool):
+        """
+        Switches between full rate processing and idle mode.
 
-            if self.streamer_window:
-                self.streamer_window.resize_to_contents()
+        While idle the housekeeping tick slows down to IDLE_EVENT_LOOP_TICK and the render scheduler is suspended,
+        the reader polls chat.log less often by itself. The first new line wakes everything up again.
 
+        Parameters:
+            idle (bool): True to idle, False to resume full rate processing.
+
+        Returns:
+            None
+        """
+        if idle == self.is_idle:
+            return
+        self.is_idle = idle
+        if idle:
+            self.render_scheduler.suspend()
+            self.housekeeping_timer.setInterval(int(IDLE_EVENT_LOOP_TICK * 1000))
+        else:
+            self.housekeeping_timer.setInterval(int(MAIN_EVENT_LOOP_TICK * 1000))
+            self.render_scheduler.resume()
+
+    def on_lines_available(self):
+        """
+        Processes the chat lines waiting in the reader, called on the UI thread when the reader thread signals
+        new lines. Bursts of lines are coalesced into a single call.
+        """
+        try:
+            self.set_idle(False)
+            self.combat_module.tick(self.chat_reader.take_lines(MAX_LINES_PER_EVENT))
         except Exception as e:
             traceback.print_exc()
             print(e)
@@ -293,14 +372,13 @@ class LootNanny(QWidget):
         hofs = QLineEdit(enabled=False)
         form_inputs.addRow("HOFs:", hofs)
 
-        self.item_table = LootTableView({"Item": [], "Value": [], "Count": [], "Markup": [], "Total Value": []}, 100, 5)
-        self.runs = RunsView({"Notes": [], "Start": [], "End": [], "Spend": [], "Enhancers": [],
-                         "Extra Spend": [], "Return": [], "%": [], "mu%": []}, 40, 9)
-        self.runs.itemClicked.connect(self.onLootTableClicked)
-        self.runs.model().dataChanged.connect(self.onRunsChanged)
+        self.item_table = LootTableView()
+        self.runs = RunsView()
+        self.runs.clicked.connect(self.onLootTableClicked)
+        self.runs.model().cellEdited.connect(self.onRunsChanged)
 
-        self.item_table.itemClicked.connect(self.on_loot_item_selected)
-        self.item_table.model().dataChanged.connect(self.on_markup_changed)
+        self.item_table.clicked.connect(self.on_loot_item_selected)
+        self.item_table.model().cellEdited.connect(self.on_markup_changed)
 
         # Run Management buttons
         self.delete_run_button = QPushButton("Delete Run", enabled=False)
@@ -328,61 +406,50 @@ class LootNanny(QWidget):
         generalTab.setLayout(layout)
         return generalTab
 
-    def onRunsChanged(self):
+    def onRunsChanged(self, row, column, value):
         """
-        Updates the selected runs in the GUI with the corresponding data from the UI.
+        Updates a run with the notes or extra spend edited in the runs table.
 
-        This function is triggered when the selection of runs in the GUI changes. It retrieves
-        the indexes of the selected rows in the `runs` table view. If there are no selected rows,
-        the function returns early. Otherwise, it determines the changed row and its corresponding
-        index in the `combat_module.runs` list.
+        The edited run is looked up from the runs table model. The `extra_spend` cell is converted
+        to a decimal value, if the conversion fails the default value of 0.0 is used.
 
-        The function then retrieves the `notes` and `extra_spend` cells for the changed row from
-        the `runs` table view. It attempts to convert the text in the `extra_spend` cell to a
-        decimal value. If the conversion fails, the default value of 0.0 is used and the `extra_spend`
-        cell is set to "0.0". 
+        Finally, the function updates the `extra_spend` or `notes` attribute of the corresponding
+        run object, requests a redraw from the `combat_module` and clears the
+        selection in the `runs` table view.
 
-        Finally, the function updates the `extra_spend` and `notes` attributes of the corresponding
-        run object in the `combat_module.runs` list. It sets the `should_redraw_runs` flag of the
-        `combat_module` to True and clears the selection in the `runs` table view.
-        """
-        indexes = self.runs.selectionModel().selectedRows()
-        if not indexes:
-            return
-        changed = [(i.row(), len(self.combat_module.runs) - 1 - i.row()) for i in indexes][0]
-        notes_cell = self.runs.item(changed[0], 0)
-        spend_cell = self.runs.item(changed[0], 5)
-        try:
-            extra_spend = Decimal(spend_cell.text() or "0")
-        except:
-            extra_spend = 0.0
-            spend_cell.setText("0.0")
-        self.combat_module.runs[changed[1]].extra_spend = extra_spend
-        self.combat_module.runs[changed[1]].notes = notes_cell.text()
-        self.combat_module.should_redraw_runs = True
+        Parameters:
+            row (int): The edited row in the runs table.
+            column (int): The edited column in the runs table.
+            value (str): The new text of the edited cell.
+        """
+        run = self.runs.model().run(row)
+        if column == 0:
+            run.notes = value
+        elif column == 5:
+            try:
+                run.extra_spend = Decimal(value or "0")
+            except:
+                run.extra_spend = Decimal("0.0")
+        self.combat_module.request_redraw()
         self.clear_run_selection()
 
-    def on_markup_changed(self):
+    def on_markup_changed(self, row, column, value):
         """
         Handle the event when the markup is changed.
         
         This function is triggered when the markup in the item table is changed. It performs the following steps:
         
-        1. Get the selected rows from the item table.
-        2. If no rows are selected, return.
-        3. Get the index of the first selected row.
-        4. Get the name and markup cells of the selected row.
-        5. Add the markup for the item to the MarkupSingleton.
-        6. Update the loot table in the combat module.
-        7. Clear the selection in the loot item table.
-        """
-        selected_rows = self.item_table.selectionModel().selectedRows()
-        if not selected_rows:
-            return
-        selected_row = selected_rows[0].row()
-        name_cell = self.item_table.item(selected_row, 0)
-        markup_cell = self.item_table.item(selected_row, 3)
-        MarkupSingleton.add_markup_for_item(name_cell.text(), markup_cell.text())
+        1. Get the item name of the edited row.
+        2. Add the markup for the item to the MarkupSingleton.
+        3. Update the loot table in the combat module.
+        4. Clear the selection in the loot item table.
+
+        Parameters:
+            row (int): The edited row in the item table.
+            column (int): The edited column, always the markup column.
+            value (str): The new markup.
+        """
+        MarkupSingleton.add_markup_for_item(self.item_table.model().row(row)[0], value)
         self.combat_module.update_loot_table()
         self.clear_loot_item_table_selection()
 
@@ -449,11 +516,13 @@ class LootNanny(QWidget):
         """
         Deletes the selected runs from the combat module.
 
-        This function iterates over the runs in the combat module and removes the runs that are marked for deletion. The runs that are not marked for deletion are copied to a new list called `copy_runs`. The `runs_rows_to_delete` variable is then reset to an empty list. The delete button is disabled and hidden. The selection in the runs table is cleared. The `combat_module.runs` is updated to contain the runs in `copy_runs`. If the active run is not in `copy_runs`, it is set to `None`. The runs table is cleared and the runs table is updated. Finally, the runs are saved and the run selection is cleared.
+        This function iterates over the runs in the combat module and removes the runs that are marked for deletion. The runs that are not marked for deletion are copied to a new list called `copy_runs`. The `runs_rows_to_delete` variable is then reset to an empty list. The delete button is disabled and hidden. The selection in the runs table is cleared. The `combat_module.runs` is updated to contain the runs in `copy_runs`. If the active run is not in `copy_runs`, it is set to `None`. The runs table is updated. Finally, the deleted runs are removed from disk and the run selection is cleared.
         """
         copy_runs = []
+        deleted_runs = []
         for i, run in enumerate(self.combat_module.runs):
             if i in self.runs_rows_to_delete:
+                deleted_runs.append(run)
                 continue
             copy_runs.append(run)
         self.runs_rows_to_delete = []
@@ -463,9 +532,12 @@ class LootNanny(QWidget):
         self.combat_module.runs = copy_runs
         if self.combat_module.active_run not in copy_runs:
             self.combat_module.active_run = None
-        self.runs.clear()
         self.combat_module.update_runs_table()
-        self.combat_module.save_runs(force=True)
+        for run in deleted_runs:
+            try:
+                run.delete_from_disk()
+            except Exception as e:
+                print(f"Error deleting run {run.run_key}: {e}")
         self.clear_run_selection()
 
     def analysisTabUI(self):
@@ -474,25 +546,32 @@ class LootNanny(QWidget):
 
         :return: QWidget object representing the analysis tab UI.
         """
-        analysisTab = QWidget()
+        analysisTab = QTabWidget()
+        activeRunTab = QWidget()
         layout = QVBoxLayout()
 
         return_graph = pg.PlotWidget()
-        return_graph.plot([])
         return_graph.setTitle("Run TT Return (%)")
         return_graph.setLabel('left', 'Return (%)')
 
         multi_graph = pg.PlotWidget()
-        multi_graph.plot([])
         multi_graph.setTitle("Cost to kill vs Return")
         multi_graph.setLabel('bottom', 'Cost To Kill (PED)')
         multi_graph.setLabel('left', 'Return (PED)')
 
         self.combat_module.multiplier_graph = multi_graph
         self.combat_module.return_graph = return_graph
+        self.combat_module.multiplier_plot = DensityScatter(multi_graph, pen=None, symbol="o")
+        self.combat_module.return_plot = SeriesPlot(return_graph, scale=100)
         layout.addWidget(return_graph)
         layout.addWidget(multi_graph)
-        analysisTab.setLayout(layout)
+        activeRunTab.setLayout(layout)
+
+        self.active_run_analysis = activeRunTab
+        self.all_runs_analysis = AllRunsAnalysisView()
+        analysisTab.addTab(activeRunTab, "Active Run")
+        analysisTab.addTab(self.all_runs_analysis, "All Runs")
+        analysisTab.currentChanged.connect(self.render_scheduler.flush)
         return analysisTab
 
     def skillTabUI(self):
@@ -508,7 +587,7 @@ class LootNanny(QWidget):
         self.total_skills_text = QLineEdit(enabled=False)
         form_inputs.addRow("Total Skill Gain:", self.total_skills_text)
 
-        table = SkillTableView({"Skill": [], "Value": [], "Proc": [], "Proc %": []}, 40, 4)
+        table = SkillTableView()
 
         # eulogger.skill_table = table
         layout.addLayout(form_inputs)
@@ -542,7 +621,7 @@ class LootNanny(QWidget):
         dpp = QLineEdit(enabled=False)
         form_inputs.addRow("dpp:", dpp)
 
-        table = EnhancerTableView({"Enhancer": [], "Breaks": []}, 10, 2)
+        table = EnhancerTableView()
 
         self.combat_module.combat_fields = {
             "attacks": shots_text,
@@ -605,6 +684,8 @@ class LootNanny(QWidget):
     def closeEvent(self, event):
         print("Close Event")
         self.combat_module.save_active_run(force=True)
+        self.config.flush()
+        self.all_runs_analysis.shutdown()
         """
         Handle the close event triggered by the user.
 
@@ -628,8 +709,8 @@ def create_ui():
     It then creates an instance of the LootNanny class and sets the stylesheet to "dark.qss".
     The window is then displayed using the show() method.
     
-    A QTimer object is created and connected to the on_tick() method of the window instance.
-    The timer is started with a timeout value of MAIN_EVENT_LOOP_TICK * 1000 milliseconds.
+    The housekeeping timer of the window, connected to its on_tick() method, is started with a timeout value of
+    MAIN_EVENT_LOOP_TICK * 1000 milliseconds, chat lines are processed as soon as the reader thread signals them.
     
     Finally, the application's event loop is started using the exec() method.
     """
@@ -640,9 +721,7 @@ def create_ui():
     window.set_stylesheet(window, "dark.qss")
     window.show()
 
-    timer = QtCore.QTimer()
-    timer.timeout.connect(window.on_tick)
-    timer.start(int(MAIN_EVENT_LOOP_TICK * 1000)) #timer.start((MAIN_EVENT_LOOP_TICK * 1000)) added int to make it work properly 
+    window.housekeeping_timer.start()
 
     app.exec()
 
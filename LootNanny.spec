@@ -19,7 +19,8 @@ a = Analysis(['LootNanny.py'],
                 ("sights.json", "."),
                 ("scopes.json", "."),
                 ("resources.json", "."),
-                ("crafting.json", ".")
+                ("crafting.json", "."),
+                ("catalogs", "catalogs")
              ],
              hiddenimports=[],
              hookspath=[],
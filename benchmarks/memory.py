@@ -0,0 +1,57 @@
+"""
+Memory benchmark of the blueprint catalog: the memory held by the catalog built with `data.crafting.make_blueprints`
+compared to one fresh list of Slot namedtuples per blueprint, as the catalog was stored before.
+
+    python benchmarks/memory.py
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.crafting import bp_filename, make_blueprints
+from modules.crafting import Blueprint, Slot
+
+
+def unshared_blueprints(entries) -> dict:
+    return {name: Blueprint(name, [Slot(*slot) for slot in slots]) for name, slots in entries}
+
+
+def measure(build, data: str) -> tuple:
+    """
+    Builds a catalog from freshly parsed JSON, once while tracing allocations and once timed.
+
+    Returns:
+        tuple: The bytes still allocated by the catalog once the parsed JSON is freed, and the seconds the build took.
+    """
+    gc.collect()
+    tracemalloc.start()
+    parsed = json.loads(data)
+    catalog = build(parsed.items())
+    del parsed
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalog
+
+    parsed = json.loads(data)
+    start = time.perf_counter()
+    build(parsed.items())
+    return size, time.perf_counter() - start
+
+
+def main():
+    with open(bp_filename, 'r') as f:
+        data = f.read()
+
+    for name, build in (("unshared", unshared_blueprints), ("shared", make_blueprints)):
+        size, seconds = measure(build, data)
+        print(f"{name:>8}: {size / 1024 / 1024:6.2f} MB in {seconds * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
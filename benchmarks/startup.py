@@ -0,0 +1,128 @@
+"""
+Startup benchmark: per module import times and the time until the main window is shown.
+
+Every measurement runs in a fresh interpreter with the offscreen Qt platform, so imports are cold and no display
+is needed. The results are checked against the budget in startup_budget.json:
+
+    python benchmarks/startup.py [--repeat 5] [--top 15] [--check] [--write-budget]
+
+--check exits with status 1 when a measurement is over budget, --write-budget stores the current medians plus
+50% headroom as the new budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+
+# Headroom added to the measured medians by --write-budget
+BUDGET_HEADROOM = 1.5
+
+FIRST_WINDOW_SCRIPT = """
+import time
+start = time.perf_counter()
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+import LootNanny
+imported = time.perf_counter()
+window = LootNanny.LootNanny()
+window.show()
+
+def shown():
+    print(imported - start, time.perf_counter() - start)
+    app.quit()
+
+# Runs once the event loop processed the show, i.e the window is usable
+QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+
+def _environment() -> dict:
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+
+def import_times(top: int = 15) -> list:
+    """
+    Imports LootNanny with `-X importtime` and returns the slowest modules.
+
+    Returns:
+        list: ( module, self seconds, cumulative seconds ) tuples, slowest cumulative first.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import LootNanny"], cwd=ROOT,
+                            env=_environment(), capture_output=True, text=True)
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            times.append((module, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return sorted(times, key=lambda t: t[2], reverse=True)[:top]
+
+
+def first_window_time() -> tuple:
+    """
+    Starts the app in a fresh interpreter.
+
+    Returns:
+        tuple: The seconds spent importing LootNanny and the seconds until the main window was shown.
+    """
+    result = subprocess.run([sys.executable, "-c", FIRST_WINDOW_SCRIPT], cwd=ROOT, env=_environment(),
+                            capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        raise RuntimeError(f"LootNanny failed to start:\n{result.stderr}")
+    import_seconds, window_seconds = map(float, result.stdout.strip().splitlines()[-1].split())
+    return import_seconds, window_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the LootNanny startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of app starts, the median is reported")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports listed")
+    parser.add_argument("--check", action="store_true", help="Exit with status 1 if over budget")
+    parser.add_argument("--write-budget", action="store_true", help="Store the measurements as the new budget")
+    args = parser.parse_args()
+
+    print("Slowest imports ( cumulative / self ):")
+    for module, self_seconds, cumulative_seconds in import_times(args.top):
+        print(f"  {cumulative_seconds * 1000:8.1f} ms {self_seconds * 1000:8.1f} ms  {module}")
+
+    starts = [first_window_time() for _ in range(args.repeat)]
+    results = {
+        "import_seconds": statistics.median(start[0] for start in starts),
+        "first_window_seconds": statistics.median(start[1] for start in starts),
+    }
+
+    budget = {}
+    if os.path.exists(BUDGET_FILENAME):
+        with open(BUDGET_FILENAME, 'r') as f:
+            budget = json.loads(f.read())
+
+    over_budget = False
+    print(f"Median of {args.repeat} starts:")
+    for name, seconds in results.items():
+        limit = budget.get(name)
+        status = "" if limit is None else f" ( budget {limit:.3f} s{', OVER BUDGET' if seconds > limit else ''} )"
+        over_budget |= limit is not None and seconds > limit
+        print(f"  {name}: {seconds:.3f} s{status}")
+
+    if args.write_budget:
+        with open(BUDGET_FILENAME, 'w') as f:
+            f.write(json.dumps({name: round(seconds * BUDGET_HEADROOM, 3) for name, seconds in results.items()},
+                               indent=2, sort_keys=True))
+        print(f"Budget written to {BUDGET_FILENAME}")
+
+    if args.check and over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
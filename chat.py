@@ -1,14 +1,28 @@
-import tailer
 import enum
 from datetime import datetime
 from collections import namedtuple
 import re
 import time
-import win_unicode_console
 import threading
+from collections import deque
 
 from decimal import Decimal
-win_unicode_console.enable()
+
+try:
+    # Only needed ( and available ) on Windows consoles
+    import win_unicode_console
+    win_unicode_console.enable()
+except ImportError:
+    pass
+
+# Seconds between checks of chat.log for new lines while the game is writing to it
+ACTIVE_POLL_DELAY = 0.01
+
+# Seconds between checks of chat.log for new lines once it has been quiet for the idle timeout
+IDLE_POLL_DELAY = 0.5
+
+# Seconds without a new line in chat.log before the reader is idle
+DEFAULT_IDLE_TIMEOUT = 300
 
 # Enum for different types of chat messages
 class ChatType(str, enum.Enum):
@@ -139,10 +153,24 @@ GLOBAL_REGEXES = {
 
 # Class for reading chat lines from a log file
 class ChatReader(object):
-    def __init__(self, app):
-        self.app = app
-        self.lines = []
+    def __init__(self, location, on_lines=None, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        """
+        Args:
+            location (str | Callable[[], str]): The path of chat.log, or a function returning the currently
+                configured path so the reader can start once it is set.
+            on_lines (Callable[[], None]): Called from the reader thread when new lines are available. Bursts
+                are coalesced, it is not called again until the lines were taken with `take_lines`. It is also
+                called when the first line arrives after the reader was idle, even if that line isn't tracked.
+            idle_timeout (float | Callable[[], float]): Seconds without a new line before the reader is idle and
+                polls chat.log less often, or a function returning it. 0 disables idling.
+        """
+        self.location = location if callable(location) else (lambda: location)
+        self.idle_timeout = idle_timeout if callable(idle_timeout) else (lambda: idle_timeout)
+        self.last_activity = time.monotonic()
+        self.on_lines = on_lines
+        self.lines = deque()
         self.reader = None
+        self._notified = threading.Event()
 
     def delay_start_reader(self):
         """
@@ -150,9 +178,9 @@ class ChatReader(object):
 
         This function checks if a reader thread is already running. If a reader thread is already running, it returns without doing anything.
 
-        If a reader thread is not running, it checks if the log file location is set in the application configuration. If the log file location is not set, it returns without doing anything.
+        If a reader thread is not running, it checks if the log file location is set. If the log file location is not set, it returns without doing anything.
 
-        If the log file location is set, it opens the log file for reading and starts tailing it using the `tailer` library. The file is opened with the "utf_8_sig" encoding.
+        If the log file location is set, it opens the log file for reading and starts tailing it with `follow`. The file is opened with the "utf_8_sig" encoding.
 
         After opening the file, it starts a new reader thread by creating a `threading.Thread` object. The `target` of the thread is set to the `readlines` method of the current object. The `daemon` flag is set to True to allow the thread to be terminated when the main thread exits. Finally, the thread is started.
 
@@ -163,14 +191,55 @@ class ChatReader(object):
         if self.reader:
             return
 
-        if not self.app.config.location.value:
+        location = self.location()
+        if not location:
             return
 
         # Open the log file for reading and start tailing it
-        self.fd = tailer.follow(open(self.app.config.location.value, "r", encoding="utf_8_sig"), delay=0.01)
+        self.fd = self.follow(open(location, "r", encoding="utf_8_sig"))
         self.reader = threading.Thread(target=self.readlines, daemon=True)
         self.reader.start()
 
+    def is_idle(self) -> bool:
+        """
+        Returns True if chat.log has been quiet for longer than the idle timeout.
+        """
+        idle_timeout = self.idle_timeout()
+        return bool(idle_timeout) and time.monotonic() - self.last_activity > idle_timeout
+
+    def follow(self, file):
+        """
+        Yields the lines added to the end of a file, without their line endings.
+
+        New lines are polled for every `ACTIVE_POLL_DELAY` seconds, and every `IDLE_POLL_DELAY` seconds once the
+        reader is idle. A partially written line is held back until its line ending was written.
+
+        Parameters:
+            file (TextIO): The opened file, reading starts at its current end.
+
+        Returns:
+            Generator[str]: The new lines.
+        """
+        file.seek(0, 2)
+        partial = ""
+        while True:
+            line = file.readline()
+            if not line:
+                time.sleep(IDLE_POLL_DELAY if self.is_idle() else ACTIVE_POLL_DELAY)
+                continue
+
+            partial += line
+            if not partial.endswith("\n"):
+                continue
+            line, partial = partial.rstrip("\r\n"), ""
+
+            was_idle = self.is_idle()
+            self.last_activity = time.monotonic()
+            if was_idle:
+                # Wake up the listener even if the line isn't tracked
+                self.notify()
+            yield line
+
     def readlines(self):
         """
         Reads lines from a file and parses them into chat instances.
@@ -197,6 +266,7 @@ class ChatReader(object):
                             chat_instance: BaseChatRow = chat_cls(*match.groups(), **kwargs)
                             chat_instance.time = datetime.strptime(log_line.time, "%Y-%m-%d %H:%M:%S")
                             self.lines.append(chat_instance)
+                            self.notify()
                             matched = True
                             break
                     if not matched:
@@ -210,6 +280,7 @@ class ChatReader(object):
                             chat_instance: GlobalInstance = chat_cls(*match.groups(), **kwargs)
                             chat_instance.time = datetime.strptime(log_line.time, "%Y-%m-%d %H:%M:%S")
                             self.lines.append(chat_instance)
+                            self.notify()
                             matched = True
                             break
         except UnicodeDecodeError:
@@ -223,6 +294,33 @@ class ChatReader(object):
             str or None: The first line from the lines list if it is not empty, otherwise None.
         """
         if len(self.lines):
-            return self.lines.pop(0)
+            return self.lines.popleft()
         return None
 
+    def notify(self):
+        """
+        Tells the `on_lines` listener that lines are waiting, unless it was already told and hasn't taken them yet.
+        """
+        if self.on_lines and not self._notified.is_set():
+            self._notified.set()
+            self.on_lines()
+
+    def take_lines(self, limit: int = None) -> list:
+        """
+        Takes the waiting lines, oldest first.
+
+        Args:
+            limit (int): The maximum number of lines to take, the listener is notified again if more are waiting.
+
+        Returns:
+            list: The chat instances.
+        """
+        # Cleared before taking, so lines added from now on notify the listener again
+        self._notified.clear()
+        lines = []
+        while self.lines and (limit is None or len(lines) < limit):
+            lines.append(self.lines.popleft())
+        if self.lines:
+            self.notify()
+        return lines
+
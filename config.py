@@ -1,5 +1,7 @@
 import os
 import json
+import threading
+from contextlib import contextmanager
 from typing import List
 
 from helpers import format_filename
@@ -8,6 +10,9 @@ from modules.combat import Loadout, CustomWeapon
 
 CONFIG_FILENAME = format_filename("config.json")
 
+# Seconds to wait after the last change before writing the config to disk
+SAVE_DELAY = 1.0
+
 STREAMER_LAYOUT_DEFAULT = {'layout': [
     [
         ['{}%', 'PERCENTAGE_RETURN', 'font-size: 20pt;']
@@ -39,6 +44,16 @@ class Config(object):
     selected_loadout: Loadout = CU.ConfigValue(None, type=Loadout)
     custom_weapons: List[CustomWeapon] = CU.ConfigValue(None)
 
+    # Run Archival
+    archive_after_days = CU.ConfigValue(0)
+    archive_format = CU.ConfigValue("gzip")
+
+    # Rendering
+    max_refresh_rate = CU.ConfigValue(10)
+
+    # Power Saving, seconds without new chat lines before the tracker idles ( 0 = never )
+    idle_timeout = CU.ConfigValue(300)
+
     # Streaming and Twitch
     streamer_layout = CU.JsonConfigValue(STREAMER_LAYOUT_DEFAULT)
 
@@ -48,15 +63,22 @@ class Config(object):
     twitch_channel = CU.ConfigValue("")
     twitch_commands_enabled = CU.ConfigValue(None)
 
+    # Names of all ConfigValue attributes, filled in once the class is created
+    FIELDS = ()
+
     def __init__(self):
         # Initialize mutable options
         self.initialized = False
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        self._save_timer = None
+
         self.loadouts = []
         self.custom_weapons = []
         self.twitch_commands_enabled = ["commands", "allreturns", "toploots", "info"]
 
         self.load_config()
-        self.print()
         self.initialized = True
 
     def load_config(self):
@@ -114,7 +136,7 @@ class Config(object):
         :rtype: dict
         """
         p = {}
-        for attr_name in dir(self):
+        for attr_name in self.FIELDS:
             attr = getattr(self, attr_name)
 
             if attr_name == "loadouts":
@@ -123,7 +145,7 @@ class Config(object):
             elif attr_name == "selected_loadout":
                 p[attr_name] = attr.value.dump() if attr.value else {}
 
-            elif isinstance(attr, CU.ConfigValue):
+            else:
                 p[attr_name] = attr.value
         return p
 
@@ -149,17 +171,79 @@ class Config(object):
         """
         if not self.initialized:
             return
+        with self._lock:
+            if self._save_timer:
+                self._save_timer.cancel()
+                self._save_timer = None
+            self._dirty = False
+            try:
+                to_save = json.dumps(self.dump(), indent=2, sort_keys=True)
+                with open(CONFIG_FILENAME, 'w') as f:
+                    f.write(to_save)
+            except:
+                print("Error saving config!")
+
+    def schedule_save(self):
+        """
+        Marks the configuration as changed and saves it once no further changes happen for SAVE_DELAY seconds.
+
+        Inside a `batch()` the save is deferred until the outermost batch finishes.
+
+        Returns:
+            None
+        """
+        if not self.initialized:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._batch_depth:
+                return
+            if self._save_timer:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(SAVE_DELAY, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """
+        Immediately writes any pending changes to disk, e.g before the application exits.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._dirty:
+                self.save()
+
+    @contextmanager
+    def batch(self):
+        """
+        Groups several configuration changes into a single save.
+
+        Usage:
+            with config.batch():
+                config.screenshot_delay = 500
+                config.screenshot_enabled = True
+
+        Batches can be nested, the configuration is written once when the outermost batch exits.
+        """
+        with self._lock:
+            self._batch_depth += 1
         try:
-            to_save = json.dumps(self.dump(), indent=2, sort_keys=True)
-            with open(CONFIG_FILENAME, 'w') as f:
-                f.write(to_save)
-        except:
-            print("Error saving config!")
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self.save()
 
     def __setattr__(self, item, value):
         """
         Set the value of an attribute.
 
+        Changing a configuration value schedules a debounced save rather than writing the file immediately. The
+        value is replaced under the lock, as the save runs on the timer thread and serializes every value.
+
         Args:
             item (str): The name of the attribute.
             value (Any): The value to set.
@@ -167,10 +251,13 @@ class Config(object):
         Returns:
             None
         """
-        print("Setting", item, value)
-        if not isinstance(getattr(self, item, None), CU.ConfigValue):
+        if item not in self.FIELDS:
             return super().__setattr__(item, value)
         config_item: CU.ConfigValue = getattr(self, item)
-        config_item._value = value
-        self.save()
+        with self._lock:
+            config_item._value = value
+            self.schedule_save()
+
+
+Config.FIELDS = tuple(sorted(name for name, value in vars(Config).items() if isinstance(value, CU.ConfigValue)))
 
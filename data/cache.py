@@ -0,0 +1,167 @@
+"""
+Pickled caches of the processed game data catalogs.
+
+Parsing the catalog JSON and converting every entry to Decimal / Blueprint objects is slow, so each processed
+catalog is pickled into AppData the first time it is loaded, keyed by the SHA1 of its source JSON. When the JSON
+changes the hash no longer matches and the cache is rebuilt automatically. Catalogs of many small objects can
+pack themselves into plain tuples for the cache, which unpickle much faster than namedtuples.
+
+The caches can also be built ahead of time, e.g into the `catalogs` directory bundled with the executable:
+
+    python -m data.cache [--directory catalogs]
+"""
+import glob
+import hashlib
+import os
+import pickle
+from functools import wraps
+from typing import Callable, Dict, Sequence, Tuple
+
+from helpers import format_filename, resource_path
+
+# Bump when the processed form of a catalog changes, so old caches aren't loaded
+CACHE_VERSION = 2
+
+CACHE_DIRECTORY = format_filename("catalogs")
+BUNDLED_DIRECTORY = resource_path("catalogs")
+CACHE_EXTENSION = ".pickle"
+
+# Modules defining the cached catalogs, imported by the build step
+CATALOG_MODULES = ("data.weapons", "data.attachments", "data.sights_and_scopes", "data.healing_tools", "data.crafting")
+
+# Registered catalogs: name -> ( source filenames, function building the packed catalog )
+CATALOGS: Dict[str, Tuple[Sequence[str], Callable]] = {}
+
+
+def source_hash(filenames: Sequence[str]) -> str:
+    """
+    Returns the SHA1 of the cache version and the contents of the source files.
+    """
+    digest = hashlib.sha1(str(CACHE_VERSION).encode())
+    for fn in filenames:
+        with open(fn, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def cache_path(name: str, filenames: Sequence[str], directory: str = CACHE_DIRECTORY) -> str:
+    return os.path.join(directory, f"{name}-{source_hash(filenames)}{CACHE_EXTENSION}")
+
+
+def write_cache(name: str, filenames: Sequence[str], catalog, directory: str = CACHE_DIRECTORY) -> str:
+    """
+    Pickles a processed catalog and removes the caches built from older versions of its source files.
+
+    Returns:
+        str: The path of the written cache.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = cache_path(name, filenames, directory)
+    with open(path + ".tmp", 'wb') as f:
+        pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+
+    for stale in glob.glob(os.path.join(directory, f"{name}-*{CACHE_EXTENSION}")):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
+
+
+def _identity(catalog):
+    return catalog
+
+
+def load_catalog(name: str, filenames: Sequence[str], build: Callable, directory: str = CACHE_DIRECTORY,
+                 pack: Callable = _identity, unpack: Callable = _identity):
+    """
+    Loads a processed catalog from the bundled or AppData cache, or builds and caches it when neither matches
+    the current source files.
+
+    Args:
+        name (str): The name of the catalog, used in the cache filename.
+        filenames (Sequence[str]): The source JSON files of the catalog.
+        build (Callable): Parses the source files into the processed catalog.
+        directory (str): The cache directory written to.
+        pack (Callable): Converts the catalog into the form stored in the cache.
+        unpack (Callable): Converts the stored form back into the catalog.
+
+    Returns:
+        object: The processed catalog.
+    """
+    # Missing sources are handled by the build function, there is nothing to key a cache on
+    if not all(os.path.exists(fn) for fn in filenames):
+        return build()
+
+    filename = os.path.basename(cache_path(name, filenames, directory))
+    for cache_directory in (BUNDLED_DIRECTORY, directory):
+        path = os.path.join(cache_directory, filename)
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, 'rb') as f:
+                return unpack(pickle.load(f))
+        except:
+            print(f"Corrupted catalog cache detected: {path}")
+
+    catalog = build()
+    try:
+        write_cache(name, filenames, pack(catalog), directory)
+    except Exception as e:
+        print(f"Error caching the {name} catalog: {e}")
+    return catalog
+
+
+def cached_catalog(name: str, *filenames: str, pack: Callable = _identity, unpack: Callable = _identity):
+    """
+    Decorator registering a catalog build function, the decorated function loads the catalog through the cache.
+
+    Args:
+        name (str): The name of the catalog.
+        *filenames (str): The source JSON files of the catalog.
+        pack (Callable): Converts the catalog into the form stored in the cache.
+        unpack (Callable): Converts the stored form back into the catalog.
+    """
+    def decorator(build: Callable):
+        CATALOGS[name] = (filenames, lambda: pack(build()))
+
+        @wraps(build)
+        def load():
+            return load_catalog(name, filenames, build, pack=pack, unpack=unpack)
+        return load
+    return decorator
+
+
+def build_all(directory: str = CACHE_DIRECTORY) -> Dict[str, str]:
+    """
+    Builds the cache of every catalog whose source files exist.
+
+    Returns:
+        Dict[str, str]: The written cache path by catalog name.
+    """
+    import importlib
+
+    for module in CATALOG_MODULES:
+        importlib.import_module(module)
+
+    written = {}
+    for name, (filenames, build) in sorted(CATALOGS.items()):
+        if all(os.path.exists(fn) for fn in filenames):
+            written[name] = write_cache(name, filenames, build(), directory)
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the LootNanny game data catalog caches")
+    parser.add_argument("--directory", default=CACHE_DIRECTORY)
+    args = parser.parse_args()
+
+    # The catalogs register themselves with the importable module, not with __main__
+    from data.cache import build_all
+
+    for name, path in build_all(args.directory).items():
+        print(f"{name}: {path}")
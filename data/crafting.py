@@ -1,72 +1,153 @@
 import json
 import sys
 import os
+from collections import defaultdict
 from decimal import Decimal
+from functools import lru_cache
 
+from data.cache import cached_catalog
 from helpers import resource_path
 from modules.crafting import Slot, Blueprint
+from utils.search import TrigramIndex
 
-ALL_RESOURCES = {}
-ALL_BLUEPRINTS = {}
 bp_filename = resource_path("crafting.json")
 res_filename = resource_path("resources.json")
 
-if os.path.exists(bp_filename):
+
+def make_blueprints(entries) -> dict:
+    """
+    Builds the blueprint catalog, sharing everything that repeats between blueprints.
+
+    Resource names are interned, every distinct ( resource, count ) Slot is created once and blueprints with the
+    same materials ( e.g the (L) variants ) share one tuple of slots.
+
+    Args:
+        entries (Iterable): ( blueprint name, [ ( resource name, count ), ... ] ) pairs.
+
+    Returns:
+        dict: The Blueprint by blueprint name.
+    """
+    # tuple.__new__ skips the Python level namedtuple constructor, which dominates loading otherwise
+    new = tuple.__new__
+    intern = sys.intern
+    shared_slots = {}
+    shared_slot_tuples = {}
+
+    blueprints = {}
+    for name, slots in entries:
+        key = tuple((intern(resource), count) for resource, count in slots)
+        slot_tuple = shared_slot_tuples.get(key)
+        if slot_tuple is None:
+            for slot in key:
+                if slot not in shared_slots:
+                    shared_slots[slot] = new(Slot, slot)
+            slot_tuple = shared_slot_tuples[key] = tuple(shared_slots[slot] for slot in key)
+        blueprints[name] = new(Blueprint, (name, slot_tuple))
+    return blueprints
+
+
+def _pack_blueprints(blueprints: dict) -> dict:
+    # Plain tuples unpickle much faster than namedtuples. Pickle stores shared objects once, so the slots and slot
+    # tuples stay shared through the cache.
+    packed_slots = {}
+    packed_slot_tuples = {}
+    packed = {}
+    for name, bp in blueprints.items():
+        slots = packed_slot_tuples.get(id(bp.slots))
+        if slots is None:
+            for slot in bp.slots:
+                if id(slot) not in packed_slots:
+                    packed_slots[id(slot)] = tuple(slot)
+            slots = packed_slot_tuples[id(bp.slots)] = tuple(packed_slots[id(slot)] for slot in bp.slots)
+        packed[name] = slots
+    return packed
+
+
+def _unpack_blueprints(packed: dict) -> dict:
+    # The packed objects are already shared, so they are matched by identity instead of being hashed
+    new = tuple.__new__
+    slots = {}
+    slot_tuples = {}
+    blueprints = {}
+    for name, packed_slots in packed.items():
+        slot_tuple = slot_tuples.get(id(packed_slots))
+        if slot_tuple is None:
+            for slot in packed_slots:
+                if id(slot) not in slots:
+                    slots[id(slot)] = new(Slot, slot)
+            slot_tuple = slot_tuples[id(packed_slots)] = tuple(slots[id(slot)] for slot in packed_slots)
+        blueprints[name] = new(Blueprint, (name, slot_tuple))
+    return blueprints
+
+
+@lru_cache(maxsize=None)
+@cached_catalog("blueprints", bp_filename, pack=_pack_blueprints, unpack=_unpack_blueprints)
+def all_blueprints() -> dict:
+    """
+    Loads the blueprint catalog on first use, it is only needed by the crafting tab. The processed catalog is
+    cached by `data.cache`.
+
+    Returns:
+        dict: The Blueprint by blueprint name, see `make_blueprints`.
+    """
+    if not os.path.exists(bp_filename):
+        return {}
     with open(bp_filename, 'r') as f:
-        data = json.loads(f.read())
-        for name, slots in data.items():
-            bp = Blueprint(name, [Slot(*s) for s in slots])
-            ALL_BLUEPRINTS[name] = bp
-
-if os.path.exists(res_filename):
-    with open(res_filename, 'r') as f:
-        data = json.loads(f.read())
-        for name, value in data.items():
-            ALL_RESOURCES[name] = Decimal(value)
-
-
-FIELDS = ("name", "material", "amount", "cost", "_", "__", "___")
-
-if __name__ == "__main__":
-
-    all_bps = {}
-    all_resources = {}
-
-    from pathlib import Path
-
-    p = Path(os.path.dirname(sys.argv[1]))
-    matches = list(p.glob(os.path.split(sys.argv[1])[-1]))
-    for p in matches:
-        with p.open('r') as f:
-            header = True
-            for line in f.readlines():
-                if header:
-                    header = False
-                    continue
-                try:
-                    data = dict(zip(FIELDS, line.split(";")))
-                    cost = data["cost"].strip()
-                    if not cost:
-                        cost = "0.0"
-                    amount = data["amount"].strip()
-                    if not amount:
-                        amount = "1"
-                    if int(amount):
-                        all_resources[data["material"]] = str(Decimal(cost) / int(amount))
-                    else:
-                        all_resources[data["material"]] = "1.0"
-                    if data["name"] not in all_bps:
-                        all_bps[data["name"]] = []
-                    all_bps[data["name"]].append([data["material"], int(amount)])
-
-                except:
-                    raise
-                    print(line)
-                    break
-
-    if all_bps:
-        output = open(bp_filename, 'w')
-        output.write(json.dumps(all_bps, indent=2, sort_keys=True))
-    if all_resources:
-        output = open(res_filename, 'w')
-        output.write(json.dumps(all_resources, indent=2, sort_keys=True))
+        return make_blueprints(json.loads(f.read()).items())
+
+
+@lru_cache(maxsize=None)
+def blueprint_index() -> TrigramIndex:
+    """
+    Builds the search index over the blueprint names once, together with the blueprint catalog.
+    """
+    return TrigramIndex(all_blueprints())
+
+
+@lru_cache(maxsize=None)
+def resource_uses() -> dict:
+    """
+    Builds the reverse index of the blueprint catalog once: which blueprints use each resource.
+
+    Returns:
+        dict: ( blueprint name, count per click ) tuples by resource name, sorted by blueprint name.
+    """
+    uses = defaultdict(list)
+    for name, blueprint in all_blueprints().items():
+        for slot in blueprint.slots:
+            uses[slot.name].append((name, slot.count))
+    return {resource: tuple(sorted(blueprints)) for resource, blueprints in uses.items()}
+
+
+def blueprints_using(resource: str) -> tuple:
+    """
+    Returns the ( blueprint name, count per click ) of every blueprint using a resource, see `resource_uses`.
+    """
+    return resource_uses().get(resource, ())
+
+
+@lru_cache(maxsize=None)
+@cached_catalog("resources", res_filename)
+def all_resources() -> dict:
+    """
+    Loads the resource catalog on first use.
+
+    Returns:
+        dict: The TT value ( Decimal, in PED ) of one unit by resource name.
+    """
+    resources = {}
+    if os.path.exists(res_filename):
+        with open(res_filename, 'r') as f:
+            data = json.loads(f.read())
+            for name, value in data.items():
+                resources[name] = Decimal(value)
+    return resources
+
+
+def __getattr__(name):
+    # The ALL_RESOURCES and ALL_BLUEPRINTS catalogs can still be imported by name, they load when first accessed
+    if name == "ALL_RESOURCES":
+        return all_resources()
+    if name == "ALL_BLUEPRINTS":
+        return all_blueprints()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
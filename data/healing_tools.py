@@ -1,42 +1,32 @@
 import json
 from decimal import Decimal
+from functools import lru_cache
+from data.cache import cached_catalog
 from helpers import resource_path
 
-ALL_HEALING_TOOLS = {}
 data_filename = resource_path("healing_tools.json")
 
-with open(data_filename, 'r') as f:
-    data = json.loads(f.read())
-    for name, healing_tool_data in data.items():
-        healing_tool_data["decay"] = Decimal(healing_tool_data["decay"])
-        ALL_HEALING_TOOLS[name] = healing_tool_data
 
-FIELDS = ("name", "type", "decay")
-
-if __name__ == "__main__":
-    import sys
-
-    all_healing_tools = {}
-
-    for fn in sys.argv[1:]:
-        with open(fn, 'r') as f:
-            header = True
-            for line in f.readlines():
-                if header:
-                    header = False
-                    continue
-                try:
-                    data = dict(zip(FIELDS, line.split(";")))
-                    data["decay"] = Decimal(data["decay"] if data["decay"].strip() else "0.0")
-
-                    all_healing_tools[data["name"]] = {
-                        "type": data["type"],
-                        "decay": str(data["decay"])
-                    }
-
-                except:
-                    break
-
-    if all_healing_tools:
-        output = open(data_filename, 'w')
-        output.write(json.dumps(all_healing_tools, indent=2, sort_keys=True))
+@lru_cache(maxsize=None)
+@cached_catalog("healing_tools", data_filename)
+def all_healing_tools() -> dict:
+    """
+    Loads the healing tools catalog on first use.
+
+    Returns:
+        dict: The healing tool data ( type and decay ) by tool name.
+    """
+    healing_tools = {}
+    with open(data_filename, 'r') as f:
+        data = json.loads(f.read())
+        for name, healing_tool_data in data.items():
+            healing_tool_data["decay"] = Decimal(healing_tool_data["decay"])
+            healing_tools[name] = healing_tool_data
+    return healing_tools
+
+
+def __getattr__(name):
+    # The ALL_HEALING_TOOLS catalog can still be imported by name, it loads when first accessed
+    if name == "ALL_HEALING_TOOLS":
+        return all_healing_tools()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
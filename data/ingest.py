@@ -0,0 +1,323 @@
+"""
+Imports wiki CSV exports ( ";" separated, with a header row ) into the game data catalogs.
+
+The exports are streamed row by row and every field is validated. Rows that fail validation are reported with
+their file and line instead of silently ending the import. The result is diffed against the current catalog and
+merged into it: new and changed entries are written, entries missing from the export are kept unless --replace is
+given. The processed catalog caches ( see data/cache.py ) are rebuilt on the next launch as the JSON changed.
+
+    python -m data.ingest weapons export.csv [more.csv ...] [--dry-run] [--replace] [--rejects rejects.csv]
+
+Kinds: weapons, attachments, sights, scopes, healing_tools and crafting ( blueprints and resource values ).
+"""
+import csv
+import glob
+import json
+import os
+from collections import namedtuple, OrderedDict
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from helpers import resource_path
+
+
+# `group` names the field of rows that together make up one entry ( e.g the slots of a blueprint ), None if every
+# row is an entry of its own
+CatalogSpec = namedtuple("CatalogSpec", ["fields", "filenames", "convert", "group"], defaults=(None,))
+Reject = namedtuple("Reject", ["path", "line", "reason", "row"])
+CatalogDiff = namedtuple("CatalogDiff", ["added", "changed", "removed", "unchanged"])
+
+
+class RowError(ValueError):
+    pass
+
+
+def _decimal(row: dict, field: str, default: str = "0.0") -> Decimal:
+    value = (row.get(field) or "").strip() or default
+    try:
+        number = Decimal(value.replace(",", "."))
+    except InvalidOperation:
+        raise RowError(f"{field} is not a number: {value!r}")
+    if not number.is_finite() or number < 0:
+        raise RowError(f"{field} must be a non-negative number: {value!r}")
+    return number
+
+
+def _integer(row: dict, field: str, default: str = "0") -> int:
+    value = (row.get(field) or "").strip() or default
+    try:
+        number = int(value)
+    except ValueError:
+        raise RowError(f"{field} is not a whole number: {value!r}")
+    if number < 0:
+        raise RowError(f"{field} must be a non-negative whole number: {value!r}")
+    return number
+
+
+def _name(row: dict, field: str = "name") -> str:
+    name = (row.get(field) or "").strip()
+    if not name:
+        raise RowError(f"{field} is empty")
+    return name
+
+
+def _convert_weapon(row: dict):
+    # Decay is listed in PEC, the catalogs store PED. The damage and weapon type ( e.g Laser, BLP ) are kept for the
+    # loadout optimizer, which picks the amps that fit the weapon from them.
+    yield "weapons", _name(row), {
+        "type": (row.get("class") or "").strip(),
+        "weapon_type": (row.get("type") or "").strip(),
+        "damage": str(_decimal(row, "damage")),
+        "decay": str(_decimal(row, "decay") / Decimal(100.0)),
+        "ammo": _integer(row, "ammo"),
+    }
+
+
+def _convert_attachment(catalog: str) -> Callable:
+    def convert(row: dict):
+        attachment = {
+            "type": (row.get("type") or "").strip(),
+            "decay": str(_decimal(row, "decay") / Decimal(100.0)),
+            "ammo": _integer(row, "ammo"),
+        }
+        # Only amplifier exports have a damage column
+        if (row.get("damage") or "").strip():
+            attachment["damage"] = str(_decimal(row, "damage"))
+        yield catalog, _name(row), attachment
+    return convert
+
+
+def _convert_healing_tool(row: dict):
+    yield "healing_tools", _name(row), {
+        "type": (row.get("type") or "").strip(),
+        "decay": str(_decimal(row, "decay")),
+    }
+
+
+def _convert_crafting(row: dict):
+    blueprint, material = _name(row), _name(row, "material")
+    amount = _integer(row, "amount", default="1")
+    if not amount:
+        raise RowError("amount must be at least 1")
+    cost = _decimal(row, "cost")
+    # Every row is one slot of the blueprint, the slots are collected into its list by `ingest`
+    yield "blueprints", blueprint, [[material, amount]]
+    yield "resources", material, str(cost / amount)
+
+
+ATTACHMENT_FIELDS = ("name", "type", "decay", "ammo", "damage")
+
+SPECS: Dict[str, CatalogSpec] = {
+    "weapons": CatalogSpec(("name", "class", "type", "damage", "decay", "ammo"),
+                           {"weapons": resource_path("weapons.json")}, _convert_weapon),
+    "attachments": CatalogSpec(ATTACHMENT_FIELDS, {"attachments": resource_path("attachments.json")},
+                               _convert_attachment("attachments")),
+    "sights": CatalogSpec(ATTACHMENT_FIELDS, {"sights": resource_path("sights.json")}, _convert_attachment("sights")),
+    "scopes": CatalogSpec(ATTACHMENT_FIELDS, {"scopes": resource_path("scopes.json")}, _convert_attachment("scopes")),
+    "healing_tools": CatalogSpec(("name", "type", "decay"), {"healing_tools": resource_path("healing_tools.json")},
+                                 _convert_healing_tool),
+    "crafting": CatalogSpec(("name", "material", "amount", "cost", "_", "__", "___"),
+                            {"blueprints": resource_path("crafting.json"), "resources": resource_path("resources.json")},
+                            _convert_crafting, group="name"),
+}
+
+# Catalogs whose entries are built up from several rows
+LIST_CATALOGS = ("blueprints",)
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """
+    Expands wildcards in the given paths, the Windows shell doesn't.
+    """
+    paths = []
+    for pattern in patterns:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    return paths
+
+
+def read_rows(paths: Iterable[str], fields: Tuple[str, ...]) -> Iterator[Tuple[str, int, dict]]:
+    """
+    Streams the rows of the CSV exports, skipping their header rows.
+
+    Returns:
+        Iterator[Tuple[str, int, dict]]: The path, line number and fields of every row.
+    """
+    for path in paths:
+        with open(path, 'r', encoding="utf_8_sig", newline="") as f:
+            reader = csv.reader(f, delimiter=";")
+            next(reader, None)
+            for row in reader:
+                if any(value.strip() for value in row):
+                    yield path, reader.line_num, dict(zip(fields, row))
+
+
+def ingest(kind: str, paths: Iterable[str], rejects: List[Reject]) -> Dict[str, OrderedDict]:
+    """
+    Converts CSV exports into catalog entries.
+
+    Rows of a group ( see CatalogSpec ) are only imported together: if any row of a blueprint is rejected the whole
+    blueprint, and the resource values from its rows, are left out and reported as rejected too, rather than
+    importing it with a material missing.
+
+    Args:
+        kind (str): The kind of export, one of SPECS.
+        paths (Iterable[str]): The CSV files.
+        rejects (List[Reject]): Rows that failed validation are appended to it.
+
+    Returns:
+        Dict[str, OrderedDict]: The imported entries by key, per catalog.
+    """
+    spec = SPECS[kind]
+    catalogs = {catalog: OrderedDict() for catalog in spec.filenames}
+    # The entries of grouped rows are held back until every row was read, with the first rejected row of each group
+    groups = OrderedDict()
+    rejected_groups = OrderedDict()
+
+    for path, line, row in read_rows(paths, spec.fields):
+        group = (row.get(spec.group) or "").strip() if spec.group else None
+        try:
+            # Converted fully before anything is added, so a bad field rejects the whole row
+            entries = list(spec.convert(row))
+        except RowError as e:
+            rejects.append(Reject(path, line, str(e), row))
+            if group:
+                rejected_groups.setdefault(group, (path, line))
+            continue
+        if group:
+            groups.setdefault(group, []).extend(entries)
+        else:
+            _add_entries(catalogs, entries)
+
+    for group, entries in groups.items():
+        if group not in rejected_groups:
+            _add_entries(catalogs, entries)
+    for group, (path, line) in rejected_groups.items():
+        rejects.append(Reject(path, line, f"{group} not imported, one of its rows was rejected", {spec.group: group}))
+    return catalogs
+
+
+def _add_entries(catalogs: Dict[str, OrderedDict], entries: Iterable[Tuple[str, str, object]]):
+    for catalog, key, value in entries:
+        if catalog in LIST_CATALOGS and key in catalogs[catalog]:
+            catalogs[catalog][key] = catalogs[catalog][key] + value
+        else:
+            catalogs[catalog][key] = value
+
+
+def _same(current, new) -> bool:
+    """
+    Compares catalog values, numbers stored as strings are compared by value ( "0.050" == "0.05" ).
+    """
+    if isinstance(current, dict) and isinstance(new, dict):
+        return current.keys() == new.keys() and all(_same(current[k], new[k]) for k in current)
+    if isinstance(current, str) and isinstance(new, str) and current != new:
+        try:
+            return Decimal(current) == Decimal(new)
+        except InvalidOperation:
+            return False
+    return current == new
+
+
+def diff_catalog(current: dict, imported: dict) -> CatalogDiff:
+    """
+    Compares imported entries with the current catalog.
+
+    Returns:
+        CatalogDiff: The sorted keys that were added, changed, missing from the import and unchanged.
+    """
+    added, changed, unchanged = [], [], []
+    for key, value in imported.items():
+        if key not in current:
+            added.append(key)
+        elif _same(current[key], value):
+            unchanged.append(key)
+        else:
+            changed.append(key)
+    removed = [key for key in current if key not in imported]
+    return CatalogDiff(sorted(added), sorted(changed), sorted(removed), sorted(unchanged))
+
+
+def merge_catalog(current: dict, imported: dict, changes: CatalogDiff, replace: bool = False) -> dict:
+    """
+    Applies the added and changed entries to the catalog, unchanged entries keep their current formatting.
+
+    Args:
+        replace (bool): Also drop the entries missing from the import.
+    """
+    merged = dict(current)
+    for key in changes.added + changes.changed:
+        merged[key] = imported[key]
+    if replace:
+        for key in changes.removed:
+            del merged[key]
+    return merged
+
+
+def load_json(filename: str) -> dict:
+    if not os.path.exists(filename):
+        return {}
+    with open(filename, 'r') as f:
+        return json.loads(f.read())
+
+
+def write_json(filename: str, catalog: dict):
+    with open(filename + ".tmp", 'w') as f:
+        f.write(json.dumps(catalog, indent=2, sort_keys=True))
+    os.replace(filename + ".tmp", filename)
+
+
+def write_rejects(filename: str, rejects: List[Reject], fields: Tuple[str, ...]):
+    with open(filename, 'w', newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(("file", "line", "reason") + fields)
+        for reject in rejects:
+            writer.writerow((reject.path, reject.line, reject.reason) + tuple(reject.row.get(f, "") for f in fields))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import wiki CSV exports into the LootNanny catalogs")
+    parser.add_argument("kind", choices=sorted(SPECS))
+    parser.add_argument("paths", nargs="+", help="CSV exports, wildcards are expanded")
+    parser.add_argument("--dry-run", action="store_true", help="Only report the differences, don't write")
+    parser.add_argument("--replace", action="store_true", help="Remove entries missing from the exports")
+    parser.add_argument("--rejects", help="Write the rejected rows to this CSV file")
+    parser.add_argument("--verbose", action="store_true", help="List every added, changed and removed key")
+    args = parser.parse_args()
+
+    spec = SPECS[args.kind]
+    rejects = []
+    catalogs = ingest(args.kind, expand_paths(args.paths), rejects)
+
+    for reject in rejects[:20]:
+        print(f"Rejected {reject.path}:{reject.line}: {reject.reason}")
+    if len(rejects) > 20:
+        print(f"... and {len(rejects) - 20} more rejected rows")
+    if args.rejects and rejects:
+        write_rejects(args.rejects, rejects, spec.fields)
+
+    for catalog, imported in catalogs.items():
+        filename = spec.filenames[catalog]
+        current = load_json(filename)
+        changes = diff_catalog(current, imported)
+        removed = f"{len(changes.removed)} {'removed' if args.replace else 'kept, not in the export'}"
+        print(f"{catalog}: {len(imported)} imported, {len(changes.added)} added, {len(changes.changed)} changed, "
+              f"{len(changes.unchanged)} unchanged, {removed}")
+        if args.verbose:
+            listed = (("+", changes.added), ("~", changes.changed)) + ((("-", changes.removed),) if args.replace else ())
+            for label, keys in listed:
+                for key in keys:
+                    print(f"  {label} {key}")
+
+        if not imported:
+            print(f"Nothing imported, {filename} left untouched")
+        elif args.dry_run or not (changes.added or changes.changed or (args.replace and changes.removed)):
+            continue
+        else:
+            write_json(filename, merge_catalog(current, imported, changes, args.replace))
+            print(f"Wrote {filename}")
+
+
+if __name__ == "__main__":
+    main()
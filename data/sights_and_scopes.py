@@ -1,61 +1,54 @@
 import json
-import sys
 import os
 from decimal import Decimal
+from functools import lru_cache
+from data.cache import cached_catalog
 from helpers import resource_path
 
 
-SIGHTS = {}
-SCOPES = {}
 sights_filename = resource_path("sights.json")
 scopes_filename = resource_path("scopes.json")
 
-if os.path.exists(sights_filename):
-    with open(sights_filename, 'r') as f:
-        data = json.loads(f.read())
-        for name, attachment_data in data.items():
-            attachment_data["decay"] = Decimal(attachment_data["decay"])
-            SIGHTS[name] = attachment_data
-
-if os.path.exists(scopes_filename):
-    with open(scopes_filename, 'r') as f:
-        data = json.loads(f.read())
-        for name, attachment_data in data.items():
-            attachment_data["decay"] = Decimal(attachment_data["decay"])
-            SCOPES[name] = attachment_data
-
-
-FIELDS = ("name", "type", "decay", "ammo")
-
-if __name__ == "__main__":
-
-    file_type = ("sights", "scopes")
-
-    for i, fn in enumerate(sys.argv[1:]):
-
-        file_data = {}
-        with open(fn, 'r') as f:
-            header = True
-            for line in f.readlines():
-                if header:
-                    header = False
-                    continue
-                try:
-                    data = dict(zip(FIELDS, line.split(";")))
-                    data["decay"] = Decimal(data["decay"] if data["decay"].strip() else "0.0") / Decimal(100.0)
-                    data["ammo"] = int(data["ammo"] if data["ammo"].strip() else 0)
-
-                    file_data[data["name"]] = {
-                        "type": data["type"],
-                        "decay": str(data["decay"]),
-                        "ammo": data["ammo"]
-                    }
-
-                except:
-                    raise
-                    print(line)
-                    break
-
-        if file_data:
-            output = open(f"{file_type[i]}.json", 'w')
-            output.write(json.dumps(file_data, indent=2, sort_keys=True))
+
+def _load_attachments(filename: str) -> dict:
+    attachments = {}
+    if os.path.exists(filename):
+        with open(filename, 'r') as f:
+            data = json.loads(f.read())
+            for name, attachment_data in data.items():
+                attachment_data["decay"] = Decimal(attachment_data["decay"])
+                attachments[name] = attachment_data
+    return attachments
+
+
+@lru_cache(maxsize=None)
+@cached_catalog("sights", sights_filename)
+def sights() -> dict:
+    """
+    Loads the sights catalog on first use.
+
+    Returns:
+        dict: The sight data ( type, decay in PED and ammo burn ) by sight name.
+    """
+    return _load_attachments(sights_filename)
+
+
+@lru_cache(maxsize=None)
+@cached_catalog("scopes", scopes_filename)
+def scopes() -> dict:
+    """
+    Loads the scopes catalog on first use.
+
+    Returns:
+        dict: The scope data ( type, decay in PED and ammo burn ) by scope name.
+    """
+    return _load_attachments(scopes_filename)
+
+
+def __getattr__(name):
+    # The SIGHTS and SCOPES catalogs can still be imported by name, they load when first accessed
+    if name == "SIGHTS":
+        return sights()
+    if name == "SCOPES":
+        return scopes()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
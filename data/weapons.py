@@ -1,47 +1,37 @@
 import json
-import sys
-import os
 from decimal import Decimal
+from functools import lru_cache
+from data.cache import cached_catalog
 from helpers import resource_path
 
-ALL_WEAPONS = {}
 data_filename = resource_path("weapons.json")
 
 
-with open(data_filename, 'r') as f:
-    data = json.loads(f.read())
-    for name, weapon_data in data.items():
-        weapon_data["decay"] = Decimal(weapon_data["decay"])
-        ALL_WEAPONS[name] = weapon_data
-
-FIELDS = ("name", "class", "type", "damage", "decay", "ammo")
-
-if __name__ == "__main__":
-    import sys
-
-    all_weapons = {}
-
-    for fn in sys.argv[1:]:
-        with open(fn, 'r') as f:
-            header = True
-            for line in f.readlines():
-                if header:
-                    header = False
-                    continue
-                try:
-                    data = dict(zip(FIELDS, line.split(";")))
-                    data["decay"] = Decimal(data["decay"] if data["decay"].strip() else "0.0") / Decimal(100.0)
-                    data["ammo"] = int(data["ammo"] if data["ammo"].strip() else 0)
-
-                    all_weapons[data["name"]] = {
-                        "type": data["class"],
-                        "decay": str(data["decay"]),
-                        "ammo": data["ammo"]
-                    }
-
-                except:
-                    break
-
-    if all_weapons:
-        output = open(data_filename, 'w')
-        output.write(json.dumps(all_weapons, indent=2, sort_keys=True))
+@lru_cache(maxsize=None)
+@cached_catalog("weapons", data_filename)
+def all_weapons() -> dict:
+    """
+    Loads the weapons catalog on first use.
+
+    The returned dict is shared, `modules.combat.register_custom_weapons` adds the user's custom weapons to it.
+
+    Returns:
+        dict: The weapon data ( type, decay in PED, ammo burn and, for imported weapons, weapon type and damage )
+            by weapon name.
+    """
+    weapons = {}
+    with open(data_filename, 'r') as f:
+        data = json.loads(f.read())
+        for name, weapon_data in data.items():
+            weapon_data["decay"] = Decimal(weapon_data["decay"])
+            if "damage" in weapon_data:
+                weapon_data["damage"] = Decimal(weapon_data["damage"])
+            weapons[name] = weapon_data
+    return weapons
+
+
+def __getattr__(name):
+    # The ALL_WEAPONS catalog can still be imported by name, it loads when first accessed
+    if name == "ALL_WEAPONS":
+        return all_weapons()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,99 @@
+"""
+Runs the LootNanny tracker without a user interface.
+
+Tails chat.log, tracks the run with the selected loadout from the configuration and saves it like the app does,
+without loading PyQt5 or pyqtgraph. Stop with CTRL+C, the run is ended and saved unless --keep-open is given.
+
+    python headless.py [--location chat.log] [--cost-per-shot 0.05] [--keep-open]
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+from chat import ChatReader
+from config import Config
+from modules.combat import TrackingEngine, register_custom_weapons, loadout_costs
+
+# Seconds between reading chat lines
+TICK = 0.1
+
+# Seconds between reading chat lines once chat.log has been quiet for the configured idle timeout
+IDLE_TICK = 5.0
+
+# Seconds between saves of the active run
+SAVE_INTERVAL = 60
+
+
+def format_status(run) -> str:
+    """
+    Formats a one line summary of a run for the console.
+    """
+    spend = run.total_cost + run.extra_spend
+    return_perc = run.tt_return / spend * 100 if spend else 0
+    return f"Loots: {run.loot_instances:,} | Spend: {run.total_cost:.2f} PED | " \
+           f"Return: {run.tt_return:.2f} PED ({return_perc:.2f}%) | Globals: {run.globals} | HOFs: {run.hofs}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track LootNanny runs without a user interface")
+    parser.add_argument("--location", help="Path of chat.log, defaults to the configured location")
+    parser.add_argument("--cost-per-shot", type=Decimal,
+                        help="Cost per shot in PED, defaults to the cost of the selected loadout")
+    parser.add_argument("--keep-open", action="store_true", help="Don't end the run on exit, so it can be resumed")
+    parser.add_argument("--rank", type=int, metavar="N",
+                        help="Print the N cheapest weapon, amp and damage enhancer combinations and exit")
+    args = parser.parse_args()
+
+    if args.rank:
+        for cost, weapon, amp, damage_enh in loadout_costs.cost_table().cheapest(args.rank):
+            print(f"{cost:.6f} PED  {weapon}  {amp or 'No amp'}  damage enhancers {damage_enh}")
+        return
+
+    config = Config()
+    location = args.location or config.location.value
+    if not location:
+        parser.error("No chat.log location configured, pass --location")
+
+    engine = TrackingEngine(config)
+    if args.cost_per_shot is not None:
+        engine.decay = args.cost_per_shot
+    elif config.selected_loadout.value and config.selected_loadout.value.weapon:
+        register_custom_weapons(config.custom_weapons.value)
+        engine.ammo_burn, engine.decay, _ = loadout_costs.cost(config.selected_loadout.value)
+
+    engine.load_runs()
+    engine.update_active_run_cost()
+    engine.start_run()
+    engine.add_listener(lambda changed: print(format_status(engine.active_run)))
+
+    reader = ChatReader(location, idle_timeout=config.idle_timeout.value)
+    print(f"Tracking {location} at {engine.cost_per_shot:.6f} PED per shot, CTRL+C to stop")
+
+    last_save = time.monotonic()
+    try:
+        while True:
+            reader.delay_start_reader()
+            engine.tick(reader.take_lines())
+
+            if time.monotonic() - last_save > SAVE_INTERVAL:
+                engine.save_active_run()
+                last_save = time.monotonic()
+            time.sleep(IDLE_TICK if reader.is_idle() else TICK)
+    except KeyboardInterrupt:
+        pass
+
+    if args.keep_open:
+        engine.save_active_run(force=True)
+    else:
+        engine.stop_run()
+    config.flush()
+    if engine.runs:
+        print(format_status(engine.runs[-1]))
+
+
+if __name__ == "__main__":
+    main()
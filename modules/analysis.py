@@ -0,0 +1,123 @@
+"""
+Lifetime analysis over every stored run.
+
+Aggregation only needs NumPy and the run store, so it can run on a worker thread ( see views/analysis.py )
+or from the command line:
+
+    python -m modules.analysis
+"""
+from collections import namedtuple
+from typing import Callable, Iterable
+
+import numpy as np
+
+from helpers import dt_to_ts
+from modules import run_store
+from modules.combat import HuntingTrip, iter_runs
+
+
+# Number of log spaced bins of the multiplier distribution
+MULTIPLIER_BINS = 60
+
+RunsAnalysis = namedtuple("RunsAnalysis", [
+    "starts",  # Run start unix timestamps
+    "return_perc",  # TT return % per run
+    "return_mu_perc",  # Return % per run including markup
+    "cumulative_profit",  # Running total of the TT profit over all runs ( PED )
+    "cumulative_mu_profit",  # Running total of the profit including markup ( PED )
+    "multiplier_edges",  # Edges of the multiplier distribution bins
+    "multiplier_counts",  # Number of loots per multiplier bin
+])
+
+
+class AnalysisCancelled(Exception):
+    pass
+
+
+def aggregate_runs(runs: Iterable[HuntingTrip], total: int = 0, progress: Callable = None,
+                   is_cancelled: Callable = None) -> RunsAnalysis:
+    """
+    Aggregates runs into per run and lifetime NumPy arrays.
+
+    Runs without any spend, and None entries ( runs that failed to load ), are skipped. The runs should be loaded
+    with their loot for the markup return and multiplier distribution to be complete.
+
+    Args:
+        runs (Iterable[HuntingTrip]): The runs ordered by start time.
+        total (int): The number of runs, only used for progress reports.
+        progress (Callable): Called with ( runs done, total ) after every run.
+        is_cancelled (Callable): Returns True when the aggregation should stop.
+
+    Raises:
+        AnalysisCancelled: When `is_cancelled` returned True.
+
+    Returns:
+        RunsAnalysis: The aggregated arrays.
+    """
+    starts, spends, returns, mu_returns = [], [], [], []
+    multipliers = []
+
+    for i, run in enumerate(runs, 1):
+        if is_cancelled and is_cancelled():
+            raise AnalysisCancelled()
+
+        spend = run.total_cost + run.extra_spend if run is not None else 0
+        if spend:
+            starts.append(dt_to_ts(run.time_start))
+            spends.append(float(spend))
+            returns.append(float(run.tt_return))
+            mu_returns.append(float(run.total_return_mu))
+
+            costs = np.asarray(run.multipliers[0], dtype=np.float64)
+            values = np.asarray(run.multipliers[1], dtype=np.float64)
+            if len(costs) and len(costs) == len(values):
+                valid = costs > 0
+                multipliers.append(values[valid] / costs[valid])
+
+        if progress:
+            progress(i, total)
+
+    spends = np.array(spends)
+    returns = np.array(returns)
+    mu_returns = np.array(mu_returns)
+
+    multipliers = np.concatenate(multipliers) if multipliers else np.empty(0)
+    multipliers = multipliers[multipliers > 0]
+    if len(multipliers):
+        low, high = np.log10(multipliers.min()), np.log10(multipliers.max())
+        edges = np.logspace(low, max(high, low + 1), MULTIPLIER_BINS + 1)
+        counts, edges = np.histogram(multipliers, bins=edges)
+    else:
+        counts, edges = np.empty(0), np.empty(0)
+
+    return RunsAnalysis(
+        starts=np.array(starts),
+        return_perc=returns / spends * 100 if len(spends) else np.empty(0),
+        return_mu_perc=mu_returns / spends * 100 if len(spends) else np.empty(0),
+        cumulative_profit=np.cumsum(returns - spends),
+        cumulative_mu_profit=np.cumsum(mu_returns - spends),
+        multiplier_edges=edges,
+        multiplier_counts=counts,
+    )
+
+
+def analyze_stored_runs(progress: Callable = None, is_cancelled: Callable = None) -> RunsAnalysis:
+    """
+    Loads every stored run one at a time, with its loot, and aggregates them with `aggregate_runs`.
+
+    The runs are loaded with `iter_runs`, so corrupted run files and runs saved by a newer version of LootNanny
+    are skipped, left untouched and reported on stderr, apart from the summary printed on stdout from the command
+    line.
+    """
+    run_files = run_store.list_run_files()
+    runs = iter_runs(include_loot=True, run_files=run_files, yield_unreadable=True)
+    return aggregate_runs(runs, len(run_files), progress, is_cancelled)
+
+
+if __name__ == "__main__":
+    analysis = analyze_stored_runs()
+    print(f"Runs: {len(analysis.starts)}")
+    if len(analysis.starts):
+        print(f"Average return: {analysis.return_perc.mean():.2f}% ( {analysis.return_mu_perc.mean():.2f}% with markup )")
+        print(f"Total profit: {analysis.cumulative_profit[-1]:.2f} PED "
+              f"( {analysis.cumulative_mu_profit[-1]:.2f} PED with markup )")
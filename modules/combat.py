@@ -4,6 +4,7 @@ import time
 from typing import List
 from decimal import Decimal
 import threading
+import sys
 import os
 import json
 
@@ -11,12 +12,12 @@ import json
 from modules.base import BaseModule
 from chat import BaseChatRow, CombatRow, LootInstance, SkillRow, EnhancerBreakages, HealRow, GlobalInstance
 from helpers import dt_to_ts, ts_to_dt, format_filename
-from ocr import screenshot_window
 from modules.markup import MarkupStore
+from modules import run_store, snapshot
 
 
 RUNS_FILE = format_filename("runs.json")
-RUNS_DIRECTORY = format_filename("")
+RUNS_DIRECTORY = run_store.RUNS_DIRECTORY
 MarkupSingleton = MarkupStore()
 
 
@@ -25,6 +26,9 @@ def take_screenshot(delay_ms, directory, glob: GlobalInstance):
     :param glob:
     :return:
     """
+    # Imported late, screen capture dependencies are only needed once a global is screenshotted
+    from ocr import screenshot_window
+
     time.sleep(delay_ms / 1000.0)
     im, _, _ = screenshot_window()
 
@@ -100,6 +104,180 @@ class Loadout(object):
 CustomWeapon = namedtuple("CustomWeapon", ["weapon", "decay", "ammo_burn"])
 
 
+def register_custom_weapons(custom_weapons):
+    """
+    Adds the user's custom weapons to the `all_weapons()` catalog under the key "!CUSTOM - {weapon_name}".
+
+    Args:
+        custom_weapons (List[CustomWeapon]): The custom weapons from the configuration.
+
+    Returns:
+        None
+    """
+    from data.weapons import all_weapons
+    from utils.search import catalog_changed
+
+    weapons = all_weapons()
+    for custom_weapon in custom_weapons:
+        custom_weapon = CustomWeapon(*custom_weapon)
+        weapons[f"!CUSTOM - {custom_weapon.weapon}"] = {
+            "type": "custom",
+            "decay": Decimal(custom_weapon.decay),
+            "ammo": custom_weapon.ammo_burn
+        }
+    loadout_costs.clear()
+    catalog_changed(weapons)
+
+
+# Ammo is bought at 10000 units per PED
+AMMO_PER_PED = Decimal(10000)
+
+# Enhancers go up to tier 10, every damage tier adds 10% to the weapon cost and every economy tier saves 1%
+ENHANCER_LEVELS = range(11)
+DAMAGE_ENHANCER_STEP = Decimal("0.1")
+ECONOMY_ENHANCER_STEP = Decimal("0.01")
+
+LoadoutCost = namedtuple("LoadoutCost", ["ammo", "decay", "cost_per_shot"])
+
+
+def item_cost_per_shot(item: dict) -> float:
+    """
+    The cost per shot ( in PED ) of a single catalog weapon or attachment, as a float for numpy.
+    """
+    return float(Decimal(item["ammo"]) / AMMO_PER_PED + Decimal(item["decay"]))
+
+
+class CostTable(object):
+    """
+    The cost per shot ( in PED ) of every weapon with every amp and damage enhancer level, as a
+    weapons x amps x levels array. The first amp is None, the weapon without an amp. Weapons and amps whose
+    cost is unknown ( zero ) are left out.
+    """
+
+    def __init__(self, weapons: list, amps: list, damage_levels: list, costs):
+        self.weapons = weapons
+        self.amps = amps
+        self.damage_levels = damage_levels
+        self.costs = costs
+
+    def cost_of(self, weapon: str, amp: str = None, damage_enh: int = 0) -> float:
+        return float(self.costs[self.weapons.index(weapon), self.amps.index(amp),
+                                self.damage_levels.index(damage_enh)])
+
+    def cheapest(self, count: int = 20) -> list:
+        """
+        Ranks the combinations by cost per shot without sorting the whole table.
+
+        Returns:
+            list: ( cost per shot, weapon, amp, damage enhancer level ) tuples, cheapest first.
+        """
+        import numpy as np
+
+        flat = self.costs.ravel()
+        count = min(count, flat.size)
+        if count <= 0:
+            return []
+        best = np.argpartition(flat, count - 1)[:count]
+        best = best[np.argsort(flat[best], kind="stable")]
+        ranked = []
+        for w, a, d in zip(*np.unravel_index(best, self.costs.shape)):
+            ranked.append((float(self.costs[w, a, d]), self.weapons[w], self.amps[a], self.damage_levels[d]))
+        return ranked
+
+
+class LoadoutCostCalculator(object):
+    """
+    Calculates the ammo burn, decay and cost per shot of loadouts.
+
+    Single loadouts are calculated with Decimal throughout and memoized on their fields, so the configuration tab can
+    ask again on every change for free. `cost_table` calculates the whole weapon x amp x damage enhancer catalog at
+    once with numpy ( as floats, which is plenty for ranking ). Call `clear` when the weapon catalog changes.
+    """
+
+    def __init__(self):
+        self._costs = {}
+        self._tables = {}
+
+    def clear(self):
+        self._costs.clear()
+        self._tables.clear()
+
+    def cost(self, loadout: Loadout, include_sights: bool = True) -> LoadoutCost:
+        """
+        Calculates the cost of a loadout.
+
+        Args:
+            loadout (Loadout): The loadout, its weapon must be set.
+            include_sights (bool): Whether to include the scope and sights, or only the weapon and amp.
+
+        Returns:
+            LoadoutCost: The ammo burn, the decay ( in PED ) and the cost per shot ( in PED ).
+        """
+        key = (loadout.weapon, loadout.amp, loadout.damage_enh, loadout.economy_enh)
+        if include_sights:
+            key += (loadout.scope, loadout.sight_1, loadout.sight_2)
+        cost = self._costs.get(key)
+        if cost is None:
+            cost = self._costs[key] = self._calculate(loadout, include_sights)
+        return cost
+
+    @staticmethod
+    def _calculate(loadout: Loadout, include_sights: bool) -> LoadoutCost:
+        from data.weapons import all_weapons
+        from data.sights_and_scopes import sights, scopes
+        from data.attachments import all_attachments
+
+        weapon = all_weapons()[loadout.weapon]
+        enhancers = (1 + DAMAGE_ENHANCER_STEP * loadout.damage_enh) * (1 - ECONOMY_ENHANCER_STEP * loadout.economy_enh)
+        ammo = Decimal(weapon["ammo"]) * enhancers
+        decay = Decimal(weapon["decay"]) * enhancers
+
+        attachments = [all_attachments().get(loadout.amp)]
+        if include_sights:
+            attachments += [scopes().get(loadout.scope), sights().get(loadout.sight_1), sights().get(loadout.sight_2)]
+        for attachment in attachments:
+            if attachment:
+                ammo += attachment["ammo"]
+                decay += attachment["decay"]
+        return LoadoutCost(ammo, decay, ammo / AMMO_PER_PED + decay)
+
+    def cost_table(self, damage_levels=ENHANCER_LEVELS, economy_enh: int = 0) -> CostTable:
+        """
+        Calculates the cost per shot of every weapon with every amp and damage enhancer level in one pass.
+
+        Args:
+            damage_levels (Iterable[int]): The damage enhancer levels to include.
+            economy_enh (int): The economy enhancer level of every weapon.
+
+        Returns:
+            CostTable: The costs, memoized until `clear` is called.
+        """
+        import numpy as np
+        from data.weapons import all_weapons
+        from data.attachments import all_attachments
+
+        key = (tuple(damage_levels), economy_enh)
+        if key in self._tables:
+            return self._tables[key]
+
+        # Entries without decay or ammo are missing their data, they would top every ranking
+        weapons = sorted(name for name, weapon in all_weapons().items() if item_cost_per_shot(weapon))
+        amps = [None] + sorted(name for name, amp in all_attachments().items() if item_cost_per_shot(amp))
+        weapon_cost = np.array([item_cost_per_shot(all_weapons()[name]) for name in weapons])
+        amp_cost = np.array([0.0] + [item_cost_per_shot(all_attachments()[name]) for name in amps[1:]])
+        # The enhancers scale both the ammo and the decay of the weapon, but not of the amp
+        levels = np.array(key[0], dtype=np.float64)
+        enhancers = (1 + float(DAMAGE_ENHANCER_STEP) * levels) * (1 - float(ECONOMY_ENHANCER_STEP) * economy_enh)
+
+        costs = weapon_cost[:, None, None] * enhancers[None, None, :] + amp_cost[None, :, None]
+        table = self._tables[key] = CostTable(weapons, amps, list(key[0]), costs)
+        return table
+
+
+# Shared by the configuration tab and the headless tracker
+loadout_costs = LoadoutCostCalculator()
+
+
 class HuntingTrip(object):
 
     def __init__(self, time_start: datetime, cost_per_shot: Decimal):
@@ -143,6 +321,10 @@ class HuntingTrip(object):
         self.total_crits = 0
         self.total_misses = 0
 
+        # Formatted runs table row, see summary_row
+        self._summary_key = None
+        self._summary_row = None
+
     def serialize_run(self):
         """
         Serializes the run into a dictionary format.
@@ -178,8 +360,8 @@ class HuntingTrip(object):
                 "misses": self.total_misses
             },
             "graphs": {
-                "returns": self.return_over_time,
-                "multis": list(self.multipliers)
+                "returns": list(self.return_over_time),
+                "multis": [list(self.multipliers[0]), list(self.multipliers[1])]
             }
         }
 
@@ -226,7 +408,11 @@ class HuntingTrip(object):
         # graphs
         if include_loot:
             inst.return_over_time = seralized["graphs"]["returns"]
-            inst.multipliers = seralized["graphs"]["multis"]
+            inst.multipliers = tuple(seralized["graphs"]["multis"])
+            if inst.time_end is None:
+                # Snapshot graphs are read-only buffers, runs still in progress need to grow them
+                inst.return_over_time = list(inst.return_over_time)
+                inst.multipliers = (list(inst.multipliers[0]), list(inst.multipliers[1]))
 
         for k, v in seralized["enhancers"].items():
             inst.enhancer_breaks[k] = v
@@ -241,34 +427,70 @@ class HuntingTrip(object):
         return inst
 
     @classmethod
-    def load_from_filename(cls, fn, include_loot=False):
+    def load_from_filename(cls, fn, include_loot=False, directory: str = RUNS_DIRECTORY):
         """
         Load an instance of the class from a file with the specified filename.
 
+        The file may be a binary snapshot or a legacy JSON run, stored as a plain run file,
+        a compressed run file or a member of a monthly run archive.
+
         Args:
-            fn (str): The filename of the file to load from.
+            fn (str): The run file reference to load from, as returned by `run_store.list_run_files`.
             include_loot (bool, optional): Whether to include the loot in the loaded instance. Defaults to False.
+            directory (str, optional): The directory the runs are stored in.
 
         Returns:
             The loaded instance of the class.
         """
-        with open(format_filename(fn), 'r') as f:
-            content = f.read()
+        content = run_store.read_run_file(fn, directory)
+        if snapshot.is_snapshot(content):
+            return cls.from_seralized(snapshot.loads(content), include_loot=include_loot)
         return cls.from_seralized(json.loads(content), include_loot=include_loot)
 
     @property
     def filename(self):
         """
-        Return the filename for the LootNannyLog JSON file.
+        Return the filename for the LootNannyLog snapshot file.
+
+        Returns:
+            str: The filename for the LootNannyLog snapshot file.
+        """
+        return format_filename(f"LootNannyLog_{dt_to_ts(self.time_start)}{run_store.RUN_EXTENSION}")
+
+    @property
+    def run_key(self):
+        """
+        Return the name the run is stored under, independent of the file format.
+
+        Returns:
+            str: The run name without extension, e.g LootNannyLog_<ts>
+        """
+        return f"{run_store.RUN_PREFIX}{dt_to_ts(self.time_start)}"
+
+    def delete_from_disk(self):
+        """
+        Removes every stored copy of the run, including archived ones.
+
+        Returns:
+            None
+        """
+        run_store.remove_run(self.run_key)
+
+    @property
+    def legacy_filename(self):
+        """
+        Return the filename the run was saved under before binary snapshots were introduced.
 
         Returns:
             str: The filename for the LootNannyLog JSON file.
         """
-        return format_filename(f"LootNannyLog_{dt_to_ts(self.time_start)}.json")
+        return format_filename(f"LootNannyLog_{dt_to_ts(self.time_start)}{run_store.LEGACY_RUN_EXTENSION}")
 
     def save_to_disk(self):
         """
-        Saves data to disk by opening a file with the given filename and writing the serialized run data in JSON format.
+        Saves data to disk by writing the serialized run data as a binary snapshot.
+
+        A legacy JSON copy of the run is removed once the snapshot has been written.
 
         Parameters:
             None
@@ -276,8 +498,10 @@ class HuntingTrip(object):
         Returns:
             None
         """
-        with open(self.filename, 'w') as f:
-            f.write(json.dumps(self.serialize_run()))
+        with open(self.filename, 'wb') as f:
+            f.write(snapshot.dumps(self.serialize_run()))
+        if os.path.exists(self.legacy_filename):
+            os.remove(self.legacy_filename)
 
     @property
     def duration(self):
@@ -441,15 +665,15 @@ class HuntingTrip(object):
 
     def get_skill_table_data(self):
         d = {"Skill": [], "Value": [], "Procs":[], "Proc %":[]}
+
+        # Get total procs during hunt
+        tp = sum(self.skillprocs.values())
         for k, v in sorted(self.skillgains.items(), key=lambda t: t[1], reverse=True):
+            procs = self.skillprocs.get(k, 0)
             d["Skill"].append(k)
             d["Value"].append("%.4f" % v)
-        
-        # Get total procs during hunt
-        tp = sum(i[1] for i in sorted(self.skillprocs.items(), key=lambda t: t[1], reverse=True))
-        for k, v in sorted(self.skillprocs.items(), key=lambda t: t[1], reverse=True):
-            d["Procs"].append(v)
-            d["Proc %"].append("{:.00%}".format(v/tp)) if tp != 0 else d["Proc %"].append("{:.00%}".format(0))
+            d["Procs"].append(procs)
+            d["Proc %"].append("{:.00%}".format(procs / tp if tp else 0))
         return d
 
     def get_total_skill_gain(self):
@@ -468,13 +692,8 @@ class HuntingTrip(object):
             r["Item"].append(k)
             r["Value"].append(str(v["v"]))
             r["Count"].append(str(v["c"]))
-            mu = MarkupSingleton.get_markup_for_item(k)
-            if mu.is_absolute:
-                r["Markup"].append("+{:.3f}".format(mu.value))
-                r["Total Value"].append("{:.4f}".format(v["v"] + (v["c"] * mu.value)))
-            else:
-                r["Markup"].append("{:.3f}%".format(mu.value * 100))
-                r["Total Value"].append("{:.4f}".format(v["v"] * mu.value))
+            r["Markup"].append(MarkupSingleton.get_formatted_markup(k))
+            r["Total Value"].append("{:.4f}".format(MarkupSingleton.apply_markup_to_item(k, v["c"], v["v"])))
         return r
 
     @property
@@ -489,13 +708,39 @@ class HuntingTrip(object):
         if len(self.looted_items) == 0:
             total_return_mu = self.cached_total_return_mu
         for k, v in self.looted_items.items():
-            mu = MarkupSingleton.get_markup_for_item(k)
-            if mu.is_absolute:
-                total_return_mu += (v["v"] + (v["c"] * mu.value))
-            else:
-                total_return_mu += (v["v"] * mu.value)
+            total_return_mu += MarkupSingleton.apply_markup_to_item(k, v["c"], v["v"])
         return total_return_mu
 
+    def summary_row(self) -> tuple:
+        """
+        Returns the formatted row of this run for the runs table.
+
+        Formatting the timestamps and the markup return is expensive, so the row is cached and only
+        rebuilt when one of the values it depends on ( or the markup table ) changed since.
+
+        Returns:
+            tuple: Notes, Start, End, Spend, Enhancers, Extra Spend, Return, % and mu%.
+        """
+        key = (self.notes, self.time_end, self.total_cost, self.extra_spend, self.tt_return, self.loot_instances,
+               self.total_enhancer_breaks, MarkupSingleton.revision if self.looted_items else None)
+        if key == self._summary_key:
+            return self._summary_row
+
+        spend = self.total_cost + self.extra_spend
+        self._summary_row = (
+            self.notes,
+            self.time_start.strftime("%Y-%m-%d %H:%M:%S"),
+            self.time_end.strftime("%Y-%m-%d %H:%M:%S") if self.time_end else "",
+            "%.2f" % self.total_cost,
+            str(self.total_enhancer_breaks),
+            str(self.extra_spend),
+            str(self.tt_return),
+            "%.2f" % (self.tt_return / spend * 100) + "%" if spend else "%",
+            "%.2f" % (self.total_return_mu_perc) + "%" if spend else "%",
+        )
+        self._summary_key = key
+        return self._summary_row
+
     @property
     def total_return_mu_perc(self):
         """
@@ -510,24 +755,28 @@ class HuntingTrip(object):
             return Decimal("0.0")
 
 
-class CombatModule(BaseModule):
+class TrackingEngine(object):
+    """
+    The UI independent core of the combat tracker.
 
-    def __init__(self, app):
-        super().__init__()
-        self.app = app
+    Aggregates parsed chat lines into hunting runs, and loads and saves them. It does not touch any widgets,
+    instead listeners registered with `add_listener` are told which parts of the tracked state changed after
+    every `tick`, which is how the Qt `CombatModule` and the headless CLI follow along.
+    """
+
+    # Parts of the tracked state a tick can change
+    LOOT = "loot"
+    COMBAT = "combat"
+    SKILLS = "skills"
+    ENHANCERS = "enhancers"
+    GLOBALS = "globals"
+
+    def __init__(self, config):
+        self.config = config
 
         # Core
         self.is_logging = False
         self.is_paused = False
-        self.should_redraw_runs = True
-
-        # Both of these are set by the parent app
-        self.loot_table = None
-        self.runs_table = None
-        self.skill_table = None
-        self.enhancer_table = None
-        self.combat_fields = {}
-        self.loot_fields = {}
 
         # Calculated Configuration
         self.ammo_burn = 0
@@ -537,9 +786,18 @@ class CombatModule(BaseModule):
         self.active_run: HuntingTrip = None
         self.runs: List[HuntingTrip] = []
 
-        # Graphs
-        self.multiplier_graph = None
-        self.return_graph = None
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """
+        Registers a callback called with the set of changed parts ( e.g {TrackingEngine.LOOT} ) after each tick
+        that changed something.
+        """
+        self._listeners.append(callback)
+
+    @property
+    def cost_per_shot(self) -> Decimal:
+        return Decimal(self.ammo_burn) / AMMO_PER_PED + self.decay
 
     def update_active_run_cost(self):
         """
@@ -556,12 +814,212 @@ class CombatModule(BaseModule):
             None
         """
         if self.active_run:
-            cost = Decimal(self.ammo_burn) / Decimal(10000) + self.decay
-            self.active_run.cost_per_shot = cost
+            self.active_run.cost_per_shot = self.cost_per_shot
+
+    def start_run(self):
+        """
+        Starts logging, the run itself is created once the first lines are processed.
+        """
+        self.is_logging = True
+        self.is_paused = False
+
+    def stop_run(self):
+        """
+        Stops logging and ends the active run, then saves it to disk.
+        """
+        self.is_logging = False
+        self.is_paused = False
+        if self.active_run:
+            self.active_run.time_end = datetime.now()
+        self.active_run = None
+        self.save_active_run(force=True)
+
+    def tick(self, lines: List[BaseChatRow]) -> set:
+        """
+        Processes a list of chat lines and updates the active run.
+
+        Parameters:
+            lines (List[BaseChatRow]): The list of chat lines to process.
+
+        Returns:
+            set: The parts of the tracked state that changed.
+        """
+        changed = set()
+        if not self.is_logging or self.is_paused:
+            return changed
+
+        if self.active_run is None:
+            self.create_new_run()
+
+        for chat_instance in lines:
+            if isinstance(chat_instance, CombatRow):
+                self.active_run.add_combat_chat_row(chat_instance)
+                changed.add(self.COMBAT)
+            elif isinstance(chat_instance, LootInstance):
+                self.active_run.add_loot_instance_chat_row(chat_instance)
+                changed.add(self.LOOT)
+            elif isinstance(chat_instance, EnhancerBreakages):
+                self.active_run.add_enhancer_break_row(chat_instance)
+                changed.add(self.ENHANCERS)
+            elif isinstance(chat_instance, SkillRow):
+                self.active_run.add_skillgain_row(chat_instance)
+                changed.add(self.SKILLS)
+            elif isinstance(chat_instance, GlobalInstance):
+                if chat_instance.name.strip() == self.config.name.value.strip():
+                    if self.config.screenshot_enabled.value:
+                        t = threading.Thread(target=take_screenshot, args=(
+                            self.config.screenshot_delay.value,
+                            self.config.screenshot_directory.value,
+                            chat_instance, ))
+                        t.start()
+                    self.active_run.add_global_row(chat_instance)
+                    changed.add(self.GLOBALS)
+
+        if changed:
+            for callback in self._listeners:
+                callback(changed)
+        return changed
+
+    def create_new_run(self):
+        """
+        Create a new run for the hunting trip.
+
+        This function initializes a new `HuntingTrip` object and assigns it to the `active_run`
+        attribute. The `HuntingTrip` object is created with the current date and time obtained
+        from `datetime.now()`, and the calculated value of ammo burn divided by 10000 plus the
+        decay value.
+
+        Returns:
+            None
+        """
+        self.active_run = HuntingTrip(datetime.now(), self.cost_per_shot)
+        self.runs.append(self.active_run)
+
+    def save_active_run(self, force=False):
+        """
+        Save the active run to disk.
+
+        Parameters:
+            force (bool): Whether to save the active run even if it is None. Defaults to False.
+
+        Returns:
+            None
+        """
+        if not self.active_run:
+            if not force:
+                return
+            if self.runs:
+                self.runs[-1].save_to_disk()
+        else:
+            self.active_run.save_to_disk()
+
+    def load_runs(self, directory: str = RUNS_DIRECTORY):
+        """
+        Load runs from the specified directory and populate the `runs` list with the loaded data.
+
+        This function performs the following steps:
+        1. If the `RUNS_FILE` exists, migrate the runs to the new system and remove the old file.
+        2. If run archival is enabled, compress or pack runs older than the configured number of days.
+        3. For each stored run, plain or archived, load the run data using the `HuntingTrip.load_from_filename()`
+           method and append it to the `runs` list. Run files that can't be decoded are renamed to *.corrupt
+           ( or skipped when inside a monthly archive ), runs saved by a newer version of LootNanny and runs that
+           fail to load otherwise are skipped. No run is ever deleted.
+        4. If the last run is still ongoing, set it as the `active_run`.
+
+        Args:
+            directory (str): The directory the runs are stored in.
+        """
+        if os.path.exists(RUNS_FILE):
+            # Old system of saving runs, need to migrate
+            migrate_runs()
+
+            os.remove(RUNS_FILE)
+
+            time.sleep(5)
+
+        if not os.path.exists(directory):
+            return
+
+        try:
+            run_store.archive_runs(self.config.archive_after_days.value, self.config.archive_format.value,
+                                   directory=directory)
+        except Exception as e:
+            print(f"Error archiving old runs: {e}")
+
+        run_files = run_store.list_run_files(directory)
+
+        for i, run_fn in enumerate(run_files, 1):
+            try:
+                run = HuntingTrip.load_from_filename(run_fn, include_loot=(i == len(run_files)), directory=directory)
+            except snapshot.UnsupportedSnapshotVersion as e:
+                print(f"Run file {run_fn} was saved by a newer version of LootNanny, skipped: {e}")
+                continue
+            except run_store.CORRUPT_RUN_ERRORS as e:
+                if run_store.quarantine_run_file(run_fn, directory):
+                    print(f"Corrupted run file detected, renamed to {run_fn}{run_store.QUARANTINE_EXTENSION}: {e}")
+                else:
+                    print(f"Corrupted run file detected, skipped: {run_fn}: {e}")
+                continue
+            except Exception as e:
+                print(f"Error loading run file {run_fn}, skipped: {e}")
+                continue
+            self.runs.append(run)
+
+        if self.runs and self.runs[-1].time_end is None:
+            self.active_run = self.runs[-1]
+
+
+def _engine_property(name):
+    """
+    Creates a property forwarding an attribute to the adapter's tracking engine.
+    """
+    return property(lambda self: getattr(self.engine, name), lambda self, value: setattr(self.engine, name, value))
+
+
+class CombatModule(BaseModule):
+    """
+    Qt adapter around a `TrackingEngine`, redraws the tables, graphs and fields of the app when the engine changes.
+    """
+
+    is_logging = _engine_property("is_logging")
+    is_paused = _engine_property("is_paused")
+    ammo_burn = _engine_property("ammo_burn")
+    decay = _engine_property("decay")
+    active_run = _engine_property("active_run")
+    runs = _engine_property("runs")
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.engine = TrackingEngine(app.config)
+        self.engine.add_listener(self.on_engine_changed)
+
+        # Both of these are set by the parent app
+        self.loot_table = None
+        self.runs_table = None
+        self.skill_table = None
+        self.enhancer_table = None
+        self.combat_fields = {}
+        self.loot_fields = {}
+
+        # Graphs
+        self.multiplier_graph = None
+        self.return_graph = None
+        self.multiplier_plot = None
+        self.return_plot = None
+
+    def update_active_run_cost(self):
+        self.engine.update_active_run_cost()
+
+    def create_new_run(self):
+        self.engine.create_new_run()
+
+    def save_active_run(self, force=False):
+        self.engine.save_active_run(force=force)
 
     def tick(self, lines: List[BaseChatRow]):
         """
-        Processes a list of chat lines and updates the internal state of the application.
+        Processes a list of chat lines and schedules redraws of the parts of the UI they changed.
 
         Parameters:
             lines (List[BaseChatRow]): The list of chat lines to process.
@@ -569,38 +1027,37 @@ class CombatModule(BaseModule):
         Returns:
             None
         """
-        if self.is_logging and not self.is_paused:
-
-            if self.active_run is None:
-                self.create_new_run()
-
-            for chat_instance in lines:
-                if isinstance(chat_instance, CombatRow):
-                    self.active_run.add_combat_chat_row(chat_instance)
-                    self.should_redraw_runs = True
-                elif isinstance(chat_instance, LootInstance):
-                    self.active_run.add_loot_instance_chat_row(chat_instance)
-                    self.should_redraw_runs = True
-                elif isinstance(chat_instance, EnhancerBreakages):
-                    self.active_run.add_enhancer_break_row(chat_instance)
-                elif isinstance(chat_instance, SkillRow):
-                    self.active_run.add_skillgain_row(chat_instance)
-                elif isinstance(chat_instance, GlobalInstance):
-                    if chat_instance.name.strip() == self.app.config.name.value.strip():
-                        if self.app.config.screenshot_enabled.value:
-                            t = threading.Thread(target=take_screenshot, args=(
-                                self.app.config.screenshot_delay.value,
-                                self.app.config.screenshot_directory.value,
-                                chat_instance, ))
-                            t.start()
-                        self.active_run.add_global_row(chat_instance)
-
-            if self.app.streamer_window:
-                self.app.streamer_window.set_text_from_module(self)
-
-        if self.runs and self.should_redraw_runs:
-            self.update_tables()
-            self.should_redraw_runs = False
+        self.engine.tick(lines)
+
+    def request_redraw(self):
+        """
+        Redraws every part of the UI showing runs straight away, e.g after a run was edited.
+        """
+        self.app.render_scheduler.mark_dirty()
+        self.app.render_scheduler.flush()
+
+    def on_engine_changed(self, changed: set):
+        """
+        Marks the parts of the UI showing the changed parts of the tracked state as dirty.
+
+        Parameters:
+            changed (set): The parts of the state changed by the last tick, see `TrackingEngine`.
+
+        Returns:
+            None
+        """
+        if TrackingEngine.LOOT in changed:
+            self.app.render_scheduler.mark_dirty("loot", "graphs", "streamer")
+        if TrackingEngine.COMBAT in changed:
+            self.app.render_scheduler.mark_dirty("combat", "streamer")
+        if TrackingEngine.ENHANCERS in changed:
+            self.app.render_scheduler.mark_dirty("combat")
+        if TrackingEngine.SKILLS in changed:
+            self.app.render_scheduler.mark_dirty("skills")
+        if TrackingEngine.GLOBALS in changed:
+            self.app.render_scheduler.mark_dirty("loot")
+        if self.app.streamer_window:
+            self.app.render_scheduler.mark_dirty("streamer")
 
     def update_tables(self):
         """
@@ -616,11 +1073,17 @@ class CombatModule(BaseModule):
             None
         """
         self.update_loot_table()
-        self.update_combat_table()
+        self.update_combat_tab()
         self.update_skill_table()
-        self.update_enhancer_table()
         self.update_graphs()
 
+    def update_combat_tab(self):
+        """
+        Updates the combat fields and the enhancer table shown on the combat tab.
+        """
+        self.update_combat_table()
+        self.update_enhancer_table()
+
     def update_combat_table(self):
         """
         {
@@ -655,7 +1118,6 @@ class CombatModule(BaseModule):
         """
         if not self.active_run:
             return
-        self.loot_table.clear()
         self.loot_fields["looted_text"].setText(str(self.active_run.loot_instances))
         self.loot_fields["total_cost_text"].setText("%.2f" % self.active_run.total_cost)
         self.loot_fields["total_return_text"].setText("%.2f" % self.active_run.tt_return)
@@ -664,16 +1126,15 @@ class CombatModule(BaseModule):
         self.loot_fields["globals"].setText(str(self.active_run.globals))
         self.loot_fields["hofs"].setText(str(self.active_run.hofs))
 
-        self.loot_table.setData(self.active_run.get_item_loot_table_data())
-        self.loot_table.resizeRowsToContents()
+        self.loot_table.set_table_data(self.active_run.get_item_loot_table_data())
         self.update_runs_table()
 
     def update_runs_table(self):
         """
         Update the runs table with the latest data.
 
-        This function retrieves the runs data using the `get_runs_data()` method and
-        sets it to the `runs_table` using the `setData()` method.
+        The runs are handed to the `runs_table` model newest first, rows are formatted lazily from the
+        cached `HuntingTrip.summary_row()` as they scroll into view.
 
         Parameters:
             self (object): The instance of the current class.
@@ -681,7 +1142,7 @@ class CombatModule(BaseModule):
         Returns:
             None
         """
-        self.runs_table.setData(self.get_runs_data())
+        self.runs_table.model().set_runs(self.runs[::-1])
 
     def update_skill_table(self):
         """
@@ -695,16 +1156,15 @@ class CombatModule(BaseModule):
         """
         if not self.active_run:
             return
-        self.skill_table.clear()
-        self.skill_table.setData(self.active_run.get_skill_table_data())
+        self.skill_table.set_table_data(self.active_run.get_skill_table_data())
         self.app.total_skills_text.setText(f"{self.active_run.get_total_skill_gain():.4f}")
 
     def update_enhancer_table(self):
         """
         Updates the enhancer table with the data from the active run.
 
-        This function clears the enhancer table and then sets the data using the
-        `get_enhancer_table_data` method of the active run object.
+        Only the rows whose values changed since the last update are redrawn, the data comes
+        from the `get_enhancer_table_data` method of the active run object.
 
         Parameters:
             self (object): The instance of the class.
@@ -714,8 +1174,7 @@ class CombatModule(BaseModule):
         """
         if not self.active_run:
             return
-        self.enhancer_table.clear()
-        self.enhancer_table.setData(self.active_run.get_enhancer_table_data())
+        self.enhancer_table.set_table_data(self.active_run.get_enhancer_table_data())
 
     def update_graphs(self):
         """
@@ -733,125 +1192,53 @@ class CombatModule(BaseModule):
         """
         if not self.active_run:
             return
-        self.return_graph.clear()
-        self.return_graph.plot(list(map(lambda x: float(x * 100), self.active_run.return_over_time)))
-        self.multiplier_graph.clear()
-        self.multiplier_graph.plot(*self.active_run.multipliers, pen=None, symbol="o")
-
-    def get_runs_data(self):
-        """
-        Retrieves data from the runs and organizes it into a dictionary.
-
-        Returns:
-            dict: A dictionary containing the following keys:
-                - "Notes": A list of notes for each run.
-                - "Start": A list of start times for each run.
-                - "End": A list of end times for each run.
-                - "Spend": A list of total costs for each run.
-                - "Enhancers": A list of total enhancer breaks for each run.
-                - "Extra Spend": A list of extra spend amounts for each run.
-                - "Return": A list of returns for each run.
-                - "%": A list of return percentages for each run.
-                - "mu%": A list of total return mu percentages for each run.
-        """
-        d = {"Notes": [], "Start": [], "End": [], "Spend": [],
-             "Enhancers": [], "Extra Spend": [], "Return": [], "%": [], "mu%": []}
-        for run in self.runs[::-1]:
-            run: HuntingTrip
-            d["Notes"].append(run.notes)
-            d["Start"].append(run.time_start.strftime("%Y-%m-%d %H:%M:%S"))
-            d["End"].append(run.time_end.strftime("%Y-%m-%d %H:%M:%S") if run.time_end else "")
-            d["Spend"].append("%.2f" % run.total_cost)
-            d["Enhancers"].append(str(run.total_enhancer_breaks))
-            d["Extra Spend"].append(str(run.extra_spend))
-            d["Return"].append(run.tt_return)
-            if run.total_cost + run.extra_spend:
-                d["%"].append("%.2f" % (run.tt_return / (run.total_cost + run.extra_spend) * 100) + "%")
-                d["mu%"].append("%.2f" % (run.total_return_mu_perc) + "%")
-            else:
-                d["%"].append("%")
-                d["mu%"].append("%")
-        return d
-
-    def create_new_run(self):
-        """
-        Create a new run for the hunting trip.
-
-        This function initializes a new `HuntingTrip` object and assigns it to the `active_run`
-        attribute. The `HuntingTrip` object is created with the current date and time obtained
-        from `datetime.now()`, and the calculated value of ammo burn divided by 10000 plus the
-        decay value.
-
-        Parameters:
-            self (HuntingTrip): The instance of the `HuntingTrip` class.
-
-        Returns:
-            None
-        """
-        self.active_run = HuntingTrip(datetime.now(), Decimal(self.ammo_burn) / Decimal(10000) + self.decay)
-        self.runs.append(self.active_run)
-
-    def save_active_run(self, force=False):
-        """
-        Save the active run to disk.
-
-        Parameters:
-            force (bool): Whether to save the active run even if it is None. Defaults to False.
-
-        Returns:
-            None
-        """
-        if not self.active_run:
-            if not force:
-                return
-            if self.runs:
-                self.runs[-1].save_to_disk()
-        else:
-            self.active_run.save_to_disk()
+        self.return_plot.update(self.active_run, self.active_run.return_over_time)
+        self.multiplier_plot.update(self.active_run, *self.active_run.multipliers)
 
     def load_runs(self):
         """
-        Load runs from the specified directory and populate the `runs` list with the loaded data.
-
-        This function performs the following steps:
-        1. If the `RUNS_FILE` exists, migrate the runs to the new system and remove the old file.
-        2. If the `RUNS_DIRECTORY` exists, load each file in the directory and add the valid ones to the `run_files` list.
-        3. For each file in the `run_files` list, load the run data using the `HuntingTrip.load_from_filename()` method and append it to the `runs` list.
-        4. If the `runs` list is not empty, set the `active_run` to the last run if it is still ongoing, otherwise update the runs table.
-
-        This function does not take any parameters and does not return any values.
+        Loads the stored runs into the engine, see `TrackingEngine.load_runs`, and shows them in the runs table.
         """
-        if os.path.exists(RUNS_FILE):
-            # Old system of saving runs, need to migrate
-            migrate_runs()
-
-            os.remove(RUNS_FILE)
+        self.engine.load_runs()
+        if self.runs and self.runs[-1].time_end is not None:
+            self.update_runs_table()
 
-            time.sleep(5)
 
-        if not os.path.exists(RUNS_DIRECTORY):
-            return
-
-        run_files = []
+def iter_runs(include_loot=False, directory: str = RUNS_DIRECTORY, run_files: List[str] = None,
+              yield_unreadable=False):
+    """
+    Yields every stored run, loading them from disk one at a time.
 
-        for fn in os.listdir(RUNS_DIRECTORY):
-            if fn.startswith("LootNannyLog_"):
-                try:
-                    with open(format_filename(fn), 'r') as f:
-                        json.loads(f.read())
-                    run_files.append(fn)
-                except:
-                    os.remove(format_filename(fn))
+    Only a single run is held in memory at once, so this is safe to use over years of history.
+    Corrupted run files and runs saved by a newer version of LootNanny are skipped, and left untouched. They are
+    reported on stderr, so they don't end up in exports written to stdout.
 
-        for i, run_fn in enumerate(run_files, 1):
-            run = HuntingTrip.load_from_filename(run_fn, include_loot=(i == len(run_files)))
-            self.runs.append(run)
+    Args:
+        include_loot (bool, optional): Whether to load the looted items and graphs of each run. Defaults to False.
+        directory (str, optional): The directory the runs are stored in.
+        run_files (List[str], optional): The run files to load, by default every run file in the directory.
+        yield_unreadable (bool, optional): Whether to yield None in place of the runs that are skipped, e.g to keep
+            progress counts over `run_files` right. Defaults to False.
 
-        if self.runs:
-            if self.runs[-1].time_end is None:
-                self.active_run = self.runs[-1]
-            else:
-                self.update_runs_table()
+    Yields:
+        HuntingTrip: The stored runs ordered by start time.
+    """
+    if run_files is None:
+        run_files = run_store.list_run_files(directory)
+    for fn in run_files:
+        try:
+            run = HuntingTrip.load_from_filename(fn, include_loot=include_loot, directory=directory)
+        except snapshot.UnsupportedSnapshotVersion:
+            print(f"Run file {fn} was saved by a newer version of LootNanny, skipped", file=sys.stderr)
+            run = None
+        except run_store.CORRUPT_RUN_ERRORS as e:
+            print(f"Corrupted run file detected, skipped: {fn}: {e}", file=sys.stderr)
+            run = None
+        except Exception as e:
+            print(f"Error loading run file {fn}, skipped: {e}", file=sys.stderr)
+            run = None
+        if run is not None or yield_unreadable:
+            yield run
 
 
 def migrate_runs():
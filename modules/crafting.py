@@ -1,5 +1,70 @@
 from collections import namedtuple
+from decimal import Decimal
+from typing import Callable, Dict, Tuple
 
 
 Slot = namedtuple("Slot", ["name", "count"])
-Blueprint = namedtuple("Blueprint", ["name", "slots"])
\ No newline at end of file
+Blueprint = namedtuple("Blueprint", ["name", "slots"])
+
+# The input cost of one click of a blueprint ( in PED ): the TT value of its materials, and with their markup
+BlueprintCost = namedtuple("BlueprintCost", ["tt", "total"])
+
+
+class BlueprintCostTracker(object):
+    """
+    Keeps the input cost of every blueprint up to date as markups change.
+
+    All costs are calculated once up front. When the markup of a resource changes only the blueprints using it,
+    found through the reverse resource index, are recalculated, and listeners registered with `add_listener` are
+    told which blueprints got cheaper or more expensive to craft.
+    """
+
+    def __init__(self, markup, blueprints: Dict[str, Blueprint], resources: Dict[str, Decimal],
+                 uses: Callable[[str], Tuple[Tuple[str, int], ...]]):
+        """
+        Args:
+            markup (MarkupStore): The markup store, the tracker listens to its changes.
+            blueprints (dict): The Blueprint by blueprint name.
+            resources (dict): The TT value of one unit by resource name.
+            uses (Callable): Returns the ( blueprint name, count ) pairs of the blueprints using a resource.
+        """
+        self.markup = markup
+        self.blueprints = blueprints
+        self.resources = resources
+        self.uses = uses
+
+        self._costs = {name: self._calculate(blueprint) for name, blueprint in blueprints.items()}
+        self._listeners = []
+        markup.add_listener(self.on_markup_changed)
+
+    def add_listener(self, callback):
+        """
+        Registers a callback called with a dict of blueprint name -> ( old cost, new cost ) after a markup change
+        changed the cost of any blueprint.
+        """
+        self._listeners.append(callback)
+
+    def _calculate(self, blueprint: Blueprint) -> BlueprintCost:
+        tt = total = Decimal("0.0")
+        for slot in blueprint.slots:
+            value = slot.count * self.resources.get(slot.name, Decimal("0.0"))
+            tt += value
+            total += self.markup.apply_markup_to_item(slot.name, slot.count, value)
+        return BlueprintCost(tt, total)
+
+    def cost(self, blueprint: str) -> BlueprintCost:
+        return self._costs[blueprint]
+
+    def on_markup_changed(self, name: str):
+        """
+        Recalculates the blueprints using the resource whose markup changed and notifies the listeners.
+        """
+        changes = {}
+        for blueprint, _ in self.uses(name):
+            old = self._costs[blueprint]
+            new = self._costs[blueprint] = self._calculate(self.blueprints[blueprint])
+            if new != old:
+                changes[blueprint] = (old, new)
+        if changes:
+            for listener in self._listeners:
+                listener(changes)
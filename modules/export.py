@@ -0,0 +1,149 @@
+import csv
+import json
+import sys
+from typing import Iterable, Iterator
+
+from modules.combat import HuntingTrip, MarkupSingleton, RUNS_DIRECTORY, iter_runs
+
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+RUN_FIELDS = ("start", "end", "notes", "cost_per_shot", "total_cost", "extra_spend", "tt_return",
+              "total_return_mu", "return_perc", "return_mu_perc", "loots", "globals", "hofs",
+              "enhancer_breaks", "attacks", "damage", "crits", "misses")
+LOOT_FIELDS = ("run_start", "item", "count", "value", "markup", "total_value")
+
+EXPORT_FORMATS = ("csv", "jsonl")
+
+
+def run_summary_rows(runs: Iterable[HuntingTrip]) -> Iterator[dict]:
+    """
+    Converts runs into flat summary rows, one per run.
+
+    Args:
+        runs (Iterable[HuntingTrip]): The runs to summarize.
+
+    Yields:
+        dict: A row keyed by RUN_FIELDS.
+    """
+    for run in runs:
+        spend = run.total_cost + run.extra_spend
+        yield {
+            "start": run.time_start.strftime(DATE_FORMAT),
+            "end": run.time_end.strftime(DATE_FORMAT) if run.time_end else "",
+            "notes": run.notes,
+            "cost_per_shot": str(run.cost_per_shot),
+            "total_cost": str(run.total_cost),
+            "extra_spend": str(run.extra_spend),
+            "tt_return": str(run.tt_return),
+            "total_return_mu": "%.4f" % run.total_return_mu,
+            "return_perc": "%.2f" % (run.tt_return / spend * 100) if spend else "",
+            "return_mu_perc": "%.2f" % run.total_return_mu_perc if spend else "",
+            "loots": run.loot_instances,
+            "globals": run.globals,
+            "hofs": run.hofs,
+            "enhancer_breaks": run.total_enhancer_breaks,
+            "attacks": run.total_attacks,
+            "damage": "%.2f" % run.total_damage,
+            "crits": run.total_crits,
+            "misses": run.total_misses,
+        }
+
+
+def loot_rows(runs: Iterable[HuntingTrip]) -> Iterator[dict]:
+    """
+    Converts runs into per item loot rows. The runs need to be loaded with `include_loot=True`.
+
+    Args:
+        runs (Iterable[HuntingTrip]): The runs to take the looted items from.
+
+    Yields:
+        dict: A row keyed by LOOT_FIELDS.
+    """
+    for run in runs:
+        run_start = run.time_start.strftime(DATE_FORMAT)
+        for name, looted in sorted(run.looted_items.items(), key=lambda t: t[1]["v"], reverse=True):
+            yield {
+                "run_start": run_start,
+                "item": name,
+                "count": looted["c"],
+                "value": str(looted["v"]),
+                "markup": MarkupSingleton.get_formatted_markup(name),
+                "total_value": "%.4f" % MarkupSingleton.apply_markup_to_item(name, looted["c"], looted["v"]),
+            }
+
+
+def write_csv(rows: Iterable[dict], fields: tuple, f) -> int:
+    """
+    Writes rows to a file object as CSV, one row at a time.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[dict], f) -> int:
+    """
+    Writes rows to a file object as JSON lines, one row at a time.
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    for row in rows:
+        f.write(json.dumps(row) + "\n")
+        count += 1
+    return count
+
+
+def export(kind: str, export_format: str, f, directory: str = RUNS_DIRECTORY) -> int:
+    """
+    Streams every stored run, or every looted item of every stored run, to a file object.
+
+    Runs are loaded from the run store one at a time so memory use does not grow with history.
+
+    Args:
+        kind (str): "runs" for one summary row per run, "loot" for one row per looted item per run.
+        export_format (str): "csv" or "jsonl".
+        f: A writable text file object.
+        directory (str): The directory the runs are stored in.
+
+    Returns:
+        int: The number of rows written.
+    """
+    if kind == "runs":
+        rows, fields = run_summary_rows(iter_runs(directory=directory)), RUN_FIELDS
+    elif kind == "loot":
+        rows, fields = loot_rows(iter_runs(include_loot=True, directory=directory)), LOOT_FIELDS
+    else:
+        raise ValueError(f"Unknown export: {kind}")
+
+    if export_format == "csv":
+        return write_csv(rows, fields, f)
+    elif export_format == "jsonl":
+        return write_jsonl(rows, f)
+    raise ValueError(f"Unknown export format: {export_format}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export LootNanny runs")
+    parser.add_argument("kind", choices=("runs", "loot"))
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("-o", "--output", help="File to write to, defaults to stdout")
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as output:
+            written = export(args.kind, args.format, output)
+        print(f"Exported {written} rows to {args.output}")
+    else:
+        export(args.kind, args.format, sys.stdout)
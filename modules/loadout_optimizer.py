@@ -0,0 +1,208 @@
+"""
+Finds the most efficient loadouts in the catalogs.
+
+Every compatible weapon x amp x scope x sight x sight x damage enhancer combination is scored by its damage per PEC
+and its cost per shot, and the Pareto front of the two is returned: the loadouts for which no other loadout is both
+more efficient and cheaper to shoot. The combinations are evaluated as numpy arrays, one weapon group at a time.
+
+Options that are dominated on their own ( no more damage for more cost than another option of the same slot ) can't
+be part of a dominated-free loadout, so they are pruned before the combinations are built. Scopes and sights add
+cost but no damage, which leaves only "none" for them, and amps without damage data are pruned the same way.
+
+Only weapons with damage data are considered, those are imported with `python -m data.ingest weapons`.
+
+    python -m modules.loadout_optimizer [--economy 0] [--max-damage-enh 10] [--limit 30]
+"""
+from collections import defaultdict, namedtuple
+from itertools import combinations_with_replacement
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from modules.combat import (Loadout, DAMAGE_ENHANCER_STEP, ECONOMY_ENHANCER_STEP, ENHANCER_LEVELS,
+                            item_cost_per_shot)
+
+
+# Amp types that fit each weapon class
+RANGED_AMP_TYPES = ("Energy Amp", "BLP Amp")
+CLASS_AMP_TYPES = {
+    "Pistol": RANGED_AMP_TYPES,
+    "Rifle": RANGED_AMP_TYPES,
+    "Carbine": RANGED_AMP_TYPES,
+    "Melee": ("Melee Amp",),
+    "Mindforce": ("MF Amp",),
+}
+# Ranged weapons are narrowed down to one amp type when their weapon type is known
+WEAPON_TYPE_AMP_TYPES = {
+    "Laser": ("Energy Amp",),
+    "Plasma": ("Energy Amp",),
+    "BLP": ("BLP Amp",),
+}
+# An amp adds at most half the base damage of the weapon
+AMP_DAMAGE_CAP = 0.5
+
+# Relative difference below which two damage per PEC values count as equal
+RELATIVE_TOLERANCE = 1e-9
+
+LoadoutScore = namedtuple("LoadoutScore", ["damage_per_pec", "cost_per_shot", "damage", "loadout"])
+
+
+def amp_types(weapon: dict) -> Tuple[str, ...]:
+    """
+    Returns the amp types that fit a weapon, an empty tuple if it can't be amped.
+    """
+    types = CLASS_AMP_TYPES.get(weapon.get("type", "").strip(), ())
+    if types == RANGED_AMP_TYPES:
+        return WEAPON_TYPE_AMP_TYPES.get(weapon.get("weapon_type", "").strip(), types)
+    return types
+
+
+def pareto_front(value, cost) -> np.ndarray:
+    """
+    Finds the options for which no other option has at least the same value for at most the same cost.
+
+    Args:
+        value (np.ndarray): The value of every option, higher is better.
+        cost (np.ndarray): The cost of every option, lower is better.
+
+    Returns:
+        np.ndarray: The indices of the non-dominated options, cheapest first. Of identical options only one is kept.
+    """
+    value = np.asarray(value, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+    if not value.size:
+        return np.empty(0, dtype=np.int64)
+    # Cheapest first, the most valuable first among equal costs, so every kept option beats all cheaper ones
+    order = np.lexsort((-value, cost))
+    ordered = value[order]
+    best_before = np.maximum.accumulate(ordered)
+    # Values within rounding noise of a cheaper option are no improvement, e.g enhancers that scale damage and cost
+    threshold = np.concatenate(([-np.inf], best_before[:-1] + np.abs(best_before[:-1]) * RELATIVE_TOLERANCE))
+    return order[ordered > threshold]
+
+
+def _options(catalog: dict, names: Sequence[str]) -> Tuple[List, np.ndarray, np.ndarray]:
+    """
+    Returns the non-dominated options of a slot, "none" ( free and without damage ) included.
+    """
+    names = [None] + list(names)
+    damage = np.array([0.0] + [float(catalog[name].get("damage", 0)) for name in names[1:]])
+    cost = np.array([0.0] + [item_cost_per_shot(catalog[name]) for name in names[1:]])
+    kept = pareto_front(damage, cost)
+    return [names[i] for i in kept], damage[kept], cost[kept]
+
+
+def _attachment_options(scopes: dict, sights: dict) -> Tuple[List[tuple], np.ndarray]:
+    """
+    Returns the non-dominated ( scope, sight, sight ) combinations and their cost. Scopes and sights add no damage.
+    """
+    scope_names, _, scope_costs = _options(scopes, sorted(scopes))
+    sight_names, _, sight_costs = _options(sights, sorted(sights))
+    combos, costs = [], []
+    for scope, scope_cost in zip(scope_names, scope_costs):
+        for (i, sight_1), (j, sight_2) in combinations_with_replacement(enumerate(sight_names), 2):
+            if sight_1 is not None and sight_1 == sight_2:
+                continue
+            combos.append((scope, sight_1, sight_2))
+            costs.append(scope_cost + sight_costs[i] + sight_costs[j])
+    costs = np.array(costs)
+    kept = pareto_front(np.zeros(len(costs)), costs)
+    return [combos[i] for i in kept], costs[kept]
+
+
+def optimize(weapons: Dict[str, dict] = None, amps: Dict[str, dict] = None, scopes: Dict[str, dict] = None,
+             sights: Dict[str, dict] = None, damage_levels: Sequence[int] = ENHANCER_LEVELS,
+             economy_enh: int = 0) -> List[LoadoutScore]:
+    """
+    Finds the Pareto front of damage per PEC against cost per shot over all compatible loadouts.
+
+    Args:
+        weapons, amps, scopes, sights (dict): The catalogs, by default the game data catalogs.
+        damage_levels (Sequence[int]): The damage enhancer levels to consider.
+        economy_enh (int): The economy enhancer level of every loadout.
+
+    Returns:
+        List[LoadoutScore]: The front, cheapest first ( and so least efficient first ).
+    """
+    if weapons is None:
+        from data.weapons import all_weapons
+        weapons = all_weapons()
+    if amps is None:
+        from data.attachments import all_attachments
+        amps = all_attachments()
+    if scopes is None or sights is None:
+        from data.sights_and_scopes import sights as all_sights, scopes as all_scopes
+        scopes = all_scopes() if scopes is None else scopes
+        sights = all_sights() if sights is None else sights
+
+    levels = np.array(damage_levels, dtype=np.float64)
+    damage_factor = 1 + float(DAMAGE_ENHANCER_STEP) * levels
+    cost_factor = damage_factor * (1 - float(ECONOMY_ENHANCER_STEP) * economy_enh)
+    attachment_combos, attachment_costs = _attachment_options(scopes, sights)
+
+    # Weapons sharing their amp types are evaluated together against the same amps
+    groups = defaultdict(list)
+    for name, weapon in weapons.items():
+        if float(weapon.get("damage", 0)) > 0 and item_cost_per_shot(weapon) > 0:
+            groups[amp_types(weapon)].append(name)
+
+    # Candidates of every group: ( damage, cost, weapon, amp, attachments, damage level ) as parallel arrays
+    candidates = []
+    for types, names in groups.items():
+        names = sorted(names)
+        amp_names, amp_damage, amp_cost = _options(amps, sorted(n for n, a in amps.items() if a.get("type") in types))
+        weapon_damage = np.array([float(weapons[name]["damage"]) for name in names])
+        weapon_cost = np.array([item_cost_per_shot(weapons[name]) for name in names])
+
+        # weapons x amps x attachments x damage levels
+        capped_amp_damage = np.minimum(amp_damage[None, :], weapon_damage[:, None] * AMP_DAMAGE_CAP)
+        damage = (weapon_damage[:, None, None, None] * damage_factor[None, None, None, :]
+                  + capped_amp_damage[:, :, None, None])
+        cost = (weapon_cost[:, None, None, None] * cost_factor[None, None, None, :]
+                + amp_cost[None, :, None, None] + attachment_costs[None, None, :, None])
+        damage, cost = np.broadcast_arrays(damage, cost)
+
+        # Prune per group before collecting, the global front is a subset of the group fronts
+        damage_per_pec = damage.ravel() / (cost.ravel() * 100)
+        kept = pareto_front(damage_per_pec, cost.ravel())
+        w, a, s, d = np.unravel_index(kept, damage.shape)
+        for i, index in enumerate(kept):
+            candidates.append((damage_per_pec[index], cost.ravel()[index], damage.ravel()[index],
+                               names[w[i]], amp_names[a[i]], attachment_combos[s[i]], int(levels[d[i]])))
+
+    if not candidates:
+        return []
+    front = pareto_front([c[0] for c in candidates], [c[1] for c in candidates])
+
+    scores = []
+    for index in front:
+        damage_per_pec, cost, damage, weapon, amp, (scope, sight_1, sight_2), damage_enh = candidates[index]
+        loadout = Loadout(weapon, amp, scope, sight_1, sight_2, damage_enh=damage_enh, economy_enh=economy_enh)
+        scores.append(LoadoutScore(float(damage_per_pec), float(cost), float(damage), loadout))
+    return scores
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List the most efficient loadouts in the catalogs")
+    parser.add_argument("--economy", type=int, default=0, help="Economy enhancer level of every loadout")
+    parser.add_argument("--max-damage-enh", type=int, default=max(ENHANCER_LEVELS),
+                        help="Highest damage enhancer level to consider")
+    parser.add_argument("--limit", type=int, default=30, help="Number of loadouts listed")
+    args = parser.parse_args()
+
+    scores = optimize(damage_levels=range(args.max_damage_enh + 1), economy_enh=args.economy)
+    if not scores:
+        print("No weapons with damage data, import them with: python -m data.ingest weapons export.csv")
+        return
+    # Spread the listed loadouts over the whole front, from cheapest to most efficient
+    step = max(1, len(scores) // args.limit)
+    for score in scores[::step][:args.limit]:
+        loadout = score.loadout
+        print(f"{score.damage_per_pec:7.3f} dmg/PEC {score.cost_per_shot:9.5f} PED/shot  {loadout.weapon}"
+              f"  {loadout.amp or 'No amp'}  damage enhancers {loadout.damage_enh}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ from helpers import format_filename
 
 
 MARKUP_FILENAME = format_filename("markup.json")
+MARKUP_LOG_FILENAME = format_filename("markup.log")
+
+# Number of logged edits after which the log is folded back into MARKUP_FILENAME
+COMPACT_AFTER = 500
 
 
 Markup = namedtuple("MarkupItem", ["value", "is_absolute"])
@@ -20,34 +24,54 @@ DEFAULT_MARKUP = {
 class MarkupStore(object):
 
     def __init__(self):
-        self._data = DEFAULT_MARKUP
+        self._data = dict(DEFAULT_MARKUP)
+        self._formatted = {}
+        self._log_entries = 0
+
+        # Incremented on every change so callers can cheaply tell when cached markup results are stale
+        self.revision = 0
+        self._listeners = []
+
         self.load_markup()
 
     def load_markup(self):
         """
         Load the markup data from the MARKUP_FILENAME file and update the _data dictionary.
-        
-        This function first checks if the MARKUP_FILENAME file exists. If it doesn't, the function returns without performing any action.
-        
-        If the file exists, the function opens it in read mode and attempts to load the content as JSON data using the json.loads() method. If an exception occurs during the loading process, the function assigns the DEFAULT_MARKUP value to the variable 'd'.
-        
-        After loading the JSON data or assigning the default value, the function iterates through each key-value pair in 'd' using a for loop. For each key-value pair, the function creates a new Markup object with the decimal value from the first element of the value tuple and the second element of the value tuple. The newly created Markup object is then added to the '_data' dictionary with the key 'k'.
-        """
-        if not os.path.exists(MARKUP_FILENAME):
-            return
-        with open(MARKUP_FILENAME, 'r') as f:
-            try:
-                d = json.loads(f.read())
-            except:
-                d = DEFAULT_MARKUP
-            for k, v in d.items():
-                self._data[k] = Markup(Decimal(v[0]), v[1])
+
+        The markup file holds the compacted markup table, edits made since the last compaction are then
+        replayed from the append-only MARKUP_LOG_FILENAME. If any edits were replayed the log is compacted
+        straight away so the next start only needs to read a single file.
+
+        If the markup file can't be parsed the DEFAULT_MARKUP values are used. Lines of the log that can't
+        be parsed ( e.g a partial write during a crash ) are skipped.
+        """
+        if os.path.exists(MARKUP_FILENAME):
+            with open(MARKUP_FILENAME, 'r') as f:
+                try:
+                    d = json.loads(f.read())
+                except:
+                    d = {k: [str(v.value), v.is_absolute] for k, v in DEFAULT_MARKUP.items()}
+                for k, v in d.items():
+                    self._data[k] = Markup(Decimal(v[0]), v[1])
+
+        if os.path.exists(MARKUP_LOG_FILENAME):
+            with open(MARKUP_LOG_FILENAME, 'r') as f:
+                for line in f:
+                    try:
+                        name, value, is_absolute = json.loads(line)
+                        self._data[name] = Markup(Decimal(value), is_absolute)
+                        self._log_entries += 1
+                    except:
+                        continue
+
+            if self._log_entries:
+                self.compact()
 
     def save_markup(self):
         """
-        Saves the markup data to a file.
+        Saves the full markup table to MARKUP_FILENAME.
 
-        This function writes the markup data stored in the `_data` dictionary to a file named MARKUP_FILENAME. The markup data is serialized as a JSON object.
+        Prefer `compact()`, which also clears the edit log.
 
         Parameters:
             self (object): The instance of the class calling the function.
@@ -55,8 +79,38 @@ class MarkupStore(object):
         Returns:
             None
         """
-        with open(MARKUP_FILENAME, 'w') as f:
+        tmp_filename = MARKUP_FILENAME + ".tmp"
+        with open(tmp_filename, 'w') as f:
             f.write(json.dumps({k: [str(v[0]), v[1]] for k, v in self._data.items()}))
+        os.replace(tmp_filename, MARKUP_FILENAME)
+
+    def compact(self):
+        """
+        Folds the edit log into MARKUP_FILENAME and truncates the log.
+
+        Returns:
+            None
+        """
+        self.save_markup()
+        if os.path.exists(MARKUP_LOG_FILENAME):
+            os.remove(MARKUP_LOG_FILENAME)
+        self._log_entries = 0
+
+    def _log_markup(self, name, markup):
+        """
+        Appends a single markup edit to MARKUP_LOG_FILENAME, compacting once the log grows past COMPACT_AFTER.
+        """
+        with open(MARKUP_LOG_FILENAME, 'a') as f:
+            f.write(json.dumps([name, str(markup.value), markup.is_absolute]) + "\n")
+        self._log_entries += 1
+        if self._log_entries >= COMPACT_AFTER:
+            self.compact()
+
+    def add_listener(self, callback):
+        """
+        Registers a callback called with the item name whenever the markup of an item changed.
+        """
+        self._listeners.append(callback)
 
     def get_markup_for_item(self, name):
         """
@@ -88,6 +142,9 @@ class MarkupStore(object):
         """
         Adds markup for an item.
 
+        The edit is appended to the markup log rather than rewriting the whole markup file, and
+        nothing is written at all if the markup did not change. Listeners are told about the change.
+
         Args:
             name (str): The name of the item.
             value (str): The value of the item.
@@ -102,8 +159,14 @@ class MarkupStore(object):
                 markup = Markup(Decimal(value[:-1]) / 100, False)
             else:
                 markup = Markup(Decimal(value), False)
+        if self._data.get(name) == markup:
+            return
         self._data[name] = markup
-        self.save_markup()
+        self._formatted.pop(name, None)
+        self.revision += 1
+        self._log_markup(name, markup)
+        for listener in self._listeners:
+            listener(name)
 
     def get_formatted_markup(self, name):
         """
@@ -115,11 +178,15 @@ class MarkupStore(object):
         Returns:
             str: The formatted markup for the item, either a percentage or an absolute value.
         """
-        mu = self.get_markup_for_item(name)
-        if mu.is_absolute:
-            return "+{:.3f}".format(mu.value)
-        else:
-            return "{:.3f}%".format(mu.value * 100)
+        formatted = self._formatted.get(name)
+        if formatted is None:
+            mu = self.get_markup_for_item(name)
+            if mu.is_absolute:
+                formatted = "+{:.3f}".format(mu.value)
+            else:
+                formatted = "{:.3f}%".format(mu.value * 100)
+            self._formatted[name] = formatted
+        return formatted
 
     def apply_markup_to_item(self, name, count: int, value: Decimal):
         """
@@ -133,7 +200,7 @@ class MarkupStore(object):
         Returns:
             decimal.Decimal: The updated value of the item after applying markup.
         """
-        mu = self.get_markup_for_item(name)
+        mu = self._data.get(name, DEFAULT_NULL_MARKUP)
         if mu.is_absolute:
             return value + (count * mu.value)
         else:
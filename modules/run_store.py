@@ -0,0 +1,347 @@
+import gzip
+import lzma
+import os
+import struct
+import time
+import zipfile
+from datetime import datetime
+from typing import Dict, List
+
+from helpers import format_filename
+
+
+RUNS_DIRECTORY = format_filename("")
+
+RUN_PREFIX = "LootNannyLog_"
+RUN_EXTENSION = ".lnrun"
+LEGACY_RUN_EXTENSION = ".json"
+ARCHIVE_PREFIX = "LootNannyRuns_"
+ARCHIVE_SEPARATOR = "::"
+
+COMPRESSORS = {
+    "gzip": (".gz", gzip),
+    "lzma": (".xz", lzma),
+}
+COMPRESSED_EXTENSIONS = {ext: module for ext, module in COMPRESSORS.values()}
+
+ARCHIVE_FORMATS = ("gzip", "lzma", "monthly")
+
+# Damaged run files are renamed to this extension rather than deleted, see `quarantine_run_file`
+QUARANTINE_EXTENSION = ".corrupt"
+
+# Errors reading or decoding a stored run that mean its contents are damaged
+CORRUPT_RUN_ERRORS = (ValueError, EOFError, struct.error, gzip.BadGzipFile, lzma.LZMAError, zipfile.BadZipFile)
+
+
+def _is_run_file(fn: str) -> bool:
+    return fn.startswith(RUN_PREFIX) and not fn.endswith((".tmp", QUARANTINE_EXTENSION))
+
+
+def run_name(fn: str) -> str:
+    """
+    Returns the plain run filename for a run file reference.
+
+    A reference is either a plain run file ( LootNannyLog_<ts>.lnrun ), a compressed run file
+    ( LootNannyLog_<ts>.lnrun.gz ) or a member of a monthly archive
+    ( LootNannyRuns_<yyyy-mm>.zip::LootNannyLog_<ts>.lnrun ). Runs saved by older versions use
+    the .json extension instead of .lnrun.
+
+    Args:
+        fn (str): The run file reference.
+
+    Returns:
+        str: The name of the run file without compression or archive information.
+    """
+    if ARCHIVE_SEPARATOR in fn:
+        fn = fn.split(ARCHIVE_SEPARATOR, 1)[1]
+    for ext in COMPRESSED_EXTENSIONS:
+        if fn.endswith(ext):
+            return fn[:-len(ext)]
+    return fn
+
+
+def run_key(fn: str) -> str:
+    """
+    Returns the identity of the run a run file reference points at, independent of its format.
+
+    Args:
+        fn (str): The run file reference.
+
+    Returns:
+        str: The run name without extension, e.g LootNannyLog_<ts>
+    """
+    name = run_name(fn)
+    for ext in (RUN_EXTENSION, LEGACY_RUN_EXTENSION):
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return name
+
+
+def run_timestamp(fn: str) -> float:
+    """
+    Extracts the run start timestamp encoded in a run file reference.
+
+    Args:
+        fn (str): The run file reference.
+
+    Returns:
+        float: The unix timestamp the run was started at, or 0.0 if it can't be parsed.
+    """
+    try:
+        return float(run_key(fn)[len(RUN_PREFIX):])
+    except ValueError:
+        return 0.0
+
+
+def is_archived(fn: str) -> bool:
+    """
+    Returns True if the run file reference points inside a monthly archive.
+    """
+    return ARCHIVE_SEPARATOR in fn
+
+
+def list_run_files(directory: str = RUNS_DIRECTORY) -> List[str]:
+    """
+    Lists every stored run, whether plain, compressed or packed into a monthly archive.
+
+    When the same run exists in more than one form ( e.g a run was edited after being archived )
+    the plain file wins over the compressed file, which wins over the archived copy. Binary
+    snapshots win over legacy JSON runs stored the same way.
+
+    Args:
+        directory (str): The directory to look for runs in.
+
+    Returns:
+        List[str]: Run file references ordered by run start time.
+    """
+    if not os.path.exists(directory):
+        return []
+
+    # Lower rank wins
+    found: Dict[str, tuple] = {}
+
+    def add(reference, stage):
+        key = run_key(reference)
+        rank = (stage, run_name(reference).endswith(LEGACY_RUN_EXTENSION))
+        if key not in found or found[key][0] > rank:
+            found[key] = (rank, reference)
+
+    for fn in os.listdir(directory):
+        if _is_run_file(fn):
+            add(fn, 1 if any(fn.endswith(ext) for ext in COMPRESSED_EXTENSIONS) else 0)
+        elif fn.startswith(ARCHIVE_PREFIX) and fn.endswith(".zip"):
+            try:
+                with zipfile.ZipFile(os.path.join(directory, fn)) as archive:
+                    for member in archive.namelist():
+                        add(fn + ARCHIVE_SEPARATOR + member, 2)
+            except zipfile.BadZipFile:
+                print(f"Corrupted run archive detected: {fn}")
+
+    return [reference for _, reference in sorted(found.values(), key=lambda t: run_timestamp(t[1]))]
+
+
+def read_run_file(fn: str, directory: str = RUNS_DIRECTORY) -> bytes:
+    """
+    Reads the raw content of a run regardless of how it is stored on disk.
+
+    Args:
+        fn (str): The run file reference as returned by `list_run_files`.
+        directory (str): The directory the runs are stored in.
+
+    Returns:
+        bytes: The uncompressed contents of the run file.
+    """
+    if ARCHIVE_SEPARATOR in fn:
+        archive_fn, member = fn.split(ARCHIVE_SEPARATOR, 1)
+        with zipfile.ZipFile(os.path.join(directory, archive_fn)) as archive:
+            return archive.read(member)
+
+    path = os.path.join(directory, fn)
+    for ext, module in COMPRESSED_EXTENSIONS.items():
+        if fn.endswith(ext):
+            with module.open(path, 'rb') as f:
+                return f.read()
+
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def remove_run_file(fn: str, directory: str = RUNS_DIRECTORY):
+    """
+    Removes a stored run, rewriting its monthly archive if the run was packed into one.
+
+    Args:
+        fn (str): The run file reference as returned by `list_run_files`.
+        directory (str): The directory the runs are stored in.
+
+    Returns:
+        None
+    """
+    if ARCHIVE_SEPARATOR not in fn:
+        os.remove(os.path.join(directory, fn))
+        return
+
+    archive_fn, member = fn.split(ARCHIVE_SEPARATOR, 1)
+    archive_path = os.path.join(directory, archive_fn)
+    with zipfile.ZipFile(archive_path) as archive:
+        contents = {name: archive.read(name) for name in archive.namelist() if name != member}
+
+    if contents:
+        _write_archive(archive_path, contents)
+    else:
+        os.remove(archive_path)
+
+
+def quarantine_run_file(fn: str, directory: str = RUNS_DIRECTORY) -> bool:
+    """
+    Sets a damaged run aside by renaming it to <name>.corrupt, so it is no longer loaded but can still be recovered.
+
+    Runs inside a monthly archive are left where they are, the archive holds other runs as well.
+
+    Args:
+        fn (str): The run file reference as returned by `list_run_files`.
+        directory (str): The directory the runs are stored in.
+
+    Returns:
+        bool: True if the run was renamed.
+    """
+    if is_archived(fn):
+        return False
+    path = os.path.join(directory, fn)
+    os.replace(path, path + QUARANTINE_EXTENSION)
+    return True
+
+
+def remove_run(key: str, directory: str = RUNS_DIRECTORY) -> int:
+    """
+    Removes every stored copy of a run, plain, compressed, legacy or archived.
+
+    Args:
+        key (str): The run name without extension, see `run_key`.
+        directory (str): The directory the runs are stored in.
+
+    Returns:
+        int: The number of copies removed.
+    """
+    if not os.path.exists(directory):
+        return 0
+
+    removed = 0
+    for fn in os.listdir(directory):
+        if _is_run_file(fn) and run_key(fn) == key:
+            remove_run_file(fn, directory)
+            removed += 1
+        elif fn.startswith(ARCHIVE_PREFIX) and fn.endswith(".zip"):
+            try:
+                with zipfile.ZipFile(os.path.join(directory, fn)) as archive:
+                    members = [member for member in archive.namelist() if run_key(member) == key]
+            except zipfile.BadZipFile:
+                continue
+            for member in members:
+                remove_run_file(fn + ARCHIVE_SEPARATOR + member, directory)
+                removed += 1
+    return removed
+
+
+def _write_archive(path: str, contents: Dict[str, bytes]):
+    """
+    Atomically (re)writes a monthly archive with the given members.
+    """
+    tmp_path = path + ".tmp"
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_LZMA) as archive:
+        for name in sorted(contents):
+            archive.writestr(name, contents[name])
+    os.replace(tmp_path, path)
+
+
+def _remove_stale_copies(path: str):
+    """
+    Removes compressed copies of a run that are about to be superseded by a newer archive of it.
+    """
+    stem = path[:-len(RUN_EXTENSION)] if path.endswith(RUN_EXTENSION) else path
+    for ext in COMPRESSED_EXTENSIONS:
+        for stale in (path + ext, stem + LEGACY_RUN_EXTENSION + ext):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+
+def archive_runs(days: int, archive_format: str = "gzip", directory: str = RUNS_DIRECTORY, now: float = None) -> int:
+    """
+    Compresses plain run files that have not been modified for the given number of days.
+
+    With the "gzip" or "lzma" formats every old run is compressed individually next to where it was.
+    With the "monthly" format old runs are packed into one LootNannyRuns_<yyyy-mm>.zip archive per month
+    the run was started in. Runs that were re-saved after being archived replace their archived copy.
+
+    Args:
+        days (int): Minimum age in days of the runs to archive. 0 or less disables archival.
+        archive_format (str): One of "gzip", "lzma" or "monthly".
+        directory (str): The directory the runs are stored in.
+        now (float): The current unix timestamp, defaults to time.time().
+
+    Returns:
+        int: The number of runs archived.
+    """
+    if days <= 0 or not os.path.exists(directory):
+        return 0
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError(f"Unknown archive format: {archive_format}")
+
+    cutoff = (now or time.time()) - days * 24 * 60 * 60
+
+    old_runs = []
+    for fn in os.listdir(directory):
+        if not _is_run_file(fn):
+            continue
+        if any(fn.endswith(ext) for ext in COMPRESSED_EXTENSIONS):
+            continue
+        path = os.path.join(directory, fn)
+        if os.path.getmtime(path) < cutoff:
+            old_runs.append(fn)
+
+    if not old_runs:
+        return 0
+
+    if archive_format == "monthly":
+        by_month: Dict[str, List[str]] = {}
+        for fn in old_runs:
+            month = datetime.fromtimestamp(run_timestamp(fn)).strftime("%Y-%m")
+            by_month.setdefault(month, []).append(fn)
+
+        for month, run_files in by_month.items():
+            archive_path = os.path.join(directory, f"{ARCHIVE_PREFIX}{month}.zip")
+            contents = {}
+            if os.path.exists(archive_path):
+                with zipfile.ZipFile(archive_path) as archive:
+                    contents = {name: archive.read(name) for name in archive.namelist()}
+            for fn in run_files:
+                with open(os.path.join(directory, fn), 'rb') as f:
+                    contents[fn] = f.read()
+            _write_archive(archive_path, contents)
+            for fn in run_files:
+                _remove_stale_copies(os.path.join(directory, fn))
+                os.remove(os.path.join(directory, fn))
+    else:
+        ext, module = COMPRESSORS[archive_format]
+        for fn in old_runs:
+            path = os.path.join(directory, fn)
+            _remove_stale_copies(path)
+            with open(path, 'rb') as src, module.open(path + ext + ".tmp", 'wb') as dst:
+                dst.write(src.read())
+            os.replace(path + ext + ".tmp", path + ext)
+            os.remove(path)
+
+    return len(old_runs)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compress or pack old LootNanny runs")
+    parser.add_argument("days", type=int, help="Archive runs not modified in this many days")
+    parser.add_argument("--format", choices=ARCHIVE_FORMATS, default="gzip")
+    parser.add_argument("--directory", default=RUNS_DIRECTORY)
+    args = parser.parse_args()
+
+    archived = archive_runs(args.days, args.format, directory=args.directory)
+    print(f"Archived {archived} runs")
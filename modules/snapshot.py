@@ -0,0 +1,178 @@
+"""
+Versioned binary snapshot format for hunting runs.
+
+Layout ( all little endian ):
+
+    header      4s magic, uint16 version, uint16 flags, uint32 meta length
+    meta        utf-8 JSON of the serialized run without its graphs, padded to 8 bytes.
+                Decimal values are stored as [mantissa, exponent] scaled integers.
+    series      for each of SERIES: uint64 count followed by count float64 values
+
+The numeric series are returned as buffers over the snapshot bytes ( NumPy arrays when NumPy is
+available, `array.array` otherwise ) so loading a run never parses its graph data.
+"""
+import json
+import struct
+import sys
+from array import array
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MAGIC = b"LNRN"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHI")
+COUNT = struct.Struct("<Q")
+
+SERIES = ("returns", "multi_costs", "multi_values")
+
+# Paths into the serialized run that hold Decimal values ( stored as strings in the JSON format )
+DECIMAL_FIELDS = {
+    "config": ("cps",),
+    "summary": ("tt_return", "total_cost", "extra_spend", "adj_cost", "cached_mu_return"),
+}
+
+
+class UnsupportedSnapshotVersion(ValueError):
+    """
+    The snapshot was written by a newer version of LootNanny. Its contents are fine, this build just can't read them,
+    so the file must be left alone.
+    """
+    pass
+
+
+def is_snapshot(content: bytes) -> bool:
+    """
+    Returns True if the given file content is a binary snapshot rather than a legacy JSON run.
+    """
+    return content[:len(MAGIC)] == MAGIC
+
+
+def pack_decimal(value) -> list:
+    """
+    Packs a Decimal ( or its string form ) into an exact [mantissa, exponent] pair of integers.
+
+    Args:
+        value (Decimal | str | int): The value to pack.
+
+    Returns:
+        list: [mantissa, exponent] such that value == mantissa * 10 ** exponent
+    """
+    sign, digits, exponent = Decimal(value).as_tuple()
+    mantissa = 0
+    for digit in digits:
+        mantissa = mantissa * 10 + digit
+    return [-mantissa if sign else mantissa, exponent]
+
+
+def unpack_decimal(packed: list) -> Decimal:
+    """
+    Unpacks a [mantissa, exponent] pair created by `pack_decimal` back into the exact Decimal.
+    """
+    mantissa, exponent = packed
+    return Decimal((1 if mantissa < 0 else 0, tuple(map(int, str(abs(mantissa)))), exponent))
+
+
+def _series_bytes(values) -> bytes:
+    """
+    Converts a numeric series into little endian float64 bytes.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        return values.astype("<f8", copy=False).tobytes()
+    packed = array('d', values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _series_buffer(content: bytes, offset: int, count: int):
+    """
+    Creates a buffer over `count` float64 values in `content` starting at `offset`.
+    """
+    if np is not None:
+        return np.frombuffer(content, dtype="<f8", count=count, offset=offset)
+    values = array('d')
+    values.frombytes(memoryview(content)[offset:offset + count * 8])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def dumps(serialized: dict) -> bytes:
+    """
+    Encodes a serialized run ( see `HuntingTrip.serialize_run` ) as a binary snapshot.
+
+    Args:
+        serialized (dict): The serialized run.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    meta = {k: v for k, v in serialized.items() if k != "graphs"}
+    for section, fields in DECIMAL_FIELDS.items():
+        meta[section] = dict(meta[section])
+        for field in fields:
+            if field in meta[section]:
+                meta[section][field] = pack_decimal(meta[section][field])
+    meta["loot"] = {k: [int(v["c"]), pack_decimal(v["v"])] for k, v in meta["loot"].items()}
+
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    meta_bytes += b" " * (-(HEADER.size + len(meta_bytes)) % 8)
+
+    graphs = serialized["graphs"]
+    series = (graphs["returns"], graphs["multis"][0], graphs["multis"][1])
+
+    parts = [HEADER.pack(MAGIC, VERSION, 0, len(meta_bytes)), meta_bytes]
+    for values in series:
+        parts.append(COUNT.pack(len(values)))
+        parts.append(_series_bytes(values))
+    return b"".join(parts)
+
+
+def loads(content: bytes) -> dict:
+    """
+    Decodes a binary snapshot back into the serialized run structure.
+
+    Decimal fields are returned as Decimal instances and the graph series as read-only buffers
+    over `content`, everything else matches the legacy JSON run format.
+
+    Args:
+        content (bytes): The snapshot created by `dumps`.
+
+    Returns:
+        dict: The serialized run.
+
+    Raises:
+        UnsupportedSnapshotVersion: The snapshot was written by a newer format version.
+        ValueError: The content is not a run snapshot.
+    """
+    magic, version, _, meta_length = HEADER.unpack_from(content)
+    if magic != MAGIC:
+        raise ValueError("Not a LootNanny run snapshot")
+    if version > VERSION:
+        raise UnsupportedSnapshotVersion(f"Unsupported run snapshot version {version}")
+
+    offset = HEADER.size
+    serialized = json.loads(content[offset:offset + meta_length].decode("utf-8"))
+    offset += meta_length
+
+    for section, fields in DECIMAL_FIELDS.items():
+        for field in fields:
+            if field in serialized[section]:
+                serialized[section][field] = unpack_decimal(serialized[section][field])
+    serialized["loot"] = {k: {"c": c, "v": unpack_decimal(v)} for k, (c, v) in serialized["loot"].items()}
+
+    series = []
+    for _ in SERIES:
+        count, = COUNT.unpack_from(content, offset)
+        offset += COUNT.size
+        series.append(_series_buffer(content, offset, count))
+        offset += count * 8
+
+    serialized["graphs"] = {"returns": series[0], "multis": [series[1], series[2]]}
+    return serialized
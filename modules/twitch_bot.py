@@ -0,0 +1,97 @@
+"""
+The Twitch chat bot, kept apart from modules/twitch.py so twitchio is only imported once the bot is started.
+"""
+from twitchio.ext import commands
+import time
+
+from modules.twitch import Commands, format_info, format_commands, format_top_loots, format_all_returns
+
+
+class StopException(Exception):
+    pass
+
+
+class TwitchIntegration(commands.Bot):
+
+    def __init__(self, app, username="", token="", channel="", command_prefix=""):
+        # Initialise our Bot with our access token, prefix and a list of channels to join on boot...
+        self.app = app
+        self.username = username
+        self.command_prefix = command_prefix
+        super().__init__(token=token, prefix=command_prefix, initial_channels=[channel])
+        self.running = True
+        self.exited = False
+
+    def run(self):
+        """
+        A blocking function that starts the asyncio event loop,
+        connects to the twitch IRC server, and cleans up when done.
+        """
+        try:
+            self.loop.create_task(self.connect())
+            self.loop.run_forever()
+        except StopException:
+            pass
+        finally:
+            self.loop.stop()
+            time.sleep(2)
+            self.loop.close()
+            self.exited = True
+
+    async def event_ready(self):
+        """
+        A function that is called when the event "ready" is triggered.
+
+        This function is responsible for handling the event when the bot is logged in and ready to chat and use commands.
+
+        Parameters:
+            self (class): An instance of the class.
+
+        Returns:
+            None
+        """
+        # We are logged in and ready to chat and use commands...
+        print(f'Logged in as | {self.username}')
+
+    @commands.command()
+    async def lootnanny(self, ctx: commands.Context):
+        """
+        A command that sends a message back to the channel.
+
+        Parameters:
+        - ctx (commands.Context): The context of the command.
+
+        Returns:
+        - None
+        """
+        # Here we have a command hello, we can invoke our command with our prefix and command name
+        # e.g ?hello
+        # We can also give our commands aliases (different names) to invoke with.
+
+        # Send a hello back!
+        # Sending a reply back to the channel is easy... Below is an example.
+        extra_command = ctx.message.content.lstrip(self.command_prefix + "lootnanny").strip()
+
+        try:
+            cmd = Commands(extra_command)
+            if cmd not in self.app.twitch.commands_enabled:
+                cmd = Commands.COMMANDS
+        except:
+            cmd = Commands.COMMANDS
+
+        if cmd == Commands.INFO:
+            msg = format_info()
+        elif cmd == Commands.COMMANDS:
+            msg = format_commands(self.app.twitch.commands_enabled)
+        elif cmd == Commands.TOP_LOOTS:
+            msg = format_top_loots(self.app.combat_module)
+        elif cmd == Commands.ALL_RETURNS:
+            msg = format_all_returns(self.app.combat_module)
+
+        await ctx.send(msg)
+
+    def start(self):
+        """
+        Starts the execution of the program by calling the `run` method.
+        """
+        self.run()
@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import numpy as np
+
+from modules.analysis import MULTIPLIER_BINS, AnalysisCancelled, aggregate_runs
+
+
+def _run(day, total_cost, extra_spend, tt_return, total_return_mu, multipliers=([], [])):
+    return SimpleNamespace(time_start=datetime(2024, 1, day), total_cost=Decimal(total_cost),
+                           extra_spend=Decimal(extra_spend), tt_return=Decimal(tt_return),
+                           total_return_mu=Decimal(total_return_mu), multipliers=multipliers)
+
+
+class TestAggregateRuns(unittest.TestCase):
+
+    def setUp(self):
+        self.runs = [
+            _run(1, "10", "0", "8", "9", ([1.0, 1.0, 0.0], [0.5, 2.0, 1.0])),
+            # Without spend, and failed to load: both skipped
+            _run(2, "0", "0", "0", "0"),
+            None,
+            _run(3, "4", "1", "10", "12", ([1.0], [10.0])),
+        ]
+
+    def test_per_run_and_lifetime_arrays(self):
+        """
+        Every run with spend gives its return, with and without markup, and adds to the running profit.
+        """
+        progress = []
+        analysis = aggregate_runs(self.runs, len(self.runs), lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(progress, [(1, 4), (2, 4), (3, 4), (4, 4)])
+        self.assertEqual(len(analysis.starts), 2)
+        np.testing.assert_allclose(analysis.return_perc, [80.0, 200.0])
+        np.testing.assert_allclose(analysis.return_mu_perc, [90.0, 240.0])
+        np.testing.assert_allclose(analysis.cumulative_profit, [-2.0, 3.0])
+        np.testing.assert_allclose(analysis.cumulative_mu_profit, [-1.0, 6.0])
+
+    def test_multiplier_histogram(self):
+        """
+        The loots with a cost are binned by multiplier over log spaced bins from the lowest to the highest.
+        """
+        analysis = aggregate_runs(self.runs)
+
+        self.assertEqual(len(analysis.multiplier_edges), MULTIPLIER_BINS + 1)
+        self.assertAlmostEqual(analysis.multiplier_edges[0], 0.5)
+        self.assertAlmostEqual(analysis.multiplier_edges[-1], 10.0)
+        self.assertEqual(analysis.multiplier_counts.sum(), 3)
+        self.assertEqual(analysis.multiplier_counts[0], 1)
+        self.assertEqual(analysis.multiplier_counts[-1], 1)
+        self.assertEqual(analysis.multiplier_counts[np.searchsorted(analysis.multiplier_edges, 2.0) - 1], 1)
+
+    def test_empty_and_cancelled(self):
+        """
+        No runs give empty arrays, and a cancelled aggregation raises.
+        """
+        analysis = aggregate_runs([None])
+        self.assertEqual(len(analysis.return_perc), 0)
+        self.assertEqual(len(analysis.multiplier_counts), 0)
+
+        with self.assertRaises(AnalysisCancelled):
+            aggregate_runs(self.runs, is_cancelled=lambda: True)
+
+
+if __name__ == '__main__':
+    unittest.main()
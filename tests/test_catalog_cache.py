@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+from data import cache
+from data.crafting import _pack_blueprints, _unpack_blueprints, make_blueprints
+
+
+class TestCatalogCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        self.source = os.path.join(self.directory, "weapons.json")
+        self.builds = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_source(self, decay):
+        with open(self.source, 'w') as f:
+            f.write(json.dumps({"Rifle": {"decay": decay}}))
+
+    def _build(self):
+        self.builds += 1
+        with open(self.source, 'r') as f:
+            return {name: Decimal(data["decay"]) for name, data in json.loads(f.read()).items()}
+
+    def _load(self):
+        return cache.load_catalog("weapons", [self.source], self._build, directory=self.directory)
+
+    def test_cache_is_rebuilt_when_the_source_changes(self):
+        """
+        The processed catalog is built once per version of its source file, and stale caches are removed.
+        """
+        self._write_source("0.05")
+        self.assertEqual(self._load(), {"Rifle": Decimal("0.05")})
+        self.assertEqual(self._load(), {"Rifle": Decimal("0.05")})
+        self.assertEqual(self.builds, 1)
+
+        self._write_source("0.07")
+        self.assertEqual(self._load(), {"Rifle": Decimal("0.07")})
+        self.assertEqual(self.builds, 2)
+
+        caches = [fn for fn in os.listdir(self.directory) if fn.endswith(cache.CACHE_EXTENSION)]
+        self.assertEqual(caches, [os.path.basename(cache.cache_path("weapons", [self.source], self.directory))])
+
+    def test_blueprints_share_slots_through_the_cache(self):
+        """
+        Blueprints with the same materials share one slot tuple, also after a round trip through the cache.
+        """
+        entries = {"Rifle Blueprint": [["Iron Ingot", 10]], "Rifle Blueprint (L)": [["Iron Ingot", 10]],
+                   "Pistol Blueprint": [["Iron Ingot", 10], ["Oil", 2]]}
+        source = os.path.join(self.directory, "crafting.json")
+        with open(source, 'w') as f:
+            f.write(json.dumps(entries))
+
+        def build():
+            with open(source, 'r') as f:
+                return make_blueprints(json.loads(f.read()).items())
+
+        for _ in range(2):
+            blueprints = cache.load_catalog("blueprints", [source], build, directory=self.directory,
+                                            pack=_pack_blueprints, unpack=_unpack_blueprints)
+            rifle, rifle_l, pistol = (blueprints[name] for name in entries)
+            self.assertIs(rifle.slots, rifle_l.slots)
+            self.assertIs(rifle.slots[0], pistol.slots[0])
+            self.assertEqual(pistol.slots[1].name, "Oil")
+            self.assertEqual(pistol.slots[1].count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
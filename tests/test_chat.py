@@ -1,6 +1,9 @@
+import os
+import tempfile
+import threading
 import unittest
 
-from chat import LogLine, parse_log_line
+from chat import ChatReader, LogLine, parse_log_line
 
 
 class TestChatParsing(unittest.TestCase):
@@ -110,5 +113,37 @@ class TestChatParsing(unittest.TestCase):
         self._internal(msg, expected)
 
 
+class TestChatReader(unittest.TestCase):
+
+    def test_follow_wakes_listener_after_idle(self):
+        """
+        An idle reader notifies its listener on the first new line, and only yields complete lines.
+        """
+        fd, location = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        self.addCleanup(os.remove, location)
+
+        notified = []
+        reader = ChatReader(location, on_lines=lambda: notified.append(True), idle_timeout=60)
+        reader.last_activity -= 120
+        self.assertTrue(reader.is_idle())
+
+        def write():
+            with open(location, "a", encoding="utf_8") as f:
+                f.write("2021-09-21 09:42:35 [System] [] You ")
+                f.flush()
+                f.write("inflicted 10.0 points of damage\n")
+
+        writer = threading.Timer(0.1, write)
+        writer.start()
+        with open(location, "r", encoding="utf_8_sig") as f:
+            line = next(reader.follow(f))
+        writer.join()
+
+        self.assertEqual(line, "2021-09-21 09:42:35 [System] [] You inflicted 10.0 points of damage")
+        self.assertEqual(notified, [True])
+        self.assertFalse(reader.is_idle())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import config
+from config import Config
+
+
+class TestConfigSaving(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "config.json")
+        patches = [mock.patch.object(config, "CONFIG_FILENAME", self.filename),
+                   # Long enough that the debounce timer never fires during a test
+                   mock.patch.object(config, "SAVE_DELAY", 60.0)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.config = Config()
+
+    def tearDown(self):
+        if self.config._save_timer:
+            self.config._save_timer.cancel()
+        self.tmp.cleanup()
+
+    def _saved(self) -> dict:
+        with open(self.filename, 'r') as f:
+            return json.loads(f.read())
+
+    def test_batch_writes_once(self):
+        """
+        Any number of changes inside a batch, nested or not, are written with a single save when it exits.
+        """
+        with mock.patch.object(Config, "save", autospec=True, side_effect=Config.save) as save:
+            with self.config.batch():
+                for delay in range(10):
+                    self.config.screenshot_delay = delay
+                with self.config.batch():
+                    self.config.name = "Tester"
+                self.assertEqual(save.call_count, 0)
+            self.assertEqual(save.call_count, 1)
+
+        self.assertIsNone(self.config._save_timer)
+        self.assertEqual(self._saved()["screenshot_delay"], 9)
+        self.assertEqual(self._saved()["name"], "Tester")
+
+    def test_flush_writes_pending_changes_immediately(self):
+        """
+        A change is debounced rather than written, until `flush` writes it straight away.
+        """
+        self.config.name = "Tester"
+        self.assertFalse(os.path.exists(self.filename))
+        self.assertIsNotNone(self.config._save_timer)
+
+        self.config.flush()
+        self.assertEqual(self._saved()["name"], "Tester")
+        self.assertIsNone(self.config._save_timer)
+
+
+if __name__ == '__main__':
+    unittest.main()
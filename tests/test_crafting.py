@@ -0,0 +1,58 @@
+import unittest
+from decimal import Decimal
+
+from modules.crafting import BlueprintCost, BlueprintCostTracker, Blueprint, Slot
+
+
+class FakeMarkup(object):
+
+    def __init__(self):
+        self.markups = {}
+        self.listeners = []
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def apply_markup_to_item(self, name, count, value):
+        return value * self.markups.get(name, Decimal("1.0"))
+
+    def set(self, name, markup):
+        self.markups[name] = Decimal(markup)
+        for listener in self.listeners:
+            listener(name)
+
+
+class TestBlueprintCostTracker(unittest.TestCase):
+
+    def test_markup_change_updates_only_the_blueprints_using_it(self):
+        """
+        A markup change recalculates the blueprints using the resource and reports how their cost changed.
+        """
+        blueprints = {
+            "Rifle Blueprint": Blueprint("Rifle Blueprint", (Slot("Iron Ingot", 10), Slot("Oil", 2))),
+            "Pistol Blueprint": Blueprint("Pistol Blueprint", (Slot("Iron Ingot", 5),)),
+            "Armor Blueprint": Blueprint("Armor Blueprint", (Slot("Hide", 4),)),
+        }
+        resources = {"Iron Ingot": Decimal("0.1"), "Oil": Decimal("0.5"), "Hide": Decimal("0.2")}
+        uses = {"Iron Ingot": (("Pistol Blueprint", 5), ("Rifle Blueprint", 10)), "Oil": (("Rifle Blueprint", 2),),
+                "Hide": (("Armor Blueprint", 4),)}
+        markup = FakeMarkup()
+        tracker = BlueprintCostTracker(markup, blueprints, resources, lambda name: uses.get(name, ()))
+        changes = []
+        tracker.add_listener(changes.append)
+
+        self.assertEqual(tracker.cost("Rifle Blueprint"), BlueprintCost(Decimal("2.0"), Decimal("2.0")))
+
+        markup.set("Iron Ingot", "1.5")
+        self.assertEqual(sorted(changes[0]), ["Pistol Blueprint", "Rifle Blueprint"])
+        self.assertEqual(changes[0]["Rifle Blueprint"][1], BlueprintCost(Decimal("2.0"), Decimal("2.50")))
+        self.assertEqual(tracker.cost("Pistol Blueprint").total, Decimal("0.75"))
+        self.assertEqual(tracker.cost("Armor Blueprint").total, Decimal("0.8"))
+
+        # Resources no blueprint uses don't notify
+        markup.set("Animal Oil Residue", "1.2")
+        self.assertEqual(len(changes), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from chat import CombatRow, LootInstance, SkillRow
+from modules import snapshot
+from modules.combat import HuntingTrip, Loadout, LoadoutCostCalculator, TrackingEngine, register_custom_weapons
+
+
+def _config(**values):
+    return SimpleNamespace(**{name: SimpleNamespace(value=value) for name, value in values.items()})
+
+
+class TestTrackingEngine(unittest.TestCase):
+
+    def _row(self, row):
+        row.time = datetime(2024, 1, 1, 12, 0, 0)
+        return row
+
+    def test_tick_tracks_run_and_notifies_listeners(self):
+        """
+        The engine aggregates chat lines into a run without any UI and reports what changed.
+        """
+        engine = TrackingEngine(_config(name="Tester", screenshot_enabled=False))
+        engine.decay = Decimal("0.05")
+        changes = []
+        engine.add_listener(changes.append)
+
+        self.assertEqual(engine.tick([self._row(CombatRow(10.0))]), set())
+
+        engine.start_run()
+        engine.tick([self._row(CombatRow(10.0)), self._row(SkillRow("0.5", "Rifle"))])
+        engine.tick([self._row(LootInstance("Animal Oil Residue", "10", "0.10"))])
+
+        run = engine.active_run
+        self.assertEqual(run.total_attacks, 1)
+        self.assertEqual(run.total_cost, Decimal("0.05"))
+        self.assertEqual(run.tt_return, Decimal("0.10"))
+        self.assertEqual(changes, [{TrackingEngine.COMBAT, TrackingEngine.SKILLS}, {TrackingEngine.LOOT}])
+
+        engine.is_paused = True
+        self.assertEqual(engine.tick([self._row(CombatRow(10.0))]), set())
+        self.assertEqual(run.total_attacks, 1)
+
+
+class TestLoadRuns(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        self.engine = TrackingEngine(_config(archive_after_days=0, archive_format="gzip"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, fn, content: bytes):
+        with open(os.path.join(self.directory, fn), 'wb') as f:
+            f.write(content)
+
+    def test_corrupted_runs_are_set_aside_not_deleted(self):
+        """
+        A run file that can't be decoded is renamed to *.corrupt with its contents intact, the other runs load.
+        """
+        run = HuntingTrip(datetime(2024, 1, 1, 12, 0, 0), Decimal("0.05"))
+        run.time_end = datetime(2024, 1, 1, 13, 0, 0)
+        self._write("LootNannyLog_1704106800.0.lnrun", snapshot.dumps(run.serialize_run()))
+        self._write("LootNannyLog_1704110400.0.json", b"{not json")
+
+        self.engine.load_runs(self.directory)
+
+        self.assertEqual(len(self.engine.runs), 1)
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ["LootNannyLog_1704106800.0.lnrun", "LootNannyLog_1704110400.0.json.corrupt"])
+        with open(os.path.join(self.directory, "LootNannyLog_1704110400.0.json.corrupt"), 'rb') as f:
+            self.assertEqual(f.read(), b"{not json")
+
+    def test_runs_from_newer_versions_are_left_untouched(self):
+        """
+        A run saved by a newer snapshot format is skipped without renaming or deleting it.
+        """
+        run = HuntingTrip(datetime(2024, 1, 1, 12, 0, 0), Decimal("0.05"))
+        content = bytearray(snapshot.dumps(run.serialize_run()))
+        content[4:6] = (snapshot.VERSION + 1).to_bytes(2, "little")
+        self._write("LootNannyLog_1704106800.0.lnrun", bytes(content))
+
+        self.engine.load_runs(self.directory)
+
+        self.assertEqual(self.engine.runs, [])
+        self.assertEqual(os.listdir(self.directory), ["LootNannyLog_1704106800.0.lnrun"])
+        with open(os.path.join(self.directory, "LootNannyLog_1704106800.0.lnrun"), 'rb') as f:
+            self.assertEqual(f.read(), bytes(content))
+
+
+class TestLoadoutCostCalculator(unittest.TestCase):
+
+    def test_loadout_cost_matches_the_cost_table(self):
+        """
+        Single loadouts are calculated exactly and memoized, the vectorized table agrees with them.
+        """
+        register_custom_weapons([("Test Rifle", "0.05", 500)])
+        calculator = LoadoutCostCalculator()
+        loadout = Loadout("!CUSTOM - Test Rifle", damage_enh=2)
+
+        cost = calculator.cost(loadout)
+        self.assertEqual(cost.ammo, Decimal("600"))
+        self.assertEqual(cost.decay, Decimal("0.06"))
+        self.assertEqual(cost.cost_per_shot, Decimal("0.12"))
+        self.assertIs(calculator.cost(loadout), cost)
+
+        table = calculator.cost_table()
+        self.assertAlmostEqual(table.cost_of(loadout.weapon, None, 2), 0.12)
+        ranked = table.cheapest(10)
+        self.assertEqual([r[0] for r in ranked], sorted(r[0] for r in ranked))
+        self.assertEqual(ranked[0][0], float(table.costs.min()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from unittest import mock
+
+from chat import CombatRow, LootInstance
+from modules import export, snapshot
+from modules.combat import HuntingTrip, iter_runs
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+        for hour in (12, 14):
+            self._write_run(datetime(2024, 1, 1, hour, 0, 0))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_run(self, start: datetime):
+        run = HuntingTrip(start, Decimal("0.05"))
+        for row in (CombatRow(10.0), CombatRow(12.5), LootInstance("Export Test Item", "10", "0.15")):
+            row.time = start
+            if isinstance(row, CombatRow):
+                run.add_combat_chat_row(row)
+            else:
+                run.add_loot_instance_chat_row(row)
+        run.time_end = start.replace(hour=start.hour + 1)
+        with open(os.path.join(self.directory, f"LootNannyLog_{start.timestamp()}.lnrun"), 'wb') as f:
+            f.write(snapshot.dumps(run.serialize_run()))
+
+    def test_run_summary_csv(self):
+        """
+        One CSV row per stored run, with the Decimal fields written exactly or at their fixed precision.
+        """
+        output = io.StringIO()
+        written = export.write_csv(export.run_summary_rows(iter_runs(directory=self.directory)),
+                                   export.RUN_FIELDS, output)
+
+        rows = list(csv.reader(io.StringIO(output.getvalue())))
+        self.assertEqual(written, 2)
+        self.assertEqual(tuple(rows[0]), export.RUN_FIELDS)
+        self.assertEqual(len(rows), 3)
+        row = dict(zip(rows[0], rows[1]))
+        self.assertEqual(row["start"], "2024-01-01 12:00:00")
+        self.assertEqual(row["total_cost"], "0.10")
+        self.assertEqual(row["tt_return"], "0.15")
+        self.assertEqual(row["total_return_mu"], "0.1500")
+        self.assertEqual(row["return_perc"], "150.00")
+        self.assertEqual(row["damage"], "22.50")
+
+    def test_loot_jsonl(self):
+        """
+        One JSON line per looted item per run, the values are strings so no precision is lost.
+        """
+        output = io.StringIO()
+        written = export.write_jsonl(export.loot_rows(iter_runs(include_loot=True, directory=self.directory)),
+                                     output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(written, 2)
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(tuple(lines[0]), export.LOOT_FIELDS)
+        self.assertEqual(lines[0]["item"], "Export Test Item")
+        self.assertEqual(lines[0]["count"], 10)
+        self.assertEqual(lines[0]["value"], "0.15")
+        self.assertEqual(lines[0]["total_value"], "0.1500")
+
+    def test_unreadable_runs_are_reported_on_stderr(self):
+        """
+        Skipped runs are reported outside of the exported rows.
+        """
+        with open(os.path.join(self.directory, "LootNannyLog_1704200000.0.json"), 'w') as f:
+            f.write("{not json")
+        output, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            written = export.export("runs", "csv", output, directory=self.directory)
+        self.assertEqual(written, 2)
+        self.assertNotIn("Corrupted", output.getvalue())
+        self.assertIn("LootNannyLog_1704200000.0.json", errors.getvalue())
+
+        # Analysis keeps its progress counts right by getting a None for every skipped run
+        with contextlib.redirect_stderr(io.StringIO()):
+            runs = list(iter_runs(directory=self.directory, yield_unreadable=True))
+        self.assertEqual(len(runs), 3)
+        self.assertEqual(sum(run is None for run in runs), 1)
+
+    def test_interrupting_an_export_stops_it(self):
+        """
+        Ctrl+C while a run is loaded stops the export instead of being reported as an unreadable run.
+        """
+        with mock.patch.object(HuntingTrip, "load_from_filename", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                export.export("runs", "csv", io.StringIO(), directory=self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from data import ingest
+
+
+class TestIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.export = os.path.join(self.tmp.name, "weapons.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_invalid_rows_are_rejected_and_the_rest_is_merged(self):
+        """
+        A bad row is reported with its line and skipped, the rows after it are still imported and merged.
+        """
+        with open(self.export, 'w') as f:
+            f.write("Name;Class;Type;Damage;Decay;Ammo\n"
+                    "Rifle;Rifle;Laser;12;5.0;100\n"
+                    "Broken;Rifle;Laser;12;abc;100\n"
+                    "\n"
+                    "Pistol;Pistol;BLP;8;2,5;50\n")
+        rejects = []
+        imported = ingest.ingest("weapons", [self.export], rejects)["weapons"]
+
+        self.assertEqual([(reject.line, reject.reason) for reject in rejects], [(3, "decay is not a number: 'abc'")])
+        self.assertEqual(list(imported), ["Rifle", "Pistol"])
+        self.assertEqual(imported["Pistol"], {"type": "Pistol", "weapon_type": "BLP", "damage": "8", "decay": "0.025",
+                                             "ammo": 50})
+
+        current = {"Rifle": {"type": "Rifle", "weapon_type": "Laser", "damage": "12.0", "decay": "0.050", "ammo": 100},
+                   "Old": {"type": "Rifle", "decay": "0.1", "ammo": 10}}
+        changes = ingest.diff_catalog(current, imported)
+        self.assertEqual(changes, ingest.CatalogDiff(["Pistol"], [], ["Old"], ["Rifle"]))
+
+        merged = ingest.merge_catalog(current, imported, changes)
+        self.assertEqual(sorted(merged), ["Old", "Pistol", "Rifle"])
+        self.assertEqual(merged["Rifle"]["decay"], "0.050")
+        self.assertNotIn("Old", ingest.merge_catalog(current, imported, changes, replace=True))
+
+    def test_blueprint_with_a_rejected_row_is_not_imported(self):
+        """
+        A blueprint is only imported with all of its materials, a rejected row drops the blueprint and its resources.
+        """
+        export = os.path.join(self.tmp.name, "crafting.csv")
+        with open(export, 'w') as f:
+            f.write("Name;Material;Amount;Cost\n"
+                    "Rifle Blueprint;Iron Ingot;10;1.0\n"
+                    "Rifle Blueprint;Oil;abc;0.5\n"
+                    "Pistol Blueprint;Lysterium Ingot;5;0.05\n"
+                    "Knife Blueprint;Hide;0;0.1\n"
+                    "Pistol Blueprint;Oil;2;0.2\n")
+        rejects = []
+        catalogs = ingest.ingest("crafting", [export], rejects)
+
+        self.assertEqual(dict(catalogs["blueprints"]), {"Pistol Blueprint": [["Lysterium Ingot", 5], ["Oil", 2]]})
+        self.assertEqual(dict(catalogs["resources"]), {"Lysterium Ingot": "0.01", "Oil": "0.1"})
+        self.assertEqual([(reject.line, reject.reason) for reject in rejects], [
+            (3, "amount is not a whole number: 'abc'"),
+            (5, "amount must be at least 1"),
+            (3, "Rifle Blueprint not imported, one of its rows was rejected"),
+            (5, "Knife Blueprint not imported, one of its rows was rejected"),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
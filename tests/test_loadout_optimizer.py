@@ -0,0 +1,42 @@
+import unittest
+
+from modules.loadout_optimizer import optimize, pareto_front
+
+
+class TestLoadoutOptimizer(unittest.TestCase):
+
+    def test_pareto_front(self):
+        """
+        Only options without a cheaper option of at least the same value are kept, cheapest first.
+        """
+        value = [1.0, 3.0, 2.0, 3.0, 0.5]
+        cost = [1.0, 3.0, 2.0, 4.0, 2.0]
+        self.assertEqual(list(pareto_front(value, cost)), [0, 2, 1])
+
+    def test_optimize_respects_amp_compatibility(self):
+        """
+        Amps only fit weapons of their type, their damage is capped and dominated options are pruned.
+        """
+        weapons = {
+            "Laser Rifle": {"type": "Rifle", "weapon_type": "Laser", "damage": "20", "decay": "0.05", "ammo": 0},
+            "Cheap Knife": {"type": "Melee", "damage": "2", "decay": "0.01", "ammo": 0},
+            "Unknown Gun": {"type": "Rifle", "decay": "0.01", "ammo": 0},
+        }
+        amps = {
+            # 6 damage per PEC, but only 10 of its damage ( half the rifle damage ) counts
+            "Energy Amp": {"type": "Energy Amp", "damage": "12", "decay": "0.02", "ammo": 0},
+            "Blp Amp": {"type": "BLP Amp", "damage": "50", "decay": "0.001", "ammo": 0},
+            "Plain Scope": {"type": "Energy Amp", "decay": "0.01", "ammo": 0},
+        }
+        scopes = {"Scope": {"type": "Scope", "decay": "0.001", "ammo": 0}}
+
+        scores = optimize(weapons, amps, scopes, {}, damage_levels=[0])
+        loadouts = [(score.loadout.weapon, score.loadout.amp, score.loadout.scope) for score in scores]
+        self.assertEqual(loadouts, [("Cheap Knife", None, None), ("Laser Rifle", None, None),
+                                    ("Laser Rifle", "Energy Amp", None)])
+        self.assertAlmostEqual(scores[-1].damage, 30.0)
+        self.assertAlmostEqual(scores[-1].cost_per_shot, 0.07)
+
+
+if __name__ == '__main__':
+    unittest.main()
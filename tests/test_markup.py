@@ -0,0 +1,94 @@
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from modules import markup
+from modules.markup import Markup, MarkupStore
+
+
+class TestMarkupStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmp.name, "markup.json")
+        self.log_filename = os.path.join(self.tmp.name, "markup.log")
+        patches = [mock.patch.object(markup, "MARKUP_FILENAME", self.filename),
+                   mock.patch.object(markup, "MARKUP_LOG_FILENAME", self.log_filename)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _log_lines(self) -> list:
+        with open(self.log_filename, 'r') as f:
+            return f.readlines()
+
+    def test_edits_survive_a_reload(self):
+        """
+        Edits are appended to the log, and are replayed and compacted into the markup file on the next load.
+        """
+        store = MarkupStore()
+        store.add_markup_for_item("Oil", "105%")
+        store.add_markup_for_item("Iron Ingot", "+0.5")
+        store.add_markup_for_item("Oil", "110%")
+        self.assertEqual(len(self._log_lines()), 3)
+
+        reloaded = MarkupStore()
+        self.assertEqual(reloaded.get_markup_for_item("Oil"), Markup(Decimal("1.1"), False))
+        self.assertEqual(reloaded.get_markup_for_item("Iron Ingot"), Markup(Decimal("0.5"), True))
+        self.assertEqual(reloaded.get_markup_for_item("Shrapnel"), Markup(Decimal("1.01"), False))
+        self.assertFalse(os.path.exists(self.log_filename))
+
+    def test_truncated_log_line_is_skipped(self):
+        """
+        A partially written last line, e.g from a crash, is skipped and the edits before it are kept.
+        """
+        with open(self.log_filename, 'w') as f:
+            f.write(json.dumps(["Oil", "1.05", False]) + "\n")
+            f.write('["Iron Ingot", "0.')
+
+        store = MarkupStore()
+        self.assertEqual(store.get_markup_for_item("Oil"), Markup(Decimal("1.05"), False))
+        self.assertEqual(store.get_markup_for_item("Iron Ingot"), markup.DEFAULT_NULL_MARKUP)
+
+    def test_unchanged_markup_writes_nothing(self):
+        """
+        Setting an item to the markup it already has neither logs an edit nor notifies the listeners.
+        """
+        store = MarkupStore()
+        changes = []
+        store.add_listener(changes.append)
+        store.add_markup_for_item("Shrapnel", "101%")
+        self.assertFalse(os.path.exists(self.log_filename))
+
+        store.add_markup_for_item("Oil", "105%")
+        store.add_markup_for_item("Oil", "105%")
+        self.assertEqual(len(self._log_lines()), 1)
+        self.assertEqual(changes, ["Oil"])
+
+    def test_log_is_compacted_into_the_markup_file(self):
+        """
+        Once COMPACT_AFTER edits were logged they are folded into the markup file and the log is removed.
+        """
+        store = MarkupStore()
+        with mock.patch.object(markup, "COMPACT_AFTER", 3):
+            store.add_markup_for_item("Oil", "105%")
+            store.add_markup_for_item("Iron Ingot", "+0.5")
+            self.assertTrue(os.path.exists(self.log_filename))
+            store.add_markup_for_item("Lysterium Ingot", "102%")
+
+        self.assertFalse(os.path.exists(self.log_filename))
+        with open(self.filename, 'r') as f:
+            saved = json.loads(f.read())
+        self.assertEqual(saved["Oil"], ["1.05", False])
+        self.assertEqual(saved["Iron Ingot"], ["0.5", True])
+        self.assertEqual(saved["Lysterium Ingot"], ["1.02", False])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import unittest
+
+from modules import run_store
+
+
+class TestRunStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write_run(self, ts, content=None, age=None):
+        """
+        Writes a plain run file, optionally backdating its modification time.
+        """
+        path = os.path.join(self.directory, f"LootNannyLog_{ts}.json")
+        with open(path, 'w') as f:
+            f.write(json.dumps(content or {"start": ts}))
+        if age is not None:
+            os.utime(path, (age, age))
+        return path
+
+    def test_gzip_archival_is_transparent(self):
+        """
+        Old runs are compressed in place and still read back with their original contents.
+        """
+        self._write_run(1600000000.0, age=1600000000.0)
+        self._write_run(1700000000.0)
+
+        archived = run_store.archive_runs(30, "gzip", directory=self.directory, now=1700000000.0)
+        self.assertEqual(archived, 1)
+
+        run_files = run_store.list_run_files(self.directory)
+        self.assertEqual(run_files, ["LootNannyLog_1600000000.0.json.gz", "LootNannyLog_1700000000.0.json"])
+        self.assertEqual(json.loads(run_store.read_run_file(run_files[0], self.directory)), {"start": 1600000000.0})
+
+    def test_monthly_archive_prefers_resaved_runs(self):
+        """
+        Runs packed into a monthly archive are listed in start order, and a plain copy saved after
+        archival takes precedence over the archived one.
+        """
+        self._write_run(1600000000.0, age=1600000000.0)
+        self._write_run(1600100000.0, age=1600100000.0)
+
+        run_store.archive_runs(30, "monthly", directory=self.directory, now=1700000000.0)
+        run_files = run_store.list_run_files(self.directory)
+        self.assertTrue(all(run_store.is_archived(fn) for fn in run_files))
+        self.assertEqual([run_store.run_timestamp(fn) for fn in run_files], [1600000000.0, 1600100000.0])
+
+        self._write_run(1600000000.0, content={"start": "edited"})
+        run_files = run_store.list_run_files(self.directory)
+        self.assertEqual(run_files[0], "LootNannyLog_1600000000.0.json")
+        self.assertEqual(json.loads(run_store.read_run_file(run_files[0], self.directory)), {"start": "edited"})
+
+    def test_remove_run_removes_every_copy(self):
+        """
+        Deleting a run removes its plain file as well as the copy packed into a monthly archive.
+        """
+        self._write_run(1600000000.0, age=1600000000.0)
+        self._write_run(1600100000.0, age=1600100000.0)
+        run_store.archive_runs(30, "monthly", directory=self.directory, now=1700000000.0)
+        self._write_run(1600000000.0, content={"start": "edited"})
+
+        removed = run_store.remove_run("LootNannyLog_1600000000.0", directory=self.directory)
+        self.assertEqual(removed, 2)
+        self.assertEqual([run_store.run_timestamp(fn) for fn in run_store.list_run_files(self.directory)], [1600100000.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
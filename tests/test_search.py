@@ -0,0 +1,46 @@
+import unittest
+
+from utils.search import SearchIndex, TrigramIndex, catalog_changed, catalog_index
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex(["ArMatrix LR-10 (L)", "ArMatrix LB-10 (L)", "Sollomate Opalo", "Omegaton A104",
+                                  "armor plating"])
+
+    def test_prefix_matches_rank_before_token_matches(self):
+        """
+        Names starting with the query come first, case is ignored and every word of the query must match a word.
+        """
+        self.assertEqual(self.index.search("arm"), ["ArMatrix LB-10 (L)", "ArMatrix LR-10 (L)", "armor plating"])
+        self.assertEqual(self.index.search("opalo"), ["Sollomate Opalo"])
+        self.assertEqual(self.index.search("10 lr"), ["ArMatrix LR-10 (L)"])
+        self.assertEqual(self.index.search("l armatrix", limit=1), ["ArMatrix LB-10 (L)"])
+        self.assertEqual(self.index.search("missing"), [])
+
+    def test_trigram_matches_fill_remaining_results(self):
+        """
+        Misspelt queries and word fragments are found by the trigrams they share with the names.
+        """
+        index = TrigramIndex(["Weapon Cabinet Blueprint", "Gazzurdite Texture Blueprint", "Basic Rings Blueprint"])
+        self.assertEqual(index.search("weepon"), ["Weapon Cabinet Blueprint"])
+        self.assertEqual(index.search("urdite"), ["Gazzurdite Texture Blueprint"])
+        self.assertEqual(index.search("blueprint", limit=2), ["Basic Rings Blueprint", "Gazzurdite Texture Blueprint"])
+
+    def test_catalog_index_is_rebuilt_after_a_change(self):
+        """
+        A catalog index is reused until the catalog is marked as changed, even when its size stays the same.
+        """
+        catalog = {"Sollomate Opalo": {}, "Omegaton A104": {}}
+        index = catalog_index(catalog)
+        self.assertIs(catalog_index(catalog), index)
+
+        del catalog["Omegaton A104"]
+        catalog["Omegaton M2100"] = {}
+        catalog_changed(catalog)
+        self.assertEqual(catalog_index(catalog).search("omegaton"), ["Omegaton M2100"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import json
+import unittest
+from decimal import Decimal
+
+from modules import snapshot
+
+
+SERIALIZED_RUN = {
+    "start": 1600000000.0,
+    "end": None,
+    "notes": "Argonaut hunt",
+    "config": {"cps": "0.0345"},
+    "summary": {
+        "tt_return": "12.3456",
+        "total_cost": "14.1450",
+        "extra_spend": "-1.50",
+        "globals": 1,
+        "hofs": 0,
+        "loots": 41,
+        "adj_cost": "0",
+        "cached_mu_return": "13.00001"
+    },
+    "loot": {"Shrapnel": {"c": "123456", "v": "12.3456"}},
+    "skills": {"Rifle": 0.1234},
+    "skillprocs": {"Rifle": 3},
+    "enhancers": {},
+    "combat": {"attacks": 410, "dmg": 9876.5, "crits": 12, "misses": 30},
+    "graphs": {
+        "returns": [0.5, 0.75, 0.873],
+        "multis": [[0.3, 0.4], [1.25, 0.1]]
+    }
+}
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_round_trip(self):
+        """
+        A snapshot decodes back into the serialized run, with exact Decimals and unchanged graphs.
+        """
+        content = snapshot.dumps(SERIALIZED_RUN)
+        self.assertTrue(snapshot.is_snapshot(content))
+        self.assertFalse(snapshot.is_snapshot(json.dumps(SERIALIZED_RUN).encode()))
+
+        loaded = snapshot.loads(content)
+        self.assertEqual(loaded["summary"]["tt_return"], Decimal("12.3456"))
+        self.assertEqual(str(loaded["summary"]["extra_spend"]), "-1.50")
+        self.assertEqual(str(loaded["summary"]["cached_mu_return"]), "13.00001")
+        self.assertEqual(loaded["loot"]["Shrapnel"], {"c": 123456, "v": Decimal("12.3456")})
+        self.assertEqual(loaded["combat"], SERIALIZED_RUN["combat"])
+        self.assertEqual(list(loaded["graphs"]["returns"]), [0.5, 0.75, 0.873])
+        self.assertEqual([list(m) for m in loaded["graphs"]["multis"]], [[0.3, 0.4], [1.25, 0.1]])
+
+    def test_rejects_newer_versions(self):
+        """
+        Snapshots written by a newer format version are refused rather than misread.
+        """
+        content = bytearray(snapshot.dumps(SERIALIZED_RUN))
+        content[4:6] = (snapshot.VERSION + 1).to_bytes(2, "little")
+        with self.assertRaises(snapshot.UnsupportedSnapshotVersion):
+            snapshot.loads(bytes(content))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,234 @@
 import pyqtgraph as pg
-import pyqtgraph.exporters
 import numpy as np
+from PyQt5 import QtCore
 
 
+# Above this many points scatter plots are drawn as a density image
+DENSITY_THRESHOLD = 5000
+
+# Loots worth this many PED or more are globals
+GLOBAL_VALUE = 50
+
+# Room left above the binned points when the density histogram is laid out, as a fraction of their range
+DENSITY_HEADROOM = 0.25
+
+
+class GrowableSeries(object):
+    """
+    A float64 NumPy buffer that grows in place, doubling its capacity when full.
+
+    `view()` returns the filled part of the buffer without copying it, so it can be handed to pyqtgraph directly.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, values, scale: float = 1.0):
+        """
+        Appends values to the end of the series.
+
+        Args:
+            values (Sequence[float]): The values to append.
+            scale (float): Factor applied to the appended values.
+
+        Returns:
+            None
+        """
+        values = np.asarray(values, dtype=np.float64)
+        end = self._size + len(values)
+        if end > len(self._data):
+            grown = np.empty(max(end, len(self._data) * 2), dtype=np.float64)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        np.multiply(values, scale, out=self._data[self._size:end])
+        self._size = end
+
+    def clear(self):
+        self._size = 0
+
+    def view(self) -> np.ndarray:
+        return self._data[:self._size]
+
+
+class SeriesPlot(object):
+    """
+    A persistent plot of a run's series that only converts the points added since the last update.
+
+    The series are copied into `GrowableSeries` buffers, and the plot item is updated with `setData` on views of
+    those buffers instead of being cleared and re-plotted. When a different run is plotted, or its series got
+    shorter, the buffers are refilled from scratch.
+    """
+
+    def __init__(self, widget: pg.PlotWidget, scale: float = 1.0, scatter: bool = False, **kwargs):
+        self.widget = widget
+        self.scale = scale
+        self.scatter = scatter
+        self.item: pg.PlotDataItem = widget.plot([], **kwargs)
+        # Clipping presumes evenly spaced, sorted x values which scatter plots don't have
+        self.item.setClipToView(not scatter)
+        self.item.setDownsampling(auto=True, method="subsample" if scatter else "peak")
+
+        self._source = None
+        self._series = ()
+
+    def update(self, source, *series):
+        """
+        Brings the plot up to date with the given series.
+
+        Args:
+            source (object): What the series belong to ( e.g the run ), plotting a different source starts over.
+            *series (Sequence[float]): Either the y values, or the x and y values of the plot.
+
+        Returns:
+            None
+        """
+        if self._sync(source, *series):
+            self.item.setData(*self.data())
+
+    def data(self):
+        """
+        Returns views of the plotted series.
+        """
+        return tuple(buffer.view() for buffer in self._series)
+
+    def _sync(self, source, *series) -> bool:
+        """
+        Copies the new points of the series into the buffers, returns True if the buffers changed.
+        """
+        changed = False
+        if source is not self._source or len(series) != len(self._series) or \
+                any(len(values) < len(buffer) for values, buffer in zip(series, self._series)):
+            self._source = source
+            self._series = tuple(GrowableSeries(max(1024, len(values))) for values in series)
+            changed = True
+
+        for values, buffer in zip(series, self._series):
+            if len(values) > len(buffer):
+                buffer.extend(values[len(buffer):], self.scale if buffer is self._series[-1] else 1.0)
+                changed = True
+
+        return changed
+
+    def clear(self):
+        """
+        Removes all points from the plot.
+        """
+        self._source = None
+        self._series = ()
+        self.item.setData([])
+
+
+class DensityScatter(SeriesPlot):
+    """
+    A scatter plot that switches to a log scaled 2D histogram once it holds more than `threshold` points.
+
+    In density mode the points are binned with NumPy into an image, while the outliers at or above `outlier_min_y`
+    ( by default the globals ) are still drawn as individual points on top of it.
+
+    The histogram is kept between updates and only the new points are binned into it. Its range is laid out with
+    `DENSITY_HEADROOM` to spare above the points, it is only rebinned from scratch when a point falls outside of it.
+    """
+
+    def __init__(self, widget: pg.PlotWidget, threshold: int = DENSITY_THRESHOLD, outlier_min_y: float = GLOBAL_VALUE,
+                 bins: int = 200, **kwargs):
+        super().__init__(widget, scatter=True, **kwargs)
+        self.threshold = threshold
+        self.outlier_min_y = outlier_min_y
+        self.bins = bins
+
+        lookup_table = pg.colormap.get("viridis").getLookupTable(alpha=True)
+        # Empty bins are transparent
+        lookup_table[0, 3] = 0
+        self.image = pg.ImageItem()
+        self.image.setLookupTable(lookup_table)
+        self.image.setZValue(-1)
+        self.image.hide()
+        self.is_density = False
+        widget.addItem(self.image)
+
+        self.outliers: pg.PlotDataItem = widget.plot([], **kwargs)
+        self._reset_histogram()
+
+    def _reset_histogram(self):
+        self.histogram = None
+        self.x_edges = self.y_edges = None
+        self._binned = 0
+        self._binned_series = None
+        self._outliers = (GrowableSeries(), GrowableSeries())
+        self._outliers_end = 0
+
+    def _edges(self, values: np.ndarray) -> np.ndarray:
+        low, high = values.min(), values.max()
+        high += (high - low or 1.0) * DENSITY_HEADROOM
+        return np.linspace(low, high, self.bins + 1)
+
+    def _bin(self, x: np.ndarray, y: np.ndarray):
+        """
+        Adds the points after the ones already binned to the histogram, rebinning all of them when needed.
+        """
+        new_x, new_y = x[self._binned:], y[self._binned:]
+        if self._binned_series is not self._series or \
+                new_x.min() < self.x_edges[0] or new_x.max() > self.x_edges[-1] or \
+                new_y.min() < self.y_edges[0] or new_y.max() > self.y_edges[-1]:
+            self.x_edges, self.y_edges = self._edges(x), self._edges(y)
+            self.histogram = np.zeros((self.bins, self.bins))
+            self._binned_series = self._series
+            new_x, new_y = x, y
+
+        histogram, _, _ = np.histogram2d(new_x, new_y, bins=(self.x_edges, self.y_edges))
+        self.histogram += histogram
+        self._binned = len(x)
+
+    def update(self, source, x, y):
+        """
+        Brings the plot up to date with the given points.
+
+        Args:
+            source (object): What the points belong to ( e.g the run ), plotting a different source starts over.
+            x (Sequence[float]): The x values of the points.
+            y (Sequence[float]): The y values of the points.
+
+        Returns:
+            None
+        """
+        series = self._series
+        if not self._sync(source, x, y):
+            return
+        x, y = self.data()
+        if self._series is not series:
+            # Refilled from scratch, the histogram and outliers are too
+            self._reset_histogram()
+
+        # The outliers are collected as the points come in, so they stay up to date in either mode
+        new_x, new_y = x[self._outliers_end:], y[self._outliers_end:]
+        outliers = new_y >= self.outlier_min_y
+        self._outliers[0].extend(new_x[outliers])
+        self._outliers[1].extend(new_y[outliers])
+        self._outliers_end = len(x)
+
+        self.is_density = len(x) > self.threshold
+        if not self.is_density:
+            self.image.hide()
+            self.outliers.setData([])
+            self.item.setData(x, y)
+            return
+
+        self.item.setData([])
+        self._bin(x, y)
+        density = np.log1p(self.histogram)
+        self.image.setImage(density, autoLevels=False, levels=(0, max(density.max(), 1)))
+        self.image.setRect(QtCore.QRectF(self.x_edges[0], self.y_edges[0], self.x_edges[-1] - self.x_edges[0],
+                                         self.y_edges[-1] - self.y_edges[0]))
+        self.image.show()
+        self.outliers.setData(*(buffer.view() for buffer in self._outliers))
+
+    def clear(self):
+        super().clear()
+        self.is_density = False
+        self._reset_histogram()
+        self.image.hide()
+        self.outliers.setData([])
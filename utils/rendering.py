@@ -0,0 +1,122 @@
+import time
+from typing import Callable, Dict, Tuple
+
+from PyQt5 import QtCore
+
+
+# Default maximum number of redraws per second
+DEFAULT_MAX_REFRESH_RATE = 10
+
+
+class RenderScheduler(QtCore.QObject):
+    """
+    Coalesces redraw requests and renders them at a limited frame rate.
+
+    Every part of the UI that can be redrawn is registered as a named target with a callback that
+    redraws it and a function telling whether it is currently visible. Marking a target dirty does not
+    redraw anything straight away, instead a single redraw is scheduled no sooner than 1 / max_refresh_rate
+    seconds after the previous one. Only visible targets are redrawn, hidden ones stay dirty until they
+    are shown and `flush` is called ( e.g when switching tabs ).
+
+    While suspended ( e.g when the tracker is idle ) marking targets dirty schedules nothing, they are redrawn
+    on `resume` or by an explicit `flush` ( e.g in response to the user ).
+    """
+
+    def __init__(self, max_refresh_rate: float = DEFAULT_MAX_REFRESH_RATE, parent=None):
+        super().__init__(parent)
+        self._targets: Dict[str, Tuple[Callable, Callable]] = {}
+        self._dirty = set()
+        self._last_render = 0.0
+        self._min_interval = 0.0
+        self.suspended = False
+        self.set_max_refresh_rate(max_refresh_rate)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.render)
+
+    def set_max_refresh_rate(self, max_refresh_rate: float):
+        """
+        Sets the maximum number of redraws per second, 0 or less disables the limit.
+        """
+        self._min_interval = 1.0 / max_refresh_rate if max_refresh_rate > 0 else 0.0
+
+    def register(self, name: str, callback: Callable, is_visible: Callable = None):
+        """
+        Registers a redrawable part of the UI.
+
+        Args:
+            name (str): The name used to mark the target dirty.
+            callback (Callable): Redraws the target.
+            is_visible (Callable): Returns True if the target is currently shown, defaults to always visible.
+
+        Returns:
+            None
+        """
+        self._targets[name] = (callback, is_visible or (lambda: True))
+
+    def is_dirty(self, name: str) -> bool:
+        """
+        Returns True if the named target is waiting to be redrawn.
+        """
+        return name in self._dirty
+
+    def mark_dirty(self, *names: str):
+        """
+        Marks targets as needing a redraw and schedules one. With no names every target is marked dirty.
+
+        Args:
+            *names (str): The names of the targets to redraw.
+
+        Returns:
+            None
+        """
+        self._dirty.update(names or self._targets)
+        if not self.suspended and not self._timer.isActive():
+            elapsed = time.monotonic() - self._last_render
+            self._timer.start(int(max(0.0, self._min_interval - elapsed) * 1000))
+
+    def suspend(self):
+        """
+        Stops scheduling redraws, dirty targets wait until `resume` or `flush` is called.
+        """
+        self.suspended = True
+        self._timer.stop()
+
+    def resume(self):
+        """
+        Starts redrawing again and schedules a redraw of the targets marked dirty while suspended.
+        """
+        self.suspended = False
+        if self._dirty:
+            self.mark_dirty(*self._dirty)
+
+    def flush(self):
+        """
+        Immediately redraws every dirty target that is visible, ignoring the refresh rate limit.
+        """
+        self._timer.stop()
+        self.render()
+
+    def render(self):
+        """
+        Redraws the dirty targets that are currently visible, hidden targets stay dirty.
+        """
+        self._last_render = time.monotonic()
+        for name in [name for name in self._targets if name in self._dirty]:
+            callback, is_visible = self._targets[name]
+            if not is_visible():
+                continue
+            self._dirty.discard(name)
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error redrawing {name}: {e}")
+
+
+def widget_visible(widget) -> Callable:
+    """
+    Creates an `is_visible` function for `RenderScheduler.register` that is True while the widget is shown
+    on screen, i.e its tab is selected and its window is not minimized.
+    """
+    return lambda: widget.isVisible() and not widget.window().isMinimized()
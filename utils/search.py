@@ -0,0 +1,186 @@
+"""
+Prebuilt search indexes over the names of the game data catalogs, see utils/search_widgets.py for the pickers
+using them.
+"""
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+# Characters separating the tokens of a name, e.g "ArMatrix LR-10 (L)" -> "armatrix", "lr", "10", "l"
+TOKEN_SEPARATORS = re.compile(r"[\s\-_,.:;/()\[\]]+")
+
+
+def fold(text: str) -> str:
+    return text.casefold().strip()
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_SEPARATORS.split(fold(text)) if token]
+
+
+def _prefix_range(keys: List[str], prefix: str) -> range:
+    """
+    Returns the range of the sorted keys starting with the prefix.
+    """
+    start = bisect_left(keys, prefix)
+    # "\U0010ffff" sorts after every character, so this finds the end of the prefix block
+    return range(start, bisect_left(keys, prefix + "\U0010ffff", start))
+
+
+class SearchIndex(object):
+    """
+    Case-folded prefix and token search over a fixed set of names.
+
+    The names are sorted once when the index is built. Their folded forms are kept in a sorted array, so the names
+    starting with a query are one contiguous block found by binary search, the flat equivalent of walking a prefix
+    trie. Every token of every name is indexed as well, so "lr-10" or "armatrix l" finds "ArMatrix LR-10 (L)".
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: List[str] = sorted(set(names), key=lambda name: (fold(name), name))
+        self.folded: List[str] = [fold(name) for name in self.names]
+        self.positions: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        postings: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            for token in set(tokenize(name)):
+                postings.setdefault(token, []).append(i)
+        self.tokens: List[str] = sorted(postings)
+        self.postings: List[List[int]] = [postings[token] for token in self.tokens]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name: str):
+        return name in self.positions
+
+    def position(self, name: str) -> int:
+        """
+        Returns the position of the name in the sorted names, or -1 if it isn't indexed.
+        """
+        return self.positions.get(name, -1)
+
+    def _token_matches(self, token: str) -> set:
+        matches = set()
+        for i in _prefix_range(self.tokens, token):
+            matches.update(self.postings[i])
+        return matches
+
+    def search(self, query: str, limit: int = 50) -> List[str]:
+        """
+        Finds the names matching a query.
+
+        Names starting with the query come first, followed by the names where every word of the query is the
+        start of one of their words, both in sorted order.
+
+        Args:
+            query (str): The text typed so far, case is ignored.
+            limit (int): The maximum number of names returned.
+
+        Returns:
+            List[str]: The matching names.
+        """
+        query = fold(query)
+        if not query:
+            return self.names[:limit]
+
+        prefixed = _prefix_range(self.folded, query)
+        results = [self.names[i] for i in prefixed[:limit]]
+        if len(results) >= limit:
+            return results
+
+        tokens = tokenize(query)
+        if not tokens:
+            return results
+        # Intersect the rarest tokens first
+        matches = None
+        for token_matches in sorted((self._token_matches(token) for token in tokens), key=len):
+            matches = token_matches if matches is None else matches & token_matches
+            if not matches:
+                return results
+
+        for i in sorted(matches):
+            if i not in prefixed:
+                results.append(self.names[i])
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Returns the trigrams of the folded text, padded so the start and end of every word form trigrams too.
+    """
+    text = f"  {' '.join(tokenize(text))} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(SearchIndex):
+    """
+    A `SearchIndex` that also finds names by the trigrams they share with the query, so misspelt queries and
+    fragments from the middle of a word ( "weepon" or "urdite" for "Weapon ..." or "Gazzurdite ..." ) still find them.
+
+    Prefix and token matches keep ranking first, the remaining slots are filled with the names sharing the most
+    trigrams with the query. Queries shorter than a trigram only use the prefix and token search.
+    """
+
+    # Fraction of the query trigrams a name has to share to be listed
+    MIN_SIMILARITY = 0.5
+
+    def __init__(self, names: Iterable[str]):
+        super().__init__(names)
+        trigram_postings: Dict[str, List[int]] = {}
+        for i, folded in enumerate(self.folded):
+            for trigram in trigrams(folded):
+                trigram_postings.setdefault(trigram, []).append(i)
+        self.trigram_postings = trigram_postings
+
+    def search(self, query: str, limit: int = 50) -> List[str]:
+        results = super().search(query, limit)
+        query_trigrams = trigrams(query)
+        if len(results) >= limit or len(fold(query)) < 3 or not query_trigrams:
+            return results
+
+        scores = Counter()
+        for trigram in query_trigrams:
+            scores.update(self.trigram_postings.get(trigram, ()))
+        min_score = max(1, int(len(query_trigrams) * self.MIN_SIMILARITY))
+
+        listed = set(results)
+        # Most shared trigrams first, then the shortest names as they are closest to the query, then sorted order
+        ranked = sorted((i for i, score in scores.items() if score >= min_score),
+                        key=lambda i: (-scores[i], len(self.names[i]), i))
+        for i in ranked:
+            if self.names[i] not in listed:
+                results.append(self.names[i])
+                if len(results) >= limit:
+                    break
+        return results
+
+
+# Catalog id -> ( catalog, revision, index ), the catalog is kept so its id can't be reused by another dict
+_CATALOG_INDEXES: Dict[int, Tuple[dict, int, SearchIndex]] = {}
+# Catalog id -> number of times the catalog was changed, see `catalog_changed`
+_CATALOG_REVISIONS: Dict[int, int] = {}
+
+
+def catalog_changed(catalog: dict):
+    """
+    Marks a catalog as changed, its search index is rebuilt the next time it is asked for. Code changing a shared
+    catalog in place ( e.g `modules.combat.register_custom_weapons` ) has to call this.
+    """
+    _CATALOG_REVISIONS[id(catalog)] = _CATALOG_REVISIONS.get(id(catalog), 0) + 1
+
+
+def catalog_index(catalog: dict) -> SearchIndex:
+    """
+    Returns the search index over the names of a catalog, it is built once and rebuilt only after the catalog was
+    marked as changed with `catalog_changed`.
+    """
+    revision = _CATALOG_REVISIONS.get(id(catalog), 0)
+    cached = _CATALOG_INDEXES.get(id(catalog))
+    if cached is None or cached[0] is not catalog or cached[1] != revision:
+        cached = _CATALOG_INDEXES[id(catalog)] = (catalog, revision, SearchIndex(catalog))
+    return cached[2]
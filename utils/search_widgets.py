@@ -0,0 +1,136 @@
+from typing import List, Sequence
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QStringListModel, Qt
+from PyQt5.QtWidgets import QComboBox, QCompleter
+
+from utils.search import SearchIndex
+
+
+class LazyListModel(QAbstractListModel):
+    """
+    A list model that hands its items to the view in batches, so a combo box over thousands of names only creates
+    rows for the part of the list that was scrolled to.
+    """
+    FETCH_BATCH = 100
+
+    def __init__(self, items: Sequence[str] = (), parent=None):
+        super().__init__(parent)
+        self._items: Sequence[str] = items
+        self._fetched = min(len(items), self.FETCH_BATCH)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched
+
+    def data(self, index, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self._items[index.row()]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched < len(self._items)
+
+    def fetchMore(self, parent=QModelIndex()):
+        self.fetch_to(self._fetched + self.FETCH_BATCH - 1)
+
+    def fetch_to(self, row: int):
+        """
+        Makes sure the rows up to and including `row` are available to the view.
+        """
+        end = min(len(self._items), row + 1)
+        if end <= self._fetched:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, end - 1)
+        self._fetched = end
+        self.endInsertRows()
+
+    def item(self, row: int):
+        return self._items[row] if 0 <= row < len(self._items) else None
+
+
+class _ConcatenatedList(object):
+    """
+    A read-only view of two lists one after the other, so the catalog names don't have to be copied.
+    """
+
+    def __init__(self, first: Sequence, second: Sequence):
+        self.first = first
+        self.second = second
+
+    def __len__(self):
+        return len(self.first) + len(self.second)
+
+    def __getitem__(self, i: int):
+        return self.first[i] if i < len(self.first) else self.second[i - len(self.first)]
+
+
+class SearchComboBox(QComboBox):
+    """
+    An editable combo box over a catalog, backed by a prebuilt `SearchIndex`.
+
+    The drop down lists the sorted catalog lazily, while typing shows the best matches from the index in a completer
+    popup. Only names from the catalog ( or the fixed items above it, e.g "None" ) can be selected, `current_item`
+    returns the selection rather than the typed text.
+    """
+    COMPLETIONS = 50
+
+    def __init__(self, index: SearchIndex, fixed_items: Sequence[str] = (), parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.fixed_items = list(fixed_items)
+
+        self.setEditable(True)
+        self.setInsertPolicy(QComboBox.NoInsert)
+        self.setMaxVisibleItems(20)
+
+        self.completion_model = QStringListModel(self)
+        completer = QCompleter(self.completion_model, self)
+        # The index already filtered and ranked the completions
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.activated[str].connect(self.select)
+        # Replaced before the model is set, the default completer would fetch every row of the lazy model
+        self.setCompleter(completer)
+        self.setModel(LazyListModel(_ConcatenatedList(self.fixed_items, index.names), self))
+
+        self.lineEdit().textEdited.connect(self.on_text_edited)
+        self.lineEdit().editingFinished.connect(self.on_editing_finished)
+
+    def completions(self, text: str) -> List[str]:
+        folded = text.casefold()
+        fixed = [item for item in self.fixed_items if item.casefold().startswith(folded)]
+        return fixed + self.index.search(text, self.COMPLETIONS)
+
+    def on_text_edited(self, text: str):
+        self.completion_model.setStringList(self.completions(text))
+        self.completer().complete()
+
+    def on_editing_finished(self):
+        """
+        Selects the typed name if it is in the catalog, otherwise restores the text of the selection.
+        """
+        text = self.lineEdit().text()
+        if text != self.current_item() and not self.select(text):
+            self.setEditText(self.current_item() or "")
+
+    def row_of(self, name: str) -> int:
+        if name in self.fixed_items:
+            return self.fixed_items.index(name)
+        position = self.index.position(name)
+        return len(self.fixed_items) + position if position >= 0 else -1
+
+    def select(self, name: str) -> bool:
+        """
+        Selects a name of the catalog, fetching the rows up to it if they weren't shown yet.
+
+        Returns:
+            bool: False if the name isn't in the catalog.
+        """
+        row = self.row_of(name)
+        if row < 0:
+            return False
+        self.model().fetch_to(row)
+        self.setCurrentIndex(row)
+        return True
+
+    def current_item(self):
+        return self.model().item(self.currentIndex())
+
@@ -1,31 +1,16 @@
-from PyQt5.QtWidgets import QAbstractItemView, QFormLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QApplication, QWidget, QPushButton, QVBoxLayout, QTableWidget, QTableWidgetItem
+from PyQt5.QtWidgets import QAbstractItemView, QFormLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QApplication, QWidget, QPushButton, QVBoxLayout, QTableView, QTableWidget, QTableWidgetItem
 from PyQt5 import QtCore
 
 
-class BaseTableView(QTableWidget):
-    COLUMNS = ("Item", "Count", "Value")
-
-    def __init__(self, data, *args):
-        QTableWidget.__init__(self, *args)
-        self.data = data
-        self.setData(self.data)
-        self.resizeColumnsToContents()
+class CopyableTableMixin(object):
+    COLUMNS = ()
 
-        self.resizeRowsToContents()
-
-        self.clipboard = QApplication.clipboard()
-        self.clipboard.clear()
-
-    def setData(self, data):
-        self.data = data
-        horHeaders = []
-        for n, key in enumerate(self.COLUMNS):
-            horHeaders.append(key)
-            if key in data:
-                for m, item in enumerate(data[key]):
-                    newitem = QTableWidgetItem(str(item))
-                    self.setItem(m, n, newitem)
-        self.setHorizontalHeaderLabels(horHeaders)
+    def cell_text(self, row, column):
+        """
+        Returns the text displayed in the given cell, or "" for an empty cell.
+        """
+        data = self.model().data(self.model().index(row, column), QtCore.Qt.DisplayRole)
+        return "" if data is None else str(data)
 
     def keyPressEvent(self, event):
         """
@@ -44,12 +29,11 @@ class BaseTableView(QTableWidget):
             clipdata = []
             rowdata = []
             selected_rows = set([])
-            current_row = None
-            
+
             # Get a list of selected rows
             for index in self.selectedIndexes():
                 selected_rows.add(index.row())
-            
+
             # Append the headers
             for header in self.COLUMNS:
                 rowdata.append(header)
@@ -57,17 +41,11 @@ class BaseTableView(QTableWidget):
             rowdata = []
 
             # Add all cells from the selected rows to the copy data
-            # Note: We can't just loop through selectedIndexes because 
+            # Note: We can't just loop through selectedIndexes because
             # QAbstractItemView.SelectRows does not select empty cells
             for row in selected_rows:
-                i = 0
-                while i <= len(self.COLUMNS):
-                    try:
-                        cell_data = self.item(row,i).text()
-                    except:
-                        cell_data = ""
-                    rowdata.append(cell_data)
-                    i += 1
+                for i in range(len(self.COLUMNS)):
+                    rowdata.append(self.cell_text(row, i))
                 clipdata.append('\t'.join(rowdata))
                 rowdata = []
 
@@ -75,8 +53,249 @@ class BaseTableView(QTableWidget):
             self.clipboard.setText('\r\n'.join(clipdata))
 
 
-class RunsView(BaseTableView):
+class DiffTableModel(QtCore.QAbstractTableModel):
+    """
+    Table model holding one tuple per row that applies new data as a diff against the current rows.
+
+    Rows are identified by the value in KEY_COLUMN. Updating the model only emits `dataChanged` for rows
+    whose values changed and inserts rows for new keys, so views keep their selection and scroll position.
+    """
+    COLUMNS = ()
+    KEY_COLUMN = 0
+    EDITABLE_COLUMNS = ()
+
+    # Emitted with (row, column, text) when the user edits a cell
+    cellEdited = QtCore.pyqtSignal(int, int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or role not in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return None
+        return str(self.row(index.row())[index.column()])
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.COLUMNS[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in self.EDITABLE_COLUMNS:
+            flags |= QtCore.Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """
+        Stores a user edit and notifies listeners through `cellEdited`.
+        """
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        row = list(self._rows[index.row()])
+        row[index.column()] = value
+        self._rows[index.row()] = tuple(row)
+        self.dataChanged.emit(index, index)
+        self.cellEdited.emit(index.row(), index.column(), str(value))
+        return True
+
+    def row(self, row):
+        """
+        Returns the values of the given row as a tuple.
+        """
+        return self._rows[row]
+
+    def set_table_data(self, data):
+        """
+        Updates the model from a dictionary of column name to column values.
+        """
+        self.set_rows(list(zip(*[data.get(column, []) for column in self.COLUMNS])))
+
+    def set_rows(self, rows):
+        """
+        Updates the model to the given rows, touching as little of the view as possible.
+
+        - Same keys in the same order: `dataChanged` is emitted for changed rows only.
+        - Only new keys added: the new rows are inserted, unchanged rows are left alone.
+        - Same keys in a different order: a layout change that keeps the selection on the same keys.
+        - Anything else ( e.g rows were removed ): the model is reset.
+
+        Args:
+            rows (List[tuple]): The new rows, one tuple of values per row.
+
+        Returns:
+            None
+        """
+        rows = [tuple(row) for row in rows]
+        key = self.KEY_COLUMN
+        old_keys = [row[key] for row in self._rows]
+        new_keys = [row[key] for row in rows]
+
+        if not self._rows or len(set(new_keys)) != len(new_keys):
+            self._reset(rows)
+            return
+
+        new_positions = {k: i for i, k in enumerate(new_keys)}
+
+        if old_keys == new_keys:
+            self._update_changed(rows)
+        elif all(k in new_positions for k in old_keys) and \
+                [new_positions[k] for k in old_keys] == sorted(new_positions[k] for k in old_keys):
+            # Only additions, existing rows kept their relative order
+            for i, row in enumerate(rows):
+                if i < len(self._rows) and self._rows[i][key] == row[key]:
+                    if self._rows[i] != row:
+                        self._rows[i] = row
+                        self.dataChanged.emit(self.index(i, 0), self.index(i, len(self.COLUMNS) - 1))
+                else:
+                    self.beginInsertRows(QtCore.QModelIndex(), i, i)
+                    self._rows.insert(i, row)
+                    self.endInsertRows()
+        elif set(old_keys) == set(new_positions):
+            self.layoutAboutToBeChanged.emit()
+            old_indexes = self.persistentIndexList()
+            new_indexes = [self.index(new_positions[old_keys[i.row()]], i.column()) for i in old_indexes]
+            self._rows = rows
+            self.changePersistentIndexList(old_indexes, new_indexes)
+            self.layoutChanged.emit()
+        else:
+            self._reset(rows)
+
+    def _update_changed(self, rows):
+        for i, row in enumerate(rows):
+            if self._rows[i] != row:
+                self._rows[i] = row
+                self.dataChanged.emit(self.index(i, 0), self.index(i, len(self.COLUMNS) - 1))
+
+    def _reset(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+
+class BaseModelTableView(CopyableTableMixin, QTableView):
+    MODEL = DiffTableModel
+
+    def __init__(self, *args):
+        QTableView.__init__(self, *args)
+        self.COLUMNS = self.MODEL.COLUMNS
+        self.setModel(self.MODEL(self))
+        self.resizeColumnsToContents()
+
+        self.clipboard = QApplication.clipboard()
+        self.clipboard.clear()
+
+    def set_table_data(self, data):
+        """
+        Updates the table from a dictionary of column name to column values, see `DiffTableModel.set_rows`.
+        """
+        self.model().set_table_data(data)
+
+
+class BaseTableView(CopyableTableMixin, QTableWidget):
+    COLUMNS = ("Item", "Count", "Value")
+
+    def __init__(self, data, *args):
+        QTableWidget.__init__(self, *args)
+        self.data = data
+        self.setData(self.data)
+        self.resizeColumnsToContents()
+
+        self.resizeRowsToContents()
+
+        self.clipboard = QApplication.clipboard()
+        self.clipboard.clear()
+
+    def setData(self, data):
+        self.data = data
+        horHeaders = []
+        for n, key in enumerate(self.COLUMNS):
+            horHeaders.append(key)
+            if key in data:
+                for m, item in enumerate(data[key]):
+                    newitem = QTableWidgetItem(str(item))
+                    self.setItem(m, n, newitem)
+        self.setHorizontalHeaderLabels(horHeaders)
+
+
+class RunsTableModel(DiffTableModel):
+    """
+    Virtual table of runs, each row is formatted only when the view asks for it.
+
+    The model holds the runs themselves rather than their formatted rows, the formatting is cached per run by
+    `HuntingTrip.summary_row`, so only the rows scrolled into view are ever formatted.
+    """
     COLUMNS = ("Notes", "Start", "End", "Spend", "Enhancers", "Extra Spend", "Return", "%", "mu%")
+    EDITABLE_COLUMNS = (0, 5)
+
+    def row(self, row):
+        return self._rows[row].summary_row()
+
+    def run(self, row):
+        """
+        Returns the run shown in the given row.
+        """
+        return self._rows[row]
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        """
+        Reports a user edit through `cellEdited`, the run itself is updated by the listener.
+        """
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        self.cellEdited.emit(index.row(), index.column(), str(value))
+        self.dataChanged.emit(index, index)
+        return True
+
+    def set_runs(self, runs):
+        """
+        Updates the model to the given runs, newest first.
+
+        When the runs are unchanged or new runs were only added at the top, the existing rows are kept and a
+        single `dataChanged` is emitted, the view then only refreshes the rows it is showing.
+
+        Args:
+            runs (List[HuntingTrip]): The runs to show.
+
+        Returns:
+            None
+        """
+        added = len(runs) - len(self._rows)
+        if added < 0 or runs[added:] != self._rows:
+            self._reset(list(runs))
+            return
+        if added:
+            self.beginInsertRows(QtCore.QModelIndex(), 0, added - 1)
+            self._rows = list(runs)
+            self.endInsertRows()
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._rows) - 1, len(self.COLUMNS) - 1))
+
+
+class LootTableModel(DiffTableModel):
+    COLUMNS = ("Item", "Count", "Value", "Markup", "Total Value")
+    EDITABLE_COLUMNS = (3,)
+
+
+class SkillTableModel(DiffTableModel):
+    COLUMNS = ("Skill", "Value", "Procs", "Proc %")
+
+
+class EnhancerTableModel(DiffTableModel):
+    COLUMNS = ("Enhancer", "Breaks")
+
+
+class RunsView(BaseModelTableView):
+    MODEL = RunsTableModel
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -91,12 +310,14 @@ class RunsView(BaseTableView):
         header.setSectionResizeMode(6, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(7, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(8, QHeaderView.ResizeToContents)
+        # Only size the columns from the rows on screen, so off screen runs never have to be formatted
+        header.setResizeContentsPrecision(0)
 
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
 
 
-class LootTableView(BaseTableView):
-    COLUMNS = ("Item", "Count", "Value", "Markup", "Total Value")
+class LootTableView(BaseModelTableView):
+    MODEL = LootTableModel
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -111,8 +332,8 @@ class LootTableView(BaseTableView):
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
 
 
-class SkillTableView(BaseTableView):
-    COLUMNS = ("Skill", "Value", "Procs", "Proc %")
+class SkillTableView(BaseModelTableView):
+    MODEL = SkillTableModel
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -125,8 +346,8 @@ class SkillTableView(BaseTableView):
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
 
 
-class EnhancerTableView(BaseTableView):
-    COLUMNS = ("Enhancer", "Breaks")
+class EnhancerTableView(BaseModelTableView):
+    MODEL = EnhancerTableModel
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
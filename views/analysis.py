@@ -0,0 +1,154 @@
+import traceback
+
+import pyqtgraph as pg
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtWidgets import QHBoxLayout, QLabel, QProgressBar, QPushButton, QVBoxLayout, QWidget
+
+from modules.analysis import AnalysisCancelled, analyze_stored_runs
+
+
+class AnalysisWorker(QThread):
+    """
+    Aggregates every stored run on a background thread, see `modules.analysis.analyze_stored_runs`.
+
+    Signals are emitted from the worker thread and delivered to the UI thread through queued connections.
+    """
+    progress = pyqtSignal(int, int)
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            analysis = analyze_stored_runs(
+                progress=lambda done, total: self.progress.emit(done, total),
+                is_cancelled=lambda: self._cancelled)
+        except AnalysisCancelled:
+            return
+        except Exception as e:
+            traceback.print_exc()
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(analysis)
+
+
+class AllRunsAnalysisView(QWidget):
+    """
+    Lifetime graphs over every stored run: the return per run over time, the cumulative profit and the
+    distribution of loot multipliers.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.worker = None
+
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        controls = QHBoxLayout()
+        self.analyze_btn = QPushButton("Analyze All Runs")
+        self.analyze_btn.released.connect(self.start_analysis)
+        self.cancel_btn = QPushButton("Cancel", enabled=False)
+        self.cancel_btn.released.connect(self.cancel_analysis)
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel("")
+        controls.addWidget(self.analyze_btn)
+        controls.addWidget(self.cancel_btn)
+        controls.addWidget(self.progress_bar)
+        controls.addWidget(self.status_label)
+        layout.addLayout(controls)
+
+        self.return_graph = pg.PlotWidget(axisItems={"bottom": pg.DateAxisItem()})
+        self.return_graph.setTitle("Return Per Run (%)")
+        self.return_graph.setLabel('left', 'Return (%)')
+        self.return_graph.addLegend()
+        self.return_plot = self.return_graph.plot([], pen=None, symbol="o", symbolSize=5, name="TT")
+        self.return_mu_plot = self.return_graph.plot([], pen=None, symbol="t", symbolSize=5, symbolBrush="y",
+                                                     name="Markup")
+
+        self.profit_graph = pg.PlotWidget(axisItems={"bottom": pg.DateAxisItem()})
+        self.profit_graph.setTitle("Cumulative Profit (PED)")
+        self.profit_graph.setLabel('left', 'Profit (PED)')
+        self.profit_graph.addLegend()
+        self.profit_plot = self.profit_graph.plot([], name="TT")
+        self.profit_mu_plot = self.profit_graph.plot([], pen="y", name="Markup")
+
+        self.multiplier_graph = pg.PlotWidget()
+        self.multiplier_graph.setTitle("Multiplier Distribution")
+        self.multiplier_graph.setLabel('bottom', 'Multiplier')
+        self.multiplier_graph.setLabel('left', 'Loots')
+        self.multiplier_graph.setLogMode(x=True)
+        self.multiplier_plot = self.multiplier_graph.plot([], stepMode=True, fillLevel=0, brush=(100, 100, 255, 150))
+
+        layout.addWidget(self.return_graph)
+        layout.addWidget(self.profit_graph)
+        layout.addWidget(self.multiplier_graph)
+
+    def start_analysis(self):
+        """
+        Starts aggregating all stored runs on a background thread, the graphs are updated when it completes.
+        """
+        if self.worker and self.worker.isRunning():
+            return
+        self.worker = AnalysisWorker(self)
+        self.worker.progress.connect(self.on_progress)
+        self.worker.completed.connect(self.on_completed)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.finished.connect(self.on_worker_finished)
+
+        self.analyze_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.status_label.setText("Loading runs...")
+        self.worker.start()
+
+    def cancel_analysis(self):
+        if self.worker:
+            self.worker.cancel()
+            self.status_label.setText("Cancelled")
+
+    def on_progress(self, done: int, total: int):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+
+    def on_failed(self, error: str):
+        self.status_label.setText(f"Analysis failed: {error}")
+
+    def on_worker_finished(self):
+        self.analyze_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+
+    def on_completed(self, analysis):
+        """
+        Draws the aggregated arrays of a completed analysis.
+
+        Parameters:
+            analysis (RunsAnalysis): The result of `analyze_stored_runs`.
+
+        Returns:
+            None
+        """
+        self.status_label.setText(f"{len(analysis.starts):,} runs")
+        self.return_plot.setData(analysis.starts, analysis.return_perc)
+        self.return_mu_plot.setData(analysis.starts, analysis.return_mu_perc)
+        self.profit_plot.setData(analysis.starts, analysis.cumulative_profit)
+        self.profit_mu_plot.setData(analysis.starts, analysis.cumulative_mu_profit)
+        if len(analysis.multiplier_counts):
+            # Log mode plots log10 of the x values, steps are drawn between the bin edges
+            self.multiplier_plot.setData(analysis.multiplier_edges, analysis.multiplier_counts)
+        else:
+            self.multiplier_plot.setData([])
+
+    def shutdown(self):
+        """
+        Cancels a running analysis and waits for the worker to stop, call before the app closes.
+        """
+        if self.worker and self.worker.isRunning():
+            self.worker.cancel()
+            self.worker.wait()
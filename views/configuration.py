@@ -6,11 +6,14 @@ from PyQt5.QtGui import *
 from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtWidgets import QFileDialog, QTextEdit, QFormLayout, QHBoxLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QApplication, QWidget, QPushButton, QVBoxLayout, QTableWidget, QTableWidgetItem
 
-from data.weapons import ALL_WEAPONS
-from data.sights_and_scopes import SIGHTS, SCOPES
-from data.attachments import ALL_ATTACHMENTS
-from modules.combat import Loadout, CustomWeapon
+from data.weapons import all_weapons
+from data.sights_and_scopes import sights, scopes
+from data.attachments import all_attachments
+from modules.combat import Loadout, CustomWeapon, register_custom_weapons, loadout_costs
+from modules.run_store import ARCHIVE_FORMATS
 from utils.tables import WeaponTable
+from utils.search import catalog_index
+from utils.search_widgets import SearchComboBox
 
 
 class ConfigTab(QWidget):
@@ -97,6 +100,25 @@ class ConfigTab(QWidget):
         form_inputs.addRow("Screenshot Threshold (PED):", self.screenshot_threshold)
         self.screenshot_threshold.textChanged.connect(self.update_screenshot_fields)
 
+        self.max_refresh_rate_text = QLineEdit(text=self.app.config.max_refresh_rate.ui_value)
+        form_inputs.addRow("Max Refresh Rate (redraws/s, 0 = unlimited):", self.max_refresh_rate_text)
+        self.max_refresh_rate_text.textChanged.connect(self.update_max_refresh_rate)
+
+        self.idle_timeout_text = QLineEdit(text=self.app.config.idle_timeout.ui_value)
+        form_inputs.addRow("Idle After (seconds without chat, 0 = never):", self.idle_timeout_text)
+        self.idle_timeout_text.textChanged.connect(self.update_idle_timeout)
+
+        # Run Archival
+        self.archive_after_days_text = QLineEdit(text=self.app.config.archive_after_days.ui_value)
+        form_inputs.addRow("Archive Runs Older Than (days, 0 = never):", self.archive_after_days_text)
+        self.archive_after_days_text.textChanged.connect(self.update_archive_fields)
+
+        self.archive_format_option = QComboBox()
+        self.archive_format_option.addItems(ARCHIVE_FORMATS)
+        self.archive_format_option.setCurrentText(self.app.config.archive_format.value)
+        form_inputs.addRow("Archive Format:", self.archive_format_option)
+        self.archive_format_option.currentIndexChanged.connect(self.update_archive_fields)
+
         self.streamer_window_layout_text = QTextEdit()
         self.streamer_window_layout_text.setText(self.app.config.streamer_layout.ui_value)
         self.streamer_window_layout_text.textChanged.connect(self.set_new_streamer_layout)
@@ -119,7 +141,7 @@ class ConfigTab(QWidget):
         """
         Refreshes the list of custom weapons.
 
-        This function iterates over each custom weapon in the `custom_weapons` configuration value and updates the `ALL_WEAPONS` dictionary accordingly. For each custom weapon, a new entry is added to the dictionary with the key "!CUSTOM - {weapon_name}". The value of the entry is a dictionary containing the type of the weapon (which is set to "custom"), the decay value (converted to a `Decimal` object), and the ammo burn value.
+        This function iterates over each custom weapon in the `custom_weapons` configuration value and updates the `all_weapons()` catalog accordingly. For each custom weapon, a new entry is added to the dictionary with the key "!CUSTOM - {weapon_name}". The value of the entry is a dictionary containing the type of the weapon (which is set to "custom"), the decay value (converted to a `Decimal` object), and the ammo burn value.
 
         Parameters:
             self (object): The current instance of the class.
@@ -127,13 +149,7 @@ class ConfigTab(QWidget):
         Returns:
             None
         """
-        for custom_weapon in self.app.config.custom_weapons.value:
-            custom_weapon = CustomWeapon(*custom_weapon)
-            ALL_WEAPONS[f"!CUSTOM - {custom_weapon.weapon}"] = {
-                "type": "custom",
-                "decay": Decimal(custom_weapon.decay),
-                "ammo": custom_weapon.ammo_burn
-            }
+        register_custom_weapons(self.app.config.custom_weapons.value)
 
     def weapon_table_selected(self):
         """
@@ -164,9 +180,10 @@ class ConfigTab(QWidget):
         
         There is no return value.
         """
-        self.app.config.selected_loadout = self.app.config.loadouts.value[self.selected_index]
-        self.active_loadout.setText(self.app.config.selected_loadout.value.weapon)
-        self.recalculateWeaponFields()
+        with self.app.config.batch():
+            self.app.config.selected_loadout = self.app.config.loadouts.value[self.selected_index]
+            self.active_loadout.setText(self.app.config.selected_loadout.value.weapon)
+            self.recalculateWeaponFields()
 
     def delete_loadout(self):
         """
@@ -333,14 +350,68 @@ class ConfigTab(QWidget):
         Returns:
             None
         """
-        self.app.config.screenshot_threshold = int(self.screenshot_threshold.text())
-        self.app.config.screenshot_delay = int(self.screenshots_delay.text())
-        self.app.config.screenshot_directory = self.screenshots_directory_text.text()
-        self.app.config.screenshot_enabled = self.screenshots_checkbox.isChecked()
+        with self.app.config.batch():
+            self.app.config.screenshot_threshold = int(self.screenshot_threshold.text())
+            self.app.config.screenshot_delay = int(self.screenshots_delay.text())
+            self.app.config.screenshot_directory = self.screenshots_directory_text.text()
+            self.app.config.screenshot_enabled = self.screenshots_checkbox.isChecked()
 
         if not os.path.exists(os.path.expanduser(self.app.config.screenshot_directory.value)):
             os.makedirs(os.path.expanduser(self.app.config.screenshot_directory.value))
 
+    def update_archive_fields(self):
+        """
+        Updates the run archival settings in the application configuration.
+
+        Old runs are archived the next time the application starts.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            archive_after_days = max(0, int(self.archive_after_days_text.text() or "0"))
+        except ValueError:
+            return
+        with self.app.config.batch():
+            self.app.config.archive_after_days = archive_after_days
+            self.app.config.archive_format = self.archive_format_option.currentText()
+
+    def update_max_refresh_rate(self):
+        """
+        Updates how many times per second the tables, graphs and streamer window may be redrawn.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            max_refresh_rate = max(0, int(self.max_refresh_rate_text.text() or "0"))
+        except ValueError:
+            return
+        self.app.config.max_refresh_rate = max_refresh_rate
+        self.app.render_scheduler.set_max_refresh_rate(max_refresh_rate)
+
+    def update_idle_timeout(self):
+        """
+        Updates how many seconds chat.log has to be quiet before the tracker drops to low frequency wakeups.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        try:
+            idle_timeout = max(0, int(self.idle_timeout_text.text() or "0"))
+        except ValueError:
+            return
+        self.app.config.idle_timeout = idle_timeout
+
     def set_new_streamer_layout(self):
         """
         Set the new layout for the streamer.
@@ -393,50 +464,20 @@ class ConfigTab(QWidget):
         if loadout.weapon is None:
             return
 
-        weapon = ALL_WEAPONS[loadout.weapon]
-        amp = ALL_ATTACHMENTS.get(loadout.amp)
-        ammo = weapon["ammo"] * (1 + (0.1 * loadout.damage_enh)) * (1 - (0.01 * loadout.economy_enh))
-        decay = weapon["decay"] * Decimal(1 + (0.1 * loadout.damage_enh)) * Decimal(1 - (0.01 * loadout.economy_enh))
-        
-        if amp:
-            ammo += amp["ammo"]
-            decay += amp["decay"]
-        self.ammo_burn_text.setText(str(int(ammo)))
-        self.weapon_decay_text.setText("%.6f" % decay)
-
-        scope = SCOPES.get(loadout.scope)
-        if scope:
-            decay += scope["decay"]
-            ammo += scope["ammo"]
-
-        sight_1 = SIGHTS.get(loadout.sight_1)
-        if sight_1:
-            decay += sight_1["decay"]
-            ammo += sight_1["ammo"]
-
-        sight_2 = SIGHTS.get(loadout.sight_2)
-        if sight_2:
-            decay += sight_2["decay"]
-            ammo += sight_2["ammo"]
-
-        self.app.combat_module.decay = decay
-        self.app.combat_module.ammo_burn = ammo
+        weapon_cost = loadout_costs.cost(loadout, include_sights=False)
+        self.ammo_burn_text.setText(str(int(weapon_cost.ammo)))
+        self.weapon_decay_text.setText("%.6f" % weapon_cost.decay)
+
+        cost = loadout_costs.cost(loadout)
+        self.app.combat_module.decay = cost.decay
+        self.app.combat_module.ammo_burn = cost.ammo
 
         self.app.save_config()
         self.app.combat_module.update_active_run_cost()
 
     def onNameChanged(self):
         """
-        Updates the name in the app's configuration and saves the configuration.
-
-        Parameters:
-            None
-
-        Returns:
-            None
-        """
-        """
-        Updates the name in the app's configuration and saves the configuration.
+        Updates the name in the app's configuration, which schedules a save of the configuration.
 
         Parameters:
             None
@@ -445,7 +486,6 @@ class ConfigTab(QWidget):
             None
         """
         self.app.config.name = self.character_name.text()
-        self.app.save_config()
 
     def onChatLocationChanged(self):
         """
@@ -524,29 +564,25 @@ class WeaponPopOut(QWidget):
         form_inputs = QFormLayout()
 
         # Weapon Configuration
-        self.weapon_option = QComboBox()
-        self.weapon_option.addItems(sorted(ALL_WEAPONS))
+        # The pickers search prebuilt indexes of the catalogs, the names are only sorted once
+        self.weapon_option = SearchComboBox(catalog_index(all_weapons()))
         form_inputs.addRow("Weapon:", self.weapon_option)
         self.weapon_option.currentIndexChanged.connect(self.on_field_changed)
-        self.weapon = self.weapon_option.currentText()
+        self.weapon = self.weapon_option.current_item()
 
-        self.amp_option = QComboBox()
-        self.amp_option.addItems(["Unamped"] + sorted(ALL_ATTACHMENTS))
+        self.amp_option = SearchComboBox(catalog_index(all_attachments()), ["Unamped"])
         form_inputs.addRow("Amplifier:", self.amp_option)
         self.amp_option.currentIndexChanged.connect(self.on_field_changed)
 
-        self.scope_option = QComboBox()
-        self.scope_option.addItems(["None"] + sorted(SCOPES))
+        self.scope_option = SearchComboBox(catalog_index(scopes()), ["None"])
         form_inputs.addRow("Scope:", self.scope_option)
         self.scope_option.currentIndexChanged.connect(self.on_field_changed)
 
-        self.sight_1_option = QComboBox()
-        self.sight_1_option.addItems(["None"] + sorted(SIGHTS))
+        self.sight_1_option = SearchComboBox(catalog_index(sights()), ["None"])
         form_inputs.addRow("Sight 1:", self.sight_1_option)
         self.sight_1_option.currentIndexChanged.connect(self.on_field_changed)
 
-        self.sight_2_option = QComboBox()
-        self.sight_2_option.addItems(["None"] + sorted(SIGHTS))
+        self.sight_2_option = SearchComboBox(catalog_index(sights()), ["None"])
         form_inputs.addRow("Sight 2:", self.sight_2_option)
         self.sight_2_option.currentIndexChanged.connect(self.on_field_changed)
 
@@ -633,11 +669,11 @@ class WeaponPopOut(QWidget):
         Returns:
             None
         """
-        self.scope = self.scope_option.currentText()
-        self.sight_1 = self.sight_1_option.currentText()
-        self.sight_2 = self.sight_2_option.currentText()
-        self.weapon = self.weapon_option.currentText()
-        self.amp = self.amp_option.currentText()
+        self.scope = self.scope_option.current_item()
+        self.sight_1 = self.sight_1_option.current_item()
+        self.sight_2 = self.sight_2_option.current_item()
+        self.weapon = self.weapon_option.current_item()
+        self.amp = self.amp_option.current_item()
         self.damage_enhancers = min(10, int(self.damage_enhancers_txt.text()))
         self.accuracy_enhancers = min(10, int(self.accuracy_enhancers_txt.text()))
         self.economy_enhancers = min(10, int(self.economy_enhancers_txt.text()))
@@ -4,11 +4,19 @@ import webbrowser
 import time
 from decimal import Decimal
 
-from PyQt5.QtWidgets import QFileDialog, QTextEdit, QHBoxLayout, QFormLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QApplication, QWidget, QPushButton, QVBoxLayout, QTableWidget, QTableWidgetItem
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QFileDialog, QTextEdit, QHBoxLayout, QFormLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QListWidget, QApplication, QWidget, QPushButton, QVBoxLayout, QTableWidget, QTableWidgetItem
 
-from data.crafting import ALL_RESOURCES, ALL_BLUEPRINTS
+from data.crafting import all_resources, all_blueprints, blueprint_index, blueprints_using
 from utils.tables import CraftingTableView
 from modules.combat import MarkupSingleton
+from modules.crafting import BlueprintCostTracker
+
+# Number of ranked blueprint matches listed below the search box
+BLUEPRINT_RESULTS = 50
+
+# Number of blueprints named in the tooltip of the "Used In" label
+USED_IN_TOOLTIP = 30
 
 
 class CraftingTab(QWidget):
@@ -33,8 +41,20 @@ class CraftingTab(QWidget):
         self.blueprint_table_selected_row = None
         self.blueprint_table = None
 
+        # Created on first use, together with the blueprint catalog
+        self._blueprint_costs = None
+
         self.create_layout()
 
+    def showEvent(self, event):
+        """
+        Lists the first blueprints the first time the tab is shown, so the blueprint catalog and its search index
+        are never built for users who don't craft.
+        """
+        super().showEvent(event)
+        if not self.bp_results.count():
+            self.on_blueprint_search(self.bp_search.text())
+
     def create_layout(self):
         """
         Creates the layout for the GUI.
@@ -47,11 +67,16 @@ class CraftingTab(QWidget):
         form_inputs = QFormLayout()
         layout.addLayout(form_inputs)
 
-        # Weapon Configuration
-        self.bp_option = QComboBox()
-        self.bp_option.addItems(sorted(ALL_BLUEPRINTS))
-        form_inputs.addRow("Blueprint:", self.bp_option)
-        self.bp_option.currentIndexChanged.connect(self.on_blueprint_changed)
+        # Blueprint Search, the results are filled in when the tab is first shown, see showEvent
+        self.bp_search = QLineEdit(placeholderText="Search blueprints...")
+        self.bp_search.textChanged.connect(self.on_blueprint_search)
+        self.bp_search.returnPressed.connect(lambda: self.bp_results.setCurrentRow(0))
+        form_inputs.addRow("Blueprint:", self.bp_search)
+
+        self.bp_results = QListWidget()
+        self.bp_results.setMaximumHeight(120)
+        self.bp_results.currentTextChanged.connect(self.on_blueprint_changed)
+        form_inputs.addRow("", self.bp_results)
 
         # Blueprint Table View
         # ("Resource", "Amount", "TT Cost", "Markup", "Total Cost")
@@ -62,6 +87,9 @@ class CraftingTab(QWidget):
 
         form_inputs.addRow("Materials", self.blueprint_table)
 
+        self.used_in_text = QLabel("Select a material")
+        form_inputs.addRow("Used In:", self.used_in_text)
+
         self.total_clicks_text = QLineEdit(text="1", enabled=True)
         form_inputs.addRow("Total Clicks:", self.total_clicks_text)
         self.total_clicks_text.textChanged.connect(self.on_updated_total_clicks)
@@ -254,9 +282,10 @@ class CraftingTab(QWidget):
         self.app.combat_module.active_run.total_cost += self.total_tt_cost
         self.app.combat_module.active_run.extra_spend += self.total_cost - self.total_tt_cost
         self.selected_blueprint = None
+        self.bp_results.setCurrentRow(-1)
         self.total_clicks = 1
         self.blueprint_table.clear()
-        self.app.combat_module.should_redraw_runs = True
+        self.app.combat_module.request_redraw()
 
     def on_updated_total_clicks(self):
         """
@@ -270,15 +299,38 @@ class CraftingTab(QWidget):
         self.calculate_crafting_totals()
         self.blueprint_table.setData(self.format_resources_from_selection())
 
+    @property
+    def blueprint_costs(self) -> BlueprintCostTracker:
+        """
+        The input costs of all blueprints, kept up to date on markup changes made anywhere in the app.
+        """
+        if self._blueprint_costs is None:
+            self._blueprint_costs = BlueprintCostTracker(MarkupSingleton, all_blueprints(), all_resources(),
+                                                         blueprints_using)
+            self._blueprint_costs.add_listener(self.on_blueprint_costs_changed)
+        return self._blueprint_costs
+
+    def on_blueprint_costs_changed(self, changes: dict):
+        """
+        Refreshes the selected blueprint if a markup change affected its cost. The refresh is deferred, as the
+        change can come from an edit of the materials table itself.
+        """
+        if self.selected_blueprint in changes:
+            QTimer.singleShot(0, self.refresh_selected_blueprint)
+
+    def refresh_selected_blueprint(self):
+        if not self.selected_blueprint:
+            return
+        self.blueprint_table.setData(self.format_resources_from_selection())
+        self.calculate_crafting_totals()
+
     def calculate_crafting_totals(self):
         self.total_tt_cost = Decimal("0.0")
         self.total_cost = Decimal("0.0")
         if self.selected_blueprint:
-            for slot in ALL_BLUEPRINTS[self.selected_blueprint].slots:
-                self.total_tt_cost += slot.count * ALL_RESOURCES[slot.name] * self.total_clicks
-                self.total_cost += MarkupSingleton.apply_markup_to_item(slot.name,
-                                                                        slot.count,
-                                                                        slot.count * ALL_RESOURCES[slot.name]) * self.total_clicks
+            cost = self.blueprint_costs.cost(self.selected_blueprint)
+            self.total_tt_cost += cost.tt * self.total_clicks
+            self.total_cost += cost.total * self.total_clicks
 
         average_input_markup = self.total_cost / self.total_tt_cost
 
@@ -287,8 +339,8 @@ class CraftingTab(QWidget):
         # Calculate total TT of successes
         if self.one_item_per_success:
             item_name = self.get_selected_item_name()
-            if item_name in ALL_RESOURCES:
-                item_tt_value = ALL_RESOURCES[item_name]
+            if item_name in all_resources():
+                item_tt_value = all_resources()[item_name]
             else:
                 item_tt_value = self.max_tt
             actual_item_tt = expected_successes * item_tt_value
@@ -342,19 +394,35 @@ class CraftingTab(QWidget):
 
     def format_resources_from_selection(self):
         data = {"Resource": [], "Per Click": [], "Total": [], "TT Cost": [], "Markup": [], "Total Cost": []}
-        for slot in ALL_BLUEPRINTS[self.selected_blueprint].slots:
+        for slot in all_blueprints()[self.selected_blueprint].slots:
             data["Resource"].append(slot.name)
             data["Per Click"].append(slot.count)
             data["Total"].append(slot.count * self.total_clicks)
-            data["TT Cost"].append("%.3f" % (slot.count * self.total_clicks * ALL_RESOURCES[slot.name]))
+            data["TT Cost"].append("%.3f" % (slot.count * self.total_clicks * all_resources()[slot.name]))
             data["Markup"].append(MarkupSingleton.get_formatted_markup(slot.name))
             data["Total Cost"].append("%.3f" % MarkupSingleton.apply_markup_to_item(slot.name,
                                                                                     slot.count * self.total_clicks,
-                                                                                    slot.count * self.total_clicks * ALL_RESOURCES[slot.name]))
+                                                                                    slot.count * self.total_clicks * all_resources()[slot.name]))
         return data
 
-    def on_blueprint_changed(self):
-        self.selected_blueprint = self.bp_option.currentText()
+    def on_blueprint_search(self, text: str):
+        """
+        Lists the blueprints best matching the search text, see `TrigramIndex.search`.
+
+        Parameters:
+            text (str): The search text.
+
+        Returns:
+            None
+        """
+        self.bp_results.clear()
+        self.bp_results.addItems(blueprint_index().search(text, BLUEPRINT_RESULTS))
+
+    def on_blueprint_changed(self, blueprint: str):
+        # Refilling the results clears the current row, which keeps the selected blueprint
+        if not blueprint or blueprint == self.selected_blueprint:
+            return
+        self.selected_blueprint = blueprint
         self.blueprint_table.clear()
         self.blueprint_table.setData(self.format_resources_from_selection())
         self.blueprint_markup_text.setText(MarkupSingleton.get_formatted_markup(self.selected_blueprint))
@@ -373,6 +441,18 @@ class CraftingTab(QWidget):
         if not indexes:
             return
         self.blueprint_table_selected_row = [i.row() for i in indexes][0]
+        self.show_material_uses(self.blueprint_table.cell_text(self.blueprint_table_selected_row, 0))
+
+    def show_material_uses(self, material: str):
+        """
+        Shows how many blueprints use the material, and the first of them as tooltip.
+        """
+        uses = blueprints_using(material)
+        self.used_in_text.setText(f"{len(uses)} blueprints use {material}")
+        names = [f"{blueprint} ( {count} per click )" for blueprint, count in uses[:USED_IN_TOOLTIP]]
+        if len(uses) > USED_IN_TOOLTIP:
+            names.append(f"... and {len(uses) - USED_IN_TOOLTIP} more")
+        self.used_in_text.setToolTip("\n".join(names))
 
     def on_blueprint_table_changed(self):
         if self.blueprint_table_selected_row is None or self.blueprint_table is None:
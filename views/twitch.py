@@ -5,7 +5,7 @@ from threading import Thread
 import time
 
 from PyQt5.QtWidgets import QFileDialog, QTextEdit, QHBoxLayout, QFormLayout, QHeaderView, QTabWidget, QCheckBox, QGridLayout, QComboBox, QLineEdit, QLabel, QApplication, QWidget, QPushButton, QVBoxLayout, QTableWidget, QTableWidgetItem
-from modules.twitch import Commands, TwitchIntegration
+from modules.twitch import Commands
 
 
 CMD_NAMES = {
@@ -119,6 +119,9 @@ class TwitchTab(QWidget):
             return  # TODO: This is harder than I first intneded to do cleanly, maybe need a daemon process :(
 
         print("Starting twitch bot")
+        # Imported late, twitchio is only needed once the bot is started
+        from modules.twitch_bot import TwitchIntegration
+
         self.twitch_bot = TwitchIntegration(
             self.app,
             username=self.username,
@@ -142,13 +145,13 @@ class TwitchTab(QWidget):
         Returns:
             None
         """
-        self.app.config.twitch_token = self.oauth_token_text.text()
-        self.app.config.twitch_username = self.username_text.text()
-        self.app.config.twitch_channel = self.channel_text.text()
-        self.app.config.twitch_prefix = self.command_prefix_text.text()
+        with self.app.config.batch():
+            self.app.config.twitch_token = self.oauth_token_text.text()
+            self.app.config.twitch_username = self.username_text.text()
+            self.app.config.twitch_channel = self.channel_text.text()
+            self.app.config.twitch_prefix = self.command_prefix_text.text()
 
         self.validate_settings()
-        self.app.save_config()
 
     def validate_settings(self):
         """
@@ -8,6 +8,8 @@ from collections import defaultdict
 import sys
 from decimal import Decimal
 
+from modules.combat import MarkupSingleton
+
 
 class LayoutValue(str, Enum):
     PERCENTAGE_RETURN = "PERCENTAGE_RETURN"
@@ -40,9 +42,12 @@ class StreamerWindow(QWidget):
         self.setGeometry(100, 100, 340, 100)
 
         self.widget_mappings: Dict[LayoutValue, QWidget] = defaultdict(lambda: [])
+        # Last rendered text per label, last size and the run values the text was rendered from
+        self.label_text: Dict[QLabel, str] = {}
+        self.rendered_size = None
+        self.rendered_key = None
         self.layout = self.create_widgets()
         self.set_text_from_data(0, 0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, 0.0)
-        self.resize_to_contents()
 
         # show all the widgets
         self.oldPos = self.pos()
@@ -55,7 +60,8 @@ class StreamerWindow(QWidget):
 
          This function sets the size of the widget to match the size hint provided by its layout.
          The layout calculates the ideal size for the widget based on its children and other factors.
-         After calling this function, the widget will have a fixed size that fits its contents.
+         After calling this function, the widget will have a fixed size that fits its contents. Nothing
+         is done if the size hint did not change since the last resize.
 
          Parameters:
             None
@@ -63,7 +69,10 @@ class StreamerWindow(QWidget):
          Returns:
             None
          """
-         self.setFixedSize(self.layout.sizeHint())
+         size = self.layout.sizeHint()
+         if size != self.rendered_size:
+             self.rendered_size = size
+             self.setFixedSize(size)
 
     def create_widgets(self):
         """
@@ -113,28 +122,43 @@ class StreamerWindow(QWidget):
         """
         Sets the text of the object from a given CombatModule.
 
+        The values shown are only recomputed when the active run changed since the last call.
+
         Args:
             combat_module (CombatModule): The CombatModule object from which to retrieve the data.
 
         Returns:
             None
         """
+        run = combat_module.active_run
+        if run is None:
+            return
+
+        key = (id(run), run.loot_instances, run.total_cost, run.extra_spend, run.tt_return, run.hofs, run.globals,
+               run.total_damage, MarkupSingleton.revision)
+        if key == self.rendered_key:
+            return
+        self.rendered_key = key
+
+        total_return_mu = run.total_return_mu
         self.set_text_from_data(
-            combat_module.active_run.loot_instances,
-            combat_module.active_run.total_cost + combat_module.active_run.extra_spend,
-            combat_module.active_run.tt_return,
-            combat_module.active_run.hofs,
-            combat_module.active_run.globals,
-            combat_module.active_run.dpp,
-            combat_module.active_run.total_return_mu,
-            combat_module.active_run.total_return_mu_perc,
-            combat_module.active_run.total_return_mu - (combat_module.active_run.total_cost - combat_module.active_run.extra_spend)
+            run.loot_instances,
+            run.total_cost + run.extra_spend,
+            run.tt_return,
+            run.hofs,
+            run.globals,
+            run.dpp,
+            total_return_mu,
+            run.total_return_mu_perc,
+            total_return_mu - (run.total_cost - run.extra_spend)
         )
 
     def set_text_from_data(self, loots, cost, returns, hofs, globals, dpp, total_returns, total_return_mu_perc, profit):
         """
         Sets the text of multiple widgets based on the given data.
 
+        Only labels whose text changed are updated, and the window is only resized when one did.
+
         Parameters:
         - loots (int): The number of loots.
         - cost (float): The cost.
@@ -167,9 +191,17 @@ class StreamerWindow(QWidget):
             data[LayoutValue.PERCENTAGE_RETURN] = "0.00"
             data[LayoutValue.PERCENTAGE_RETURN_MU] = "0.00"
 
+        changed = False
         for data_type, widget_data in self.widget_mappings.items():
             for format_str, widget in widget_data:
-                widget.setText(format_str.format(data[data_type]))
+                text = format_str.format(data[data_type])
+                if self.label_text.get(widget) != text:
+                    self.label_text[widget] = text
+                    widget.setText(text)
+                    changed = True
+
+        if changed:
+            self.resize_to_contents()
 
     def center(self):
         """